@@ -18,6 +18,7 @@ The flywheel operates through four specialized personas working in recursive col
 4. Creative Architect - Vision-driven design and generative frameworks
 """
 
+from collections import OrderedDict, deque
 from typing import List
 
 __version__ = "1.0.0"
@@ -31,6 +32,7 @@ from .persona_system import (
     PersonaOutput, FlywheelCycleResult
 )
 from .flowise_integration import FlowiseIntegrationHelper
+from .flywheel_runner import FlywheelRunner, CycleSummary, SessionPlan
 
 # Backend abstraction layer (separate tier)
 from .backends import FlowBackend, UniversalFlow, UniversalSession, BackendRegistry
@@ -67,6 +69,9 @@ __all__ = [
     "PersonaType",
     "PersonaOutput",
     "FlywheelCycleResult",
+    "FlywheelRunner",
+    "CycleSummary",
+    "SessionPlan",
     
     # Backend abstractions
     "FlowBackend",
@@ -109,7 +114,10 @@ class AgenticFlywheel:
         self.backend_type = backend_type
         self.config = config or {}
         self.orchestrator = FlywheelPersonaOrchestrator()
-        self.session_registry = {}
+        # Recent cycle results: config "history_limit" per session, for the last "max_sessions" sessions
+        self.history_limit = self.config.get("history_limit", 10)
+        self.max_sessions = self.config.get("max_sessions", 100)
+        self.session_registry = OrderedDict()
         self.cycle_count = 0
         
     def initialize_personas(self):
@@ -139,15 +147,36 @@ class AgenticFlywheel:
         )
         
         if result.session_id not in self.session_registry:
-            self.session_registry[result.session_id] = []
+            self.session_registry[result.session_id] = deque(maxlen=self.history_limit)
+            while len(self.session_registry) > self.max_sessions:
+                self.session_registry.popitem(last=False)
             
         self.session_registry[result.session_id].append(result)
         
         return result
     
+    async def run_cycles(self, queries, cycles=1, output_dir=None, max_concurrent_cycles=4,
+                         retain_cycles=10, retain_sessions=1000):
+        """
+        Run chained cycles for several queries at once (one session per query).
+        
+        Full results are streamed to output_dir as JSON lines; only compact summaries
+        are kept, on the returned runner (runner.summaries).
+        """
+        runner = FlywheelRunner(
+            self.orchestrator,
+            output_dir=output_dir,
+            max_concurrent_cycles=max_concurrent_cycles,
+            retain_cycles=retain_cycles,
+            retain_sessions=retain_sessions
+        )
+        await runner.run(queries, cycles=cycles)
+        self.cycle_count += runner.metrics["cycles"]
+        return runner
+    
     def get_session_history(self, session_id: str) -> List[FlywheelCycleResult]:
-        """Get the history of cycles for a session."""
-        return self.session_registry.get(session_id, [])
+        """Get the recent cycles of a session (at most history_limit)."""
+        return list(self.session_registry.get(session_id, []))
 
 
 def get_available_tiers():
@@ -155,7 +184,7 @@ def get_available_tiers():
     tiers = {
         "core": {
             "available": True,
-            "components": ["FlowiseManager", "AgenticFlywheel"],
+            "components": ["FlowiseManager", "AgenticFlywheel", "FlywheelRunner"],
             "description": "Core flywheel orchestration and persona management"
         },
         "backends": {
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Batch Engine
+Concurrent fan-out of prediction requests with per-item timeouts, ordered results and as-completed streaming
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_CONCURRENCY = 8     # items of one batch in flight at once
+DEFAULT_ITEM_TIMEOUT = 60.0       # seconds per item, including time queued for an upstream slot
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one batch item; index is its position in the request"""
+    index: int
+    success: bool
+    session_id: Optional[str] = None
+    response: Optional[str] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BatchTooLargeError(ValueError):
+    """The batch exceeds the engine's max_batch_size"""
+
+
+class BatchEngine:
+    """Runs batch items concurrently through an async executor, isolating each item's failure"""
+
+    def __init__(self,
+                 execute: Callable[[Any], Awaitable[BatchItemResult]],
+                 concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                 item_timeout: float = DEFAULT_ITEM_TIMEOUT,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        # execute(item) returns a BatchItemResult (index is filled in by the engine) or raises
+        self.execute = execute
+        self.concurrency = max(1, concurrency)
+        self.item_timeout = item_timeout
+        self.max_batch_size = max_batch_size
+
+    def check_size(self, items: Sequence[Any]) -> None:
+        """Raise BatchTooLargeError when a batch is over the server-side limit"""
+        if len(items) > self.max_batch_size:
+            raise BatchTooLargeError(f"Batch of {len(items)} items exceeds the limit of {self.max_batch_size}")
+
+    async def _run_item(self, index: int, item: Any, semaphore: asyncio.Semaphore) -> BatchItemResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self.execute(item), self.item_timeout)
+            except asyncio.TimeoutError:
+                result = BatchItemResult(index=index, success=False, timed_out=True,
+                                         error=f"Timed out after {self.item_timeout:g}s")
+            except Exception as e:
+                logger.warning(f"⚠️ Batch item {index} failed: {e}")
+                result = BatchItemResult(index=index, success=False, error=str(e))
+            result.index = index
+            result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            return result
+
+    def _start(self, items: Sequence[Any]) -> List["asyncio.Future[BatchItemResult]"]:
+        self.check_size(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return [asyncio.ensure_future(self._run_item(i, item, semaphore)) for i, item in enumerate(items)]
+
+    async def run(self, items: Sequence[Any]) -> List[BatchItemResult]:
+        """Results in input order once every item has finished"""
+        tasks = self._start(items)
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(self, items: Sequence[Any]) -> AsyncIterator[BatchItemResult]:
+        """Yield each result as soon as it completes; unfinished items are cancelled if the consumer stops"""
+        tasks = self._start(items)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def summarize_results(results: Sequence[BatchItemResult]) -> Dict[str, int]:
+    """Processed, failed and timed-out counts for a batch"""
+    return {
+        "processed_count": len(results),
+        "failed_count": sum(1 for r in results if not r.success),
+        "timed_out_count": sum(1 for r in results if r.timed_out),
+    }
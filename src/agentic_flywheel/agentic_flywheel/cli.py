@@ -8,27 +8,20 @@ import os
 
 import click
 import json
-import yaml
 import webbrowser
 
-from pathlib import Path
 from agentic_flywheel.config_manager import FlowiseManager
+from agentic_flywheel.flow_registry import DEFAULT_REGISTRY_PATHS, get_flow_registry, write_registry
 
 def load_flow_registry():
     """Load flows from flow-registry.yaml"""
     # Try package-bundled config first, then fallback to development location
-    registry_paths = [
-        Path(__file__).parent / "config" / "flow-registry.yaml",  # Package location
-        Path(__file__).parent.parent / "flow-registry.yaml"       # Development location
-    ]
-    
-    for registry_path in registry_paths:
-        if registry_path.exists():
-            with open(registry_path, 'r') as f:
-                return yaml.safe_load(f), registry_path
+    registry = get_flow_registry()
+    if registry is not None:
+        return registry.snapshot.to_dict(), registry.path
     
     click.echo(f"❌ Flow registry not found. Searched:", err=True)
-    for path in registry_paths:
+    for path in DEFAULT_REGISTRY_PATHS:
         click.echo(f"   - {path}", err=True)
     sys.exit(1)
 
@@ -91,7 +84,7 @@ def query(question, intent, session_id, flow_override, temperature, max_tokens,
 @click.option('--all', is_flag=True, help='Show all flows including inactive ones')
 def list_flows(all):
     """List available flows from registry"""
-    registry = load_flow_registry()
+    registry, _ = load_flow_registry()
     
     click.echo("🔄 OPERATIONAL FLOWS:")
     for flow_key, flow_config in registry.get('operational_flows', {}).items():
@@ -175,8 +168,7 @@ def flow(flow_name, question, session_id):
 @click.option('--temperature', type=float, default=0.7, help='Default temperature')
 def add_flow(new_flow_id, flow_name, description, keywords, temperature):
     """Add new flow to registry"""
-    registry_path = Path(__file__).parent.parent / "flow-registry.yaml"
-    registry = load_flow_registry()
+    registry, registry_path = load_flow_registry()
     
     # Create flow key from name
     flow_key = flow_name.lower().replace(' ', '-').replace('_', '-')
@@ -195,7 +187,8 @@ def add_flow(new_flow_id, flow_name, description, keywords, temperature):
             'responsePrompt': f"Provide guidance for {flow_name.lower()}: {{context}}"
         },
         'intent_keywords': keywords.split(',') if keywords else [flow_key],
-        'status': 'active'
+        'status': 'active',
+        'active': 1
     }
     
     # Add to operational flows
@@ -203,9 +196,8 @@ def add_flow(new_flow_id, flow_name, description, keywords, temperature):
         registry['operational_flows'] = {}
     registry['operational_flows'][flow_key] = new_flow
     
-    # Save back to file
-    with open(registry_path, 'w') as f:
-        yaml.dump(registry, f, default_flow_style=False, sort_keys=False)
+    # Save back to file (atomically, so running servers never read a half-written registry)
+    write_registry(registry_path, registry)
     
     click.echo(f"✅ Added flow '{flow_key}' to registry")
     click.echo(f"   ID: {new_flow_id}")
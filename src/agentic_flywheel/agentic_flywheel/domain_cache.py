@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Domain Manager Cache
+Bounded LRU of DomainSpecificFlowiseManager instances keyed by a hash of their DomainContext
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Dict, Any, Callable, Optional, Tuple
+
+DEFAULT_MAX_MANAGERS = 64
+
+
+def domain_context_key(domain_context: Any, base_url: Optional[str] = None) -> str:
+    """Stable hash of a DomainContext (every field) and the Flowise server it talks to"""
+    fields = asdict(domain_context) if is_dataclass(domain_context) else dict(domain_context or {})
+    material = json.dumps([fields, base_url], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def approximate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Rough deep size in bytes of plain data (dicts, sequences, dataclasses, objects with __dict__)"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+
+class DomainManagerCache:
+    """Thread-safe LRU: one manager per distinct domain context, least recently used evicted first"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_MANAGERS):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()  # key -> (manager, approx bytes)
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached manager for key (marked most recently used), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return entry[0]
+
+    def put(self, key: str, manager: Any) -> Any:
+        """Cache a manager; if another caller cached one for key first, that one is kept and returned"""
+        size = self._manager_size(manager)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing[0]
+            self._entries[key] = (manager, size)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics["evictions"] += 1
+            return manager
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Cached manager for key, building it with factory() on a miss"""
+        manager = self.get(key)
+        if manager is None:
+            manager = self.put(key, factory())
+        return manager
+
+    @staticmethod
+    def _manager_size(manager: Any) -> int:
+        # What a cached manager holds on its own: context, flows and keyword overlays
+        # (the HTTP client and registry snapshot are shared process-wide)
+        return sum(approximate_size(getattr(manager, attr, None))
+                   for attr in ("domain_context", "flows", "keyword_overlays"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate, evictions, entry count and approximate memory held"""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            stats["approx_bytes"] = sum(size for _, size in self._entries.values())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Flow Registry Service
+Parses flow-registry.yaml once into an immutable snapshot, hot-reloads it when the file changes and notifies subscribers
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+import yaml
+
+try:
+    YAML_LOADER = yaml.CSafeLoader   # libyaml: several times faster than the pure-Python loader
+except AttributeError:
+    YAML_LOADER = yaml.SafeLoader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 2.0  # seconds between file stat checks on access / in the watcher thread
+FLOW_SECTIONS = ("operational_flows", "routing_flows")
+
+# Searched in order when no explicit registry path is given
+DEFAULT_REGISTRY_PATHS = (
+    Path(__file__).parent / "config" / "flow-registry.yaml",  # Package location
+    Path(__file__).parent.parent / "flow-registry.yaml",      # Development location
+)
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy: mappings become MappingProxyType, lists become tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen value"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """One parsed version of the registry file; never mutated, replaced wholesale on reload"""
+    path: Path
+    version: int
+    mtime_ns: int
+    size: int
+    data: Mapping[str, Any]
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        return self.data.get("metadata") or MappingProxyType({})
+
+    def flows(self, active_only: bool = True) -> Dict[str, Mapping[str, Any]]:
+        """Operational then routing flows by key, optionally only those marked active: 1"""
+        flows = {}
+        for section in FLOW_SECTIONS:
+            for key, flow in (self.data.get(section) or {}).items():
+                if not active_only or flow.get("active", 0) == 1:
+                    flows[key] = flow
+        return flows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable copy of the whole registry (for editors that write it back)"""
+        return thaw(self.data)
+
+
+class FlowRegistry:
+    """Shared, hot-reloading view of one registry file
+
+    Reloads are atomic: a new snapshot is parsed completely before it replaces the old one,
+    and a file that fails to parse leaves the previous snapshot in place. Subscribers are held
+    weakly when they are bound methods, so short-lived managers do not leak.
+    """
+
+    def __init__(self, path: Union[str, Path], check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._snapshot: Optional[RegistrySnapshot] = None
+        self._subscribers: List[Any] = []
+        self._lock = threading.RLock()
+        self._last_check = 0.0
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reload(force=True)
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """The current snapshot, without checking the file"""
+        return self._snapshot
+
+    def current(self) -> RegistrySnapshot:
+        """The current snapshot, reloading first if the file changed (stat at most every check_interval)"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self.reload()
+        return self._snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-parse the file if its mtime or size changed; returns True when a new snapshot was installed"""
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except OSError as e:
+                if self._snapshot is None:
+                    raise FileNotFoundError(f"Flow registry not found: {self.path}") from e
+                logger.warning(f"⚠️ Flow registry unavailable, keeping version {self._snapshot.version}: {e}")
+                return False
+
+            current = self._snapshot
+            if not force and current and (current.mtime_ns, current.size) == (stat.st_mtime_ns, stat.st_size):
+                return False
+
+            try:
+                with open(self.path, "r") as f:
+                    data = yaml.load(f, Loader=YAML_LOADER) or {}
+            except (OSError, yaml.YAMLError) as e:
+                if current is None:
+                    raise
+                logger.error(f"❌ Flow registry reload failed, keeping version {current.version}: {e}")
+                return False
+
+            snapshot = RegistrySnapshot(
+                path=self.path,
+                version=(current.version + 1) if current else 1,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                data=freeze(data)
+            )
+            self._snapshot = snapshot
+            subscribers = self._live_subscribers()
+
+        if current is not None:
+            logger.info(f"🔄 Flow registry reloaded: {self.path} (version {snapshot.version})")
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"❌ Flow registry subscriber failed: {e}")
+        return True
+
+    def subscribe(self, callback: Callable[[RegistrySnapshot], None]) -> Callable[[], None]:
+        """Call callback(snapshot) after every reload; returns a function that unsubscribes"""
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        with self._lock:
+            self._subscribers.append(ref)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if ref in self._subscribers:
+                    self._subscribers.remove(ref)
+        return unsubscribe
+
+    def _live_subscribers(self) -> List[Callable[[RegistrySnapshot], None]]:
+        live = []
+        for ref in list(self._subscribers):
+            callback = ref()
+            if callback is None:
+                self._subscribers.remove(ref)
+            else:
+                live.append(callback)
+        return live
+
+    def start_watching(self, interval: Optional[float] = None) -> None:
+        """Poll the file on a daemon thread so changes apply even when nobody calls current()"""
+        with self._lock:
+            if self._watcher and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval or self.check_interval,), name="flow-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"❌ Flow registry watcher error: {e}")
+
+
+def find_registry_path(explicit: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """The explicit path if it exists, else the first default location that does"""
+    candidates = ([Path(explicit)] if explicit else []) + list(DEFAULT_REGISTRY_PATHS)
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+_registries: Dict[Path, FlowRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_flow_registry(path: Optional[Union[str, Path]] = None) -> Optional[FlowRegistry]:
+    """The shared registry service for a file (default locations when path is None); None if not found"""
+    resolved = find_registry_path(path)
+    if resolved is None:
+        return None
+    key = resolved.resolve()
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = FlowRegistry(key)
+            _registries[key] = registry
+        return registry
+
+
+def write_registry(path: Union[str, Path], data: Mapping[str, Any]) -> None:
+    """Write registry YAML atomically (temp file + rename) and reload the shared service for it"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".flow-registry-", suffix=".yaml", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w") as f:
+            yaml.dump(thaw(data), f, default_flow_style=False, sort_keys=False)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    with _registries_lock:
+        registry = _registries.get(path.resolve())
+    if registry is not None:
+        registry.reload()
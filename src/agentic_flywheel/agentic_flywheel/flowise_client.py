@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Flowise Client
+Shared, connection-pooled async HTTP client for the Flowise prediction API, with a blocking facade for CLI use
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from typing import Dict, Any, AsyncIterator, Iterator, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from .resilience import CircuitOpenError, Resilience, ResiliencePolicy
+except ImportError:
+    from resilience import CircuitOpenError, Resilience, ResiliencePolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0           # seconds, read/write
+DEFAULT_CONNECT_TIMEOUT = 10.0   # seconds, TCP + TLS handshake
+DEFAULT_MAX_CONNECTIONS = 100    # per Flowise host (one client per base URL)
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0  # seconds an idle connection stays pooled
+
+
+class FlowiseClientError(Exception):
+    """A Flowise request failed: transport error, HTTP error status or unreadable body"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 request_sent: bool = True, timed_out: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.request_sent = request_sent  # False when Flowise never received the request (safe to resend)
+        self.timed_out = timed_out
+
+
+class FlowiseClient:
+    """Keep-alive, HTTP/2 connection pool to one Flowise server, shared by every caller in the process"""
+
+    def __init__(self,
+                 base_url: str,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+                 keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+                 http2: bool = True,
+                 headers: Optional[Dict[str, str]] = None,
+                 resilience: Optional[ResiliencePolicy] = None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.debug("HTTP/2 requested but h2 is not installed, using HTTP/1.1 keep-alive")
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        # Retries, hedging, circuit breaking and adaptive timeouts for predict() (None: one plain attempt)
+        self.resilience = Resilience(resilience, errors=(FlowiseClientError,)) if resilience else None
+
+        # httpx connections belong to the event loop that opened them, so the pool is kept per loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _timeout(self, timeout: Optional[float]) -> httpx.Timeout:
+        return httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers=self.headers,
+                    timeout=self._timeout(None),
+                    limits=self.limits,
+                    http2=self.http2
+                )
+                self._clients[loop] = client
+            return client
+
+    async def request(self, method: str, path: str, json: Any = None,
+                      timeout: Optional[float] = None) -> httpx.Response:
+        """Send a request over the pool and return the raw response (no status check)"""
+        try:
+            return await self._get_client().request(method, path, json=json, timeout=self._timeout(timeout))
+        except httpx.HTTPError as e:
+            raise FlowiseClientError(
+                f"{method} {path} failed: {e}",
+                request_sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)),
+                timed_out=isinstance(e, httpx.TimeoutException)
+            ) from e
+
+    async def get_json(self, path: str, timeout: Optional[float] = None) -> Any:
+        """GET a JSON document, raising FlowiseClientError on error statuses"""
+        return self._json(await self.request("GET", path, timeout=timeout))
+
+    async def predict(self, flow_id: str, payload: Dict[str, Any],
+                      timeout: Optional[float] = None, idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """POST to /api/v1/prediction/{flow_id} and return the decoded JSON answer
+
+        With resilience enabled, failed calls are retried and slow ones hedged only when
+        idempotent (default: the payload carries no sessionId); calls Flowise never
+        received are always retried. An open circuit fails fast with status 503.
+        """
+        if self.resilience is None:
+            return await self._predict_once(flow_id, payload, timeout)
+        if idempotent is None:
+            idempotent = not (payload.get("overrideConfig") or {}).get("sessionId")
+        try:
+            return await self.resilience.call(
+                flow_id,
+                lambda attempt_timeout: self._predict_once(flow_id, payload, attempt_timeout),
+                timeout or self.timeout,
+                idempotent
+            )
+        except CircuitOpenError as e:
+            raise FlowiseClientError(str(e), status_code=503, request_sent=False) from e
+
+    async def _predict_once(self, flow_id: str, payload: Dict[str, Any],
+                            timeout: Optional[float]) -> Dict[str, Any]:
+        return self._json(await self.request("POST", f"/api/v1/prediction/{flow_id}", json=payload, timeout=timeout))
+
+    async def prediction_status(self, flow_id: str, payload: Dict[str, Any],
+                                timeout: Optional[float] = None) -> Optional[int]:
+        """HTTP status of a prediction call, or None when the server cannot be reached"""
+        try:
+            response = await self.request("POST", f"/api/v1/prediction/{flow_id}", json=payload, timeout=timeout)
+        except FlowiseClientError:
+            return None
+        return response.status_code
+
+    async def stream_prediction(self, flow_id: str, payload: Dict[str, Any],
+                                timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """POST a streaming prediction and yield the response's SSE lines as they arrive
+
+        Flows that cannot stream answer with plain JSON; that answer is replayed as
+        token, metadata and end events so callers always see one event stream.
+        """
+        path = f"/api/v1/prediction/{flow_id}"
+        body = {**payload, "streaming": True}
+        try:
+            async with self._get_client().stream("POST", path, json=body, timeout=self._timeout(timeout)) as response:
+                if response.status_code >= 400 or \
+                        "text/event-stream" not in response.headers.get("content-type", ""):
+                    await response.aread()
+                    result = self._json(response)
+                else:
+                    async for line in response.aiter_lines():
+                        yield line
+                    return
+        except httpx.HTTPError as e:
+            raise FlowiseClientError(f"POST {path} stream failed: {e}") from e
+
+        for line in _json_answer_as_sse(result):
+            yield line
+
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Per-flow retry, hedge, timeout and circuit breaker state"""
+        if self.resilience is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.resilience.get_stats()}
+
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        try:
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise FlowiseClientError(str(e), status_code=response.status_code) from e
+        except ValueError as e:
+            raise FlowiseClientError(f"Invalid JSON from {response.request.url}: {e}",
+                                     status_code=response.status_code) from e
+
+    async def aclose(self) -> None:
+        """Close the pool owned by the running event loop (it is reopened on next use)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> "FlowiseClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+def _json_answer_as_sse(result: Any) -> Iterator[str]:
+    """SSE lines equivalent to a non-streamed Flowise answer"""
+    answer = result if isinstance(result, dict) else {"text": str(result)}
+    events = [
+        {"event": "token", "data": answer.get("text") or answer.get("answer") or ""},
+        {"event": "metadata", "data": {k: v for k, v in answer.items() if k not in ("text", "answer")}},
+        {"event": "end", "data": "[DONE]"},
+    ]
+    for event in events:
+        yield f"data: {json.dumps(event)}"
+        yield ""
+
+
+class _LoopThread:
+    """A private event loop on a daemon thread, so blocking callers keep one warm pool between calls"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="flowise-client-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+_loop_thread: Optional[_LoopThread] = None
+_loop_thread_lock = threading.Lock()
+
+
+def _get_loop_thread() -> _LoopThread:
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = _LoopThread()
+        return _loop_thread
+
+
+class SyncFlowiseClient:
+    """Blocking facade over a FlowiseClient for CLI and other synchronous callers"""
+
+    def __init__(self, client: FlowiseClient):
+        self.client = client
+
+    def _run(self, coro):
+        return _get_loop_thread().run(coro)
+
+    def request(self, method: str, path: str, json: Any = None, timeout: Optional[float] = None) -> httpx.Response:
+        """Blocking FlowiseClient.request"""
+        return self._run(self.client.request(method, path, json=json, timeout=timeout))
+
+    def get_json(self, path: str, timeout: Optional[float] = None) -> Any:
+        """Blocking FlowiseClient.get_json"""
+        return self._run(self.client.get_json(path, timeout=timeout))
+
+    def predict(self, flow_id: str, payload: Dict[str, Any], timeout: Optional[float] = None,
+                idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """Blocking FlowiseClient.predict"""
+        return self._run(self.client.predict(flow_id, payload, timeout=timeout, idempotent=idempotent))
+
+    def prediction_status(self, flow_id: str, payload: Dict[str, Any],
+                          timeout: Optional[float] = None) -> Optional[int]:
+        """Blocking FlowiseClient.prediction_status"""
+        return self._run(self.client.prediction_status(flow_id, payload, timeout=timeout))
+
+    def run(self, coro):
+        """Run a coroutine that uses the client on the blocking facade's event loop"""
+        return self._run(coro)
+
+    def close(self) -> None:
+        """Close the pool used by blocking calls"""
+        self._run(self.client.aclose())
+
+
+_clients: Dict[str, FlowiseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_flowise_client(base_url: str, **options) -> FlowiseClient:
+    """Get the shared client for a Flowise server (options only apply when it is first created;
+    resilience defaults to ResiliencePolicy.from_env())"""
+    key = base_url.rstrip('/')
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            options.setdefault("resilience", ResiliencePolicy.from_env())
+            client = FlowiseClient(key, **options)
+            _clients[key] = client
+        return client
+
+
+async def close_flowise_clients() -> None:
+    """Close every shared client's pool on the running event loop"""
+    with _clients_lock:
+        clients = list(_clients.values())
+    for client in clients:
+        await client.aclose()
@@ -4,14 +4,26 @@ Provides programmatic access to flowise with adaptive configuration
 """
 
 import json
-import requests
 import time
 import uuid
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple
+from dataclasses import dataclass, replace
 import logging
-import yaml
-from pathlib import Path
+
+try:
+    from .flowise_client import FlowiseClientError, SyncFlowiseClient, get_flowise_client
+    from .prediction_cache import PredictionCache, caller_session, make_cache_key
+    from .single_flight import SingleFlight, get_single_flight
+    from .intent_classifier import IntentClassifier, IntentClassification
+    from .flow_registry import FlowRegistry, RegistrySnapshot, get_flow_registry, thaw
+    from .health import HealthMonitor, get_health_monitor
+except ImportError:
+    from flowise_client import FlowiseClientError, SyncFlowiseClient, get_flowise_client
+    from prediction_cache import PredictionCache, caller_session, make_cache_key
+    from single_flight import SingleFlight, get_single_flight
+    from intent_classifier import IntentClassifier, IntentClassification
+    from flow_registry import FlowRegistry, RegistrySnapshot, get_flow_registry, thaw
+    from health import HealthMonitor, get_health_monitor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -29,50 +41,61 @@ class FlowConfig:
 class FlowiseManager:
     """Agentic Flywheel Flowise Manager"""
     
-    def __init__(self, base_url: str = "https://beagle-emerging-gnu.ngrok-free.app", flow_registry_path: Optional[str] = None):
+    def __init__(self, base_url: str = "https://beagle-emerging-gnu.ngrok-free.app", flow_registry_path: Optional[str] = None,
+                 cache: Optional[PredictionCache] = None, single_flight: Optional[SingleFlight] = None):
         self.base_url = base_url
         self.flow_registry_path = flow_registry_path
         self.flows: Dict[str, FlowConfig] = {}
+        # One pooled client per Flowise server, shared with every other manager in the process
+        self.client = get_flowise_client(base_url)
+        self.sync_client = SyncFlowiseClient(self.client)
+        # Cached per-flow health from metadata probes (shared per server, consulted by the router)
+        self.health: HealthMonitor = get_health_monitor(self.client)
+        # Opt-in prediction cache (None disables caching)
+        self.cache = cache
+        # Identical stateless queries in flight at once share one upstream call
+        self.single_flight = single_flight or get_single_flight()
+        # Keyword index over self.flows, built lazily and rebuilt after the flows change
+        self._intent_classifier: Optional[IntentClassifier] = None
+        # Shared, hot-reloading registry service; flows are rebuilt whenever it reloads
+        self.registry: Optional[FlowRegistry] = None
+        self._registry_version = 0
         self._load_flows_from_registry()
 
     def _load_flows_from_registry(self):
-        """Load flows from flow-registry.yaml"""
-        registry_paths = []
-        if self.flow_registry_path:
-            registry_paths.append(Path(self.flow_registry_path))
-        
-        # Fallback to package-bundled config, then development location
-        registry_paths.append(Path(__file__).parent / "config" / "flow-registry.yaml")
-        registry_paths.append(Path(__file__).parent.parent / "flow-registry.yaml") # Development location
-        
-        loaded = False
-        for registry_path in registry_paths:
-            if registry_path.exists():
-                try:
-                    with open(registry_path, 'r') as f:
-                        registry = yaml.safe_load(f)
-                    
-                    self.flows = {}
-                    for flow_type in ['operational_flows', 'routing_flows']:
-                        for flow_key, flow_config in registry.get(flow_type, {}).items():
-                            # Only load active flows for FlowiseManager
-                            if flow_config.get('active', 0) == 1:
-                                self.flows[flow_key] = FlowConfig(
-                                    id=flow_config['id'],
-                                    name=flow_config['name'],
-                                    description=flow_config['description'],
-                                    default_config=flow_config.get('config', {}),
-                                    intent_keywords=flow_config.get('intent_keywords', [])
-                                )
-                    logger.info(f"✅ Loaded {len(self.flows)} active flows from YAML registry: {registry_path}")
-                    loaded = True
-                    break
-                except Exception as e:
-                    logger.error(f"❌ Failed to load flows from {registry_path}: {e}")
-                    continue
-        
-        if not loaded:
+        """Load flows from flow-registry.yaml (parsed once per process) and follow its reloads"""
+        try:
+            self.registry = get_flow_registry(self.flow_registry_path)
+        except Exception as e:
+            logger.error(f"❌ Failed to load flow registry: {e}")
+            self.registry = None
+        
+        if self.registry is None:
             logger.warning("❌ Flow registry not found. No flows loaded.")
+            self.invalidate_intent_index()
+            return
+        
+        self._apply_registry(self.registry.snapshot)
+        self.registry.subscribe(self._apply_registry)
+        logger.info(f"✅ Loaded {len(self.flows)} active flows from YAML registry: {self.registry.path}")
+
+    def _apply_registry(self, snapshot: RegistrySnapshot) -> None:
+        """Swap in the active flows of a registry snapshot (older snapshots are ignored)"""
+        if snapshot.version <= self._registry_version:
+            return
+        # Only load active flows for FlowiseManager; configs are copied so callers may modify them
+        self.flows = {
+            flow_key: FlowConfig(
+                id=flow_config['id'],
+                name=flow_config['name'],
+                description=flow_config['description'],
+                default_config=thaw(flow_config.get('config', {})),
+                intent_keywords=thaw(flow_config.get('intent_keywords', ()))
+            )
+            for flow_key, flow_config in snapshot.flows(active_only=True).items()
+        }
+        self._registry_version = snapshot.version
+        self.invalidate_intent_index()
 
     def generate_session_id(self, prefix: str = "session") -> str:
         """Generate unique session ID"""
@@ -80,46 +103,62 @@ class FlowiseManager:
         unique_suffix = str(uuid.uuid4())[:8]
         return f"{prefix}-{timestamp}-{unique_suffix}"
     
+    def invalidate_intent_index(self) -> None:
+        """Rebuild the intent index on next use (call after changing flows or their keywords)"""
+        self._intent_classifier = None
+    
+    @property
+    def intent_classifier(self) -> IntentClassifier:
+        """Compiled keyword index over the current flows"""
+        if self._intent_classifier is None:
+            default = "creative-orientation" if "creative-orientation" in self.flows else next(iter(self.flows), None)
+            self._intent_classifier = IntentClassifier(
+                {name: flow.intent_keywords for name, flow in self.flows.items()}, default=default
+            )
+        return self._intent_classifier
+    
+    def classify_question(self, question: str) -> IntentClassification:
+        """Ranked flows with keyword scores and a confidence for the best one"""
+        return self.intent_classifier.classify(question)
+    
     def classify_intent(self, question: str):
         """Classify user intent based on question content"""
-        question_lower = question.lower()
-        
-        # Score each flow based on keyword matches
-        scores = {}
-        for flow_name, flow_config in self.flows.items():
-            score = sum(1 for keyword in flow_config.intent_keywords 
-                       if keyword in question_lower)
-            scores[flow_name] = score
-        
-        # Return the flow with highest score, default to creative-orientation
-        best_flow = max(scores.items(), key=lambda x: x[1])
-        return best_flow[0] if best_flow[1] > 0 else "creative-orientation"
+        # Flow with the most keyword matches, default to creative-orientation (or the first flow)
+        return self.classify_question(question).intent
     
-    def adaptive_query(self, 
-                      question: str, 
-                      intent: Optional[str] = None,
-                      session_id: Optional[str] = None,
-                      flow_override: Optional[str] = None,
-                      config_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Intelligently route and configure flowise query
+    def _prepare_query(self,
+                       question: str,
+                       intent: Optional[str],
+                       session_id: Optional[str],
+                       flow_override: Optional[str],
+                       config_override: Optional[Dict[str, Any]],
+                       stateless: bool = False):
+        """Select the flow and build the prediction payload (the question is classified once, here)
+
+        Stateless queries get no session: no sessionId is sent and the returned session_id is None.
         """
+        if self.registry:
+            self.registry.current()  # picks up registry edits (cheap: stats the file at most every few seconds)
+        classification = self.classify_question(question)
+        detected_intent = classification.intent
+        
         # Determine flow and configuration
         if flow_override:
             flow_config = self._get_flow_by_id(flow_override)
             if not flow_config:
                 logger.warning(f"Flow override '{flow_override}' not found, using intent-based selection")
-                flow_config = self._select_flow_by_intent(question, intent)
+                flow_config = self._select_flow_by_intent(intent, classification)
         else:
-            flow_config = self._select_flow_by_intent(question, intent)
+            flow_config = self._select_flow_by_intent(intent, classification)
         
         # Generate session ID if not provided
-        if not session_id:
+        if not session_id and not stateless:
             session_id = self.generate_session_id(flow_config.name.lower().replace(" ", "-"))
         
         # Build configuration
         config = flow_config.default_config.copy()
-        config["sessionId"] = session_id
+        if session_id:
+            config["sessionId"] = session_id
         
         # Apply any configuration overrides
         if config_override:
@@ -135,35 +174,145 @@ class FlowiseManager:
         logger.info(f"Session ID: {session_id}")
         logger.debug(f"Configuration: {json.dumps(config, indent=2)}")
         
+        return flow_config, session_id, config, payload, detected_intent
+    
+    def _finish_query(self, result: Dict[str, Any], intent_detected: Optional[str], flow_config: FlowConfig,
+                      session_id: str, config: Dict[str, Any], cached: bool = False,
+                      coalesced: bool = False) -> Dict[str, Any]:
+        """Attach routing metadata to a prediction result"""
+        result["_metadata"] = {
+            "flow_used": flow_config.name,
+            "flow_id": flow_config.id,
+            "session_id": session_id,
+            "intent_detected": intent_detected,
+            "config_used": config,
+            "cached": cached,
+            "coalesced": coalesced
+        }
+        return result
+    
+    def _cache_key(self, question: str, flow_config: FlowConfig, config: Dict[str, Any],
+                   bypass_cache: bool, caller_session: Optional[str]) -> Optional[str]:
+        """Prediction cache key, or None when the cache is off, bypassed, the config is not cacheable
+        or the caller's session makes the answer depend on its history"""
+        if self.cache is None:
+            return None
+        if bypass_cache:
+            self.cache.record_bypass()
+            return None
+        return self.cache.key_for(flow_config.id, question, config, caller_session)
+    
+    def _store_result(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        if cache_key and isinstance(result, dict) and "error" not in result:
+            self.cache.put(cache_key, result)
+    
+    async def _predict(self, question: str, flow_config: FlowConfig, config: Dict[str, Any],
+                       payload: Dict[str, Any], bypass_cache: bool, coalesce: bool,
+                       caller_session: Optional[str] = None) -> Tuple[Dict[str, Any], bool, bool]:
+        """Answer a prepared query from the cache, a matching in-flight call or Flowise:
+        returns (result, cached, coalesced)"""
+        cache_key = self._cache_key(question, flow_config, config, bypass_cache, caller_session)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, True, False
+        
+        coalesced = False
+        if coalesce:
+            # Coalescable queries are stateless, so the client may also retry or hedge them
+            result, coalesced = await self.single_flight.do(
+                make_cache_key(flow_config.id, question, config),
+                lambda: self.client.predict(flow_config.id, payload, timeout=30, idempotent=True)
+            )
+        else:
+            result = await self.client.predict(flow_config.id, payload, timeout=30, idempotent=False)
+        if not coalesced:
+            self._store_result(cache_key, result)
+        return result, False, coalesced
+    
+    def _query_error(self, error: Exception, flow_config: FlowConfig, session_id: str) -> Dict[str, Any]:
+        logger.error(f"Request failed: {error}")
+        return {
+            "error": str(error),
+            "flow_attempted": flow_config.name,
+            "session_id": session_id
+        }
+    
+    def adaptive_query(self, 
+                      question: str, 
+                      intent: Optional[str] = None,
+                      session_id: Optional[str] = None,
+                      flow_override: Optional[str] = None,
+                      config_override: Optional[Dict[str, Any]] = None,
+                      bypass_cache: bool = False,
+                      coalesce: bool = False) -> Dict[str, Any]:
+        """
+        Intelligently route and configure flowise query
+        (coalesce=True opts a one-off query into sharing an identical in-flight prediction: it then has no
+        session, so no sessionId is generated or sent and session_id is None; ignored when a session is supplied)
+        """
+        supplied_session = caller_session(session_id, config_override)
+        # A coalesced answer is shared by several callers, so it must not belong to any conversation
+        coalesce = coalesce and supplied_session is None
+        flow_config, session_id, config, payload, detected_intent = self._prepare_query(
+            question, intent, session_id, flow_override, config_override, stateless=coalesce
+        )
+        
         try:
-            response = requests.post(
-                f"{self.base_url}/api/v1/prediction/{flow_config.id}",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
+            result, cached, coalesced = self.sync_client.run(
+                self._predict(question, flow_config, config, payload, bypass_cache, coalesce, supplied_session)
             )
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            # Add metadata to response
-            result["_metadata"] = {
-                "flow_used": flow_config.name,
-                "flow_id": flow_config.id,
-                "session_id": session_id,
-                "intent_detected": self.classify_intent(question),
-                "config_used": config
-            }
-            
-            return result
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            return {
-                "error": str(e),
-                "flow_attempted": flow_config.name,
-                "session_id": session_id
-            }
+            return self._finish_query(result, detected_intent, flow_config, session_id, config, cached, coalesced)
+        except FlowiseClientError as e:
+            return self._query_error(e, flow_config, session_id)
+    
+    async def adaptive_query_async(self,
+                                   question: str,
+                                   intent: Optional[str] = None,
+                                   session_id: Optional[str] = None,
+                                   flow_override: Optional[str] = None,
+                                   config_override: Optional[Dict[str, Any]] = None,
+                                   bypass_cache: bool = False,
+                                   coalesce: bool = False) -> Dict[str, Any]:
+        """
+        Non-blocking adaptive_query for async callers (gateway, MCP servers, backends)
+        """
+        supplied_session = caller_session(session_id, config_override)
+        # A coalesced answer is shared by several callers, so it must not belong to any conversation
+        coalesce = coalesce and supplied_session is None
+        flow_config, session_id, config, payload, detected_intent = self._prepare_query(
+            question, intent, session_id, flow_override, config_override, stateless=coalesce
+        )
+        
+        try:
+            result, cached, coalesced = await self._predict(
+                question, flow_config, config, payload, bypass_cache, coalesce, supplied_session
+            )
+            return self._finish_query(result, detected_intent, flow_config, session_id, config, cached, coalesced)
+        except FlowiseClientError as e:
+            return self._query_error(e, flow_config, session_id)
+    
+    def adaptive_stream(self,
+                        question: str,
+                        intent: Optional[str] = None,
+                        session_id: Optional[str] = None,
+                        flow_override: Optional[str] = None,
+                        config_override: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], AsyncIterator[str]]:
+        """
+        Route a question like adaptive_query and open a streaming prediction:
+        returns (routing metadata, async iterator of raw SSE lines)
+        """
+        flow_config, session_id, config, payload, detected_intent = self._prepare_query(
+            question, intent, session_id, flow_override, config_override
+        )
+        metadata = {
+            "flow_used": flow_config.name,
+            "flow_id": flow_config.id,
+            "session_id": session_id,
+            "intent_detected": detected_intent,
+            "config_used": config
+        }
+        return metadata, self.client.stream_prediction(flow_config.id, payload, timeout=30)
     
     def _get_flow_by_id(self, flow_id: str) -> Optional[FlowConfig]:
         """Get flow configuration by ID"""
@@ -172,14 +321,24 @@ class FlowiseManager:
                 return flow_config
         return None
     
-    def _select_flow_by_intent(self, question: str, intent: Optional[str]) -> FlowConfig:
-        """Select flow based on intent or question analysis"""
+    def _select_flow_by_intent(self, intent: Optional[str], classification: IntentClassification) -> FlowConfig:
+        """Select flow based on intent or the question's classification"""
         if intent and intent in self.flows:
             return self.flows[intent]
         
-        # Auto-classify intent
-        detected_intent = self.classify_intent(question)
-        return self.flows[detected_intent]
+        # Classified intent, steering away from flows known to be down
+        return self.flows[self.select_healthy_flow(classification.intent, classification)]
+    
+    def select_healthy_flow(self, name: str, classification: Optional[IntentClassification] = None) -> str:
+        """name, or the best-ranked alternative when name's flow is known to be unhealthy (no I/O)"""
+        if name not in self.flows or self.health.is_healthy(self.flows[name].id):
+            return name
+        alternatives = classification.alternatives(list(self.flows)) if classification else list(self.flows)
+        for alternative in alternatives:
+            if alternative != name and self.health.is_healthy(self.flows[alternative].id):
+                logger.warning(f"⚠️ Flow '{name}' is unhealthy, routing to '{alternative}'")
+                return alternative
+        return name
     
     def list_flows(self) -> Dict[str, Dict[str, Any]]:
         """List available flows with their configurations"""
@@ -195,20 +354,23 @@ class FlowiseManager:
         }
     
     def test_connection(self) -> bool:
-        """Test connection to flowise server"""
-        try:
-            # Try a simple request to detect server availability
-            test_payload = {"question": "test"}
-            test_flow = list(self.flows.values())[0]
-            
-            response = requests.post(
-                f"{self.base_url}/api/v1/prediction/{test_flow.id}",
-                json=test_payload,
-                timeout=5
-            )
-            return response.status_code in [200, 400, 422]  # Accept various response codes
-        except:
+        """Test connection to flowise server (cached ping, no prediction)"""
+        return self.sync_client.run(self.test_connection_async())
+    
+    async def test_connection_async(self) -> bool:
+        """Non-blocking test_connection"""
+        if not self.flows:
             return False
+        return (await self.health.check_server()).healthy
+    
+    def check_flow_health(self, flow_ids: List[str], force: bool = False) -> Dict[str, bool]:
+        """Whether each flow id is available, probed concurrently and cached for the health TTL"""
+        return {flow_id: health.healthy for flow_id, health in
+                self.sync_client.run(self.health.check_flows(flow_ids, force=force)).items()}
+    
+    async def aclose(self) -> None:
+        """Release this event loop's pooled connections to the flowise server"""
+        await self.client.aclose()
 
 def main():
     """CLI interface for flowise manager"""
@@ -225,6 +387,8 @@ def main():
     parser.add_argument("--base-url", default="http://localhost:3222", help="Flowise server URL")
     parser.add_argument("--list-flows", action="store_true", help="List available flows")
     parser.add_argument("--test-connection", action="store_true", help="Test connection to flowise")
+    parser.add_argument("--cache-db", help="Cache low-temperature predictions in this SQLite file")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the prediction cache for this query")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     
     args = parser.parse_args()
@@ -232,7 +396,8 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    manager = FlowiseManager(base_url=args.base_url)
+    cache = PredictionCache(db_path=args.cache_db) if args.cache_db else PredictionCache.from_env()
+    manager = FlowiseManager(base_url=args.base_url, cache=cache)
     
     if args.list_flows:
         flows = manager.list_flows()
@@ -259,7 +424,8 @@ def main():
         intent=args.intent,
         session_id=args.session_id,
         flow_override=args.flow_override,
-        config_override=config_override if config_override else None
+        config_override=config_override if config_override else None,
+        bypass_cache=args.no_cache
     )
     
     if "error" in result:
@@ -336,64 +502,71 @@ class ContextBuilder:
         Context: {domain_info.get('strategic_context', 'No additional context')}
         """
 
+# Flows that receive a domain's specialized keywords, and the hints a keyword must contain to go there
+DOMAIN_KEYWORD_ROUTES = {
+    "technical-analysis": ("implement", "code", "system", "api", "database"),
+    "creative-orientation": ("vision", "strategic", "improve", "enhance", "design"),
+    "faith2story": ("content", "story", "cultural", "lesson", "narrative"),
+}
+
 class DomainSpecificFlowiseManager(FlowiseManager):
     """Extended FlowiseManager with domain expertise and enhanced capabilities"""
     
     def __init__(self, base_url: str = "https://beagle-emerging-gnu.ngrok-free.app", domain_context: Optional[DomainContext] = None):
         super().__init__(base_url)
         self.domain_context = domain_context
-        self.working_flows_cache = None
         self.context_builder = ContextBuilder()
+        # Domain keywords laid over each flow's registry keywords
+        self.keyword_overlays: Dict[str, Tuple[str, ...]] = {}
         
         # Add domain-specific keywords to intent classification if provided
         if domain_context and domain_context.specialized_keywords:
             self._enhance_intent_keywords(domain_context.specialized_keywords)
     
+    def _apply_registry(self, snapshot: RegistrySnapshot) -> None:
+        """Keep the plain registry flows and lay the domain keywords over them again"""
+        version = self._registry_version
+        super()._apply_registry(snapshot)
+        if self._registry_version == version:
+            return
+        self._base_flows = self.flows
+        domain_context = getattr(self, "domain_context", None)
+        if domain_context and domain_context.specialized_keywords:
+            self._enhance_intent_keywords(domain_context.specialized_keywords)
+    
     def _enhance_intent_keywords(self, specialized_keywords: List[str]):
-        """Add domain-specific keywords to existing flows"""
+        """Add domain-specific keywords to existing flows
+        
+        Copy-on-write: flows that gain keywords are replaced by copies, the registry flows are
+        never modified, so re-applying (e.g. after a registry reload) does not grow the lists.
+        """
+        base_flows = getattr(self, "_base_flows", self.flows)
+        self.keyword_overlays = {}
+        flows = dict(base_flows)
         # Distribute specialized keywords across flows based on relevance
-        for flow_name, flow_config in self.flows.items():
-            if flow_name == "technical-analysis":
-                flow_config.intent_keywords.extend([kw for kw in specialized_keywords if any(tech in kw.lower() for tech in ["implement", "code", "system", "api", "database"])])
-            elif flow_name == "creative-orientation":
-                flow_config.intent_keywords.extend([kw for kw in specialized_keywords if any(creative in kw.lower() for creative in ["vision", "strategic", "improve", "enhance", "design"])])
-            elif flow_name == "faith2story":
-                flow_config.intent_keywords.extend([kw for kw in specialized_keywords if any(content in kw.lower() for content in ["content", "story", "cultural", "lesson", "narrative"])])
+        for flow_name, hints in DOMAIN_KEYWORD_ROUTES.items():
+            if flow_name not in base_flows:
+                continue
+            extra = tuple(kw for kw in specialized_keywords if any(hint in kw.lower() for hint in hints))
+            if extra:
+                self.keyword_overlays[flow_name] = extra
+                base = base_flows[flow_name]
+                flows[flow_name] = replace(base, intent_keywords=list(base.intent_keywords) + list(extra))
+        self.flows = flows
+        self.invalidate_intent_index()
     
     def discover_working_flows(self) -> Dict[str, bool]:
-        """Test all flows to identify which ones are operational"""
-        if self.working_flows_cache is not None:
-            return self.working_flows_cache
-        
-        logger.info("Discovering working flows...")
-        working_flows = {}
-        
-        for flow_name, flow_config in self.flows.items():
-            is_working = self.test_flow(flow_config.id)
-            working_flows[flow_name] = is_working
-            
-            if is_working:
-                logger.info(f"✅ Flow '{flow_name}' is operational")
-            else:
+        """Probe all flows concurrently to identify which ones are operational (cached for the health TTL)"""
+        health = self.check_flow_health([flow.id for flow in self.flows.values()])
+        working_flows = {name: health.get(flow.id, False) for name, flow in self.flows.items()}
+        for flow_name, is_working in working_flows.items():
+            if not is_working:
                 logger.warning(f"❌ Flow '{flow_name}' is not responding")
-        
-        self.working_flows_cache = working_flows
         return working_flows
     
     def test_flow(self, flow_id: str) -> bool:
-        """Test specific flow ID for functionality"""
-        try:
-            test_payload = {"question": "test connectivity"}
-            response = requests.post(
-                f"{self.base_url}/api/v1/prediction/{flow_id}",
-                json=test_payload,
-                timeout=10
-            )
-            # Consider various response codes as "working"
-            return response.status_code in [200, 400, 422, 500]  # Even 500 means server is responding
-        except Exception as e:
-            logger.debug(f"Flow test failed for {flow_id}: {e}")
-            return False
+        """Test specific flow ID for availability"""
+        return self.check_flow_health([flow_id]).get(flow_id, False)
     
     def get_working_flows(self) -> Dict[str, FlowConfig]:
         """Get only the flows that are currently operational"""
@@ -403,18 +576,8 @@ class DomainSpecificFlowiseManager(FlowiseManager):
             if working_status.get(name, False)
         }
     
-    def contextualized_query(self,
-                           question: str,
-                           context_type: str = "general",
-                           intent: Optional[str] = None,
-                           session_id: Optional[str] = None,
-                           config_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Query with automatic domain context injection"""
-        
-        if not self.domain_context:
-            # Fall back to regular adaptive_query if no domain context
-            return self.adaptive_query(question, intent, session_id, config_override)
-        
+    def _contextualize(self, question: str, context_type: str, session_id: Optional[str]):
+        """Inject domain context into the question and derive a domain session ID"""
         # Build contextualized question based on context type
         if context_type == "technical" and self.domain_context.stack_info:
             contextualized_question = self.context_builder.build_technical_context(
@@ -443,6 +606,22 @@ class DomainSpecificFlowiseManager(FlowiseManager):
             domain_name = self.domain_context.name.lower().replace(" ", "-")
             session_id = self.generate_session_id(f"{domain_name}-{context_type}")
         
+        return contextualized_question, session_id
+    
+    def contextualized_query(self,
+                           question: str,
+                           context_type: str = "general",
+                           intent: Optional[str] = None,
+                           session_id: Optional[str] = None,
+                           config_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Query with automatic domain context injection"""
+        
+        if not self.domain_context:
+            # Fall back to regular adaptive_query if no domain context
+            return self.adaptive_query(question, intent, session_id, config_override=config_override)
+        
+        contextualized_question, session_id = self._contextualize(question, context_type, session_id)
+        
         return self.adaptive_query(
             question=contextualized_question,
             intent=intent,
@@ -450,6 +629,25 @@ class DomainSpecificFlowiseManager(FlowiseManager):
             config_override=config_override
         )
     
+    async def contextualized_query_async(self,
+                                         question: str,
+                                         context_type: str = "general",
+                                         intent: Optional[str] = None,
+                                         session_id: Optional[str] = None,
+                                         config_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Non-blocking contextualized_query"""
+        if not self.domain_context:
+            return await self.adaptive_query_async(question, intent, session_id, config_override=config_override)
+        
+        contextualized_question, session_id = self._contextualize(question, context_type, session_id)
+        
+        return await self.adaptive_query_async(
+            question=contextualized_question,
+            intent=intent,
+            session_id=session_id,
+            config_override=config_override
+        )
+    
     def classify_intent_with_context(self, question: str) -> str:
         """Enhanced intent classification with domain context"""
         # Use base classification first
@@ -1,9 +1,934 @@
-import click
+#!/usr/bin/env python3
+"""
+Flowise HTTP Gateway
+Provides REST API access to flowise automation capabilities for any agent or system
+"""
+
+import asyncio
+import functools
+import gc
+import json
+import logging
+import os
+import shutil
+import signal
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+import uvicorn
+
+# Try to import our flowise modules
+try:
+    import sys
+    # The directory holding the agentic_flywheel package, so `backends` resolves as well
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from agentic_flywheel.flowise_manager import FlowiseManager, FlowConfig, DomainSpecificFlowiseManager, DomainContext
+    from agentic_flywheel.flowise_client import close_flowise_clients
+    from agentic_flywheel.prediction_cache import PredictionCache
+    from agentic_flywheel.domain_cache import DomainManagerCache, domain_context_key, DEFAULT_MAX_MANAGERS
+    from agentic_flywheel.session_store import SessionStore, session_store_from_env
+    from agentic_flywheel.worker_metrics import WorkerMetricsBoard, aggregate, worker_metrics_from_env
+    from agentic_flywheel.batch_engine import (
+        BatchEngine, BatchItemResult, BatchTooLargeError, summarize_results,
+        DEFAULT_BATCH_CONCURRENCY, DEFAULT_ITEM_TIMEOUT, DEFAULT_MAX_BATCH_SIZE
+    )
+except ImportError as e:
+    logging.warning(f"Could not import flowise modules: {e}")
+    FlowiseManager = None
+    FlowConfig = None
+    DomainSpecificFlowiseManager = None
+    DomainContext = None
+    close_flowise_clients = None
+    PredictionCache = None
+    DomainManagerCache = None
+    session_store_from_env = None
+    worker_metrics_from_env = None
+    BatchEngine = None
+
+# Streaming goes through the universal backend layer
+try:
+    from backends import BackendRegistry
+    from backends.base import BackendType
+    from backends.flowise import FlowiseBackend
+except ImportError as e:
+    logging.warning(f"Could not import backend modules: {e}")
+    BackendRegistry = None
+    BackendType = None
+    FlowiseBackend = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pydantic models for API
+class FlowRequest(BaseModel):
+    question: str = Field(..., description="Question to ask the flow")
+    session_id: Optional[str] = Field(None, description="Session ID for context continuity")
+    intent: Optional[str] = Field(None, description="Explicit intent for flow selection")
+    config_override: Optional[Dict[str, Any]] = Field(None, description="Configuration overrides")
+    bypass_cache: bool = Field(False, description="Skip the prediction cache for this request")
+    stateless: bool = Field(False, description="One-off query without a session: no session is created or "
+                                               "returned, and identical in-flight stateless queries share one prediction")
+
+class RouteRequest(BaseModel):
+    question: str = Field(..., description="Question to route automatically")
+    auto_detect: bool = Field(True, description="Auto-detect optimal flow")
+    session_id: Optional[str] = Field(None, description="Session ID")
+    confidence_threshold: float = Field(0.6, description="Minimum confidence for routing")
+    stateless: bool = Field(False, description="One-off query without a session: no session is created or "
+                                               "returned, and identical in-flight stateless queries share one prediction")
+
+class SessionRequest(BaseModel):
+    flow_type: str = Field(..., description="Flow type for session")
+    workspace: Optional[str] = Field(None, description="Workspace context")
+    ttl: Optional[int] = Field(3600, description="Session TTL in seconds")
+
+class DomainRequest(BaseModel):
+    question: str = Field(..., description="Question to ask with domain context")
+    domain_name: str = Field(..., description="Domain name for specialization")
+    domain_description: str = Field(..., description="Domain description")
+    context_type: str = Field("general", description="Context type: technical, cultural, strategic, general")
+    stack_info: Optional[Dict[str, Any]] = Field(None, description="Technical stack information")
+    cultural_info: Optional[Dict[str, Any]] = Field(None, description="Cultural context information")
+    specialized_keywords: Optional[List[str]] = Field(None, description="Domain-specific keywords")
+    session_id: Optional[str] = Field(None, description="Session ID for context continuity")
+    config_override: Optional[Dict[str, Any]] = Field(None, description="Configuration overrides")
+
+class FlowResponse(BaseModel):
+    success: bool
+    response: str
+    metadata: Dict[str, Any]
+    session_id: Optional[str] = Field(..., description="Session to continue with (null only for stateless requests)")
+    timestamp: str
+
+class RouteResponse(BaseModel):
+    success: bool
+    selected_flow: str
+    confidence: float
+    response: str
+    alternatives: List[str]
+    session_id: Optional[str] = Field(..., description="Session to continue with (null only for stateless requests)")
+
+class SessionResponse(BaseModel):
+    session_id: str
+    flow_type: str
+    created_at: str
+    expires_at: str
+
+class FlowListResponse(BaseModel):
+    flows: Dict[str, Dict[str, Any]]
+    total_count: int
+
+class HealthResponse(BaseModel):
+    status: str
+    version: str
+    uptime: str
+    flows_available: int
+
+# Upstream predictions allowed in flight per endpoint (override with FLOWISE_GATEWAY_<ENDPOINT>_CONCURRENCY).
+# Requests beyond the limit wait for a slot, up to FLOWISE_GATEWAY_QUEUE_TIMEOUT seconds, then get a 503.
+DEFAULT_ENDPOINT_CONCURRENCY = {"flows": 32, "route": 32, "domain": 8, "batch": 8}
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+def build_manager() -> Optional[FlowiseManager]:
+    """Flowise manager with the registry loaded and the intent index built (no prediction cache yet)"""
+    if not FlowiseManager:
+        return None
+    base_url = os.getenv("FLOWISE_BASE_URL")
+    manager = FlowiseManager(**({"base_url": base_url} if base_url else {}))
+    manager.intent_classifier  # build the keyword index now rather than on the first request
+    return manager
+
+class GatewayState:
+    """Everything one gateway app serves from: manager, sessions, concurrency limits, caches and metrics"""
+
+    def __init__(self):
+        self.flowise_manager: Optional[FlowiseManager] = None
+        self.start_time = datetime.now()
+        # Bounded, expiring sessions; set FLOWISE_SESSION_STORE to a SQLite path to share them between workers.
+        # Opened at startup, so SQLite connections are never inherited across a fork.
+        self.active_sessions: Optional["SessionStore"] = None
+        # Metrics snapshots shared between worker processes (FLOWISE_GATEWAY_METRICS_DB)
+        self.worker_metrics: Optional["WorkerMetricsBoard"] = None
+        self.metrics_task: Optional[asyncio.Task] = None
+        self.worker_id = f"pid-{os.getpid()}"
+        self.endpoint_limits: Dict[str, asyncio.Semaphore] = {}
+        self.endpoint_stats: Dict[str, Dict[str, int]] = {}
+        self.queue_timeout = DEFAULT_QUEUE_TIMEOUT
+        self.batch_engine: Optional["BatchEngine"] = None
+        self.backend_registry: Optional["BackendRegistry"] = None
+        self.domain_manager_cache: Optional["DomainManagerCache"] = None
+
+    def configure_endpoint_limits(self):
+        """Create the per-endpoint semaphores on the running event loop"""
+        self.queue_timeout = float(os.getenv("FLOWISE_GATEWAY_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT))
+        for endpoint, default in DEFAULT_ENDPOINT_CONCURRENCY.items():
+            limit = int(os.getenv(f"FLOWISE_GATEWAY_{endpoint.upper()}_CONCURRENCY", default))
+            self.endpoint_limits[endpoint] = asyncio.Semaphore(limit)
+            self.endpoint_stats[endpoint] = {"limit": limit, "in_flight": 0, "waiting": 0, "completed": 0, "rejected": 0}
+
+    @asynccontextmanager
+    async def endpoint_slot(self, endpoint: str):
+        """Hold one of the endpoint's upstream slots for the duration of a prediction"""
+        if endpoint not in self.endpoint_limits:
+            self.configure_endpoint_limits()
+        stats = self.endpoint_stats[endpoint]
+        stats["waiting"] += 1
+        try:
+            await asyncio.wait_for(self.endpoint_limits[endpoint].acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            stats["rejected"] += 1
+            raise HTTPException(status_code=503, detail=f"Gateway busy: '{endpoint}' concurrency limit reached")
+        finally:
+            stats["waiting"] -= 1
+
+        stats["in_flight"] += 1
+        try:
+            yield
+        finally:
+            stats["in_flight"] -= 1
+            stats["completed"] += 1
+            self.endpoint_limits[endpoint].release()
+
+    def preload(self):
+        """Load registry and classifier state in the parent process, so forked workers share it copy-on-write"""
+        if self.flowise_manager is None:
+            try:
+                self.flowise_manager = build_manager()
+            except Exception as e:
+                logger.error(f"❌ Failed to preload flowise manager: {e}")
+
+    def configure_session_store(self):
+        if self.active_sessions is None and session_store_from_env:
+            self.active_sessions = session_store_from_env()
+
+    def configure_batch_engine(self):
+        """Build the batch engine from FLOWISE_GATEWAY_BATCH_* settings"""
+        if not BatchEngine:
+            return
+        self.batch_engine = BatchEngine(
+            self.execute_batch_item,
+            concurrency=int(os.getenv("FLOWISE_GATEWAY_BATCH_FANOUT", DEFAULT_BATCH_CONCURRENCY)),
+            item_timeout=float(os.getenv("FLOWISE_GATEWAY_BATCH_ITEM_TIMEOUT", DEFAULT_ITEM_TIMEOUT)),
+            max_batch_size=int(os.getenv("FLOWISE_GATEWAY_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE))
+        )
+
+    def configure_domain_cache(self):
+        """Build the domain manager LRU from FLOWISE_GATEWAY_DOMAIN_CACHE_SIZE"""
+        if not DomainManagerCache:
+            return
+        self.domain_manager_cache = DomainManagerCache(
+            max_entries=int(os.getenv("FLOWISE_GATEWAY_DOMAIN_CACHE_SIZE", DEFAULT_MAX_MANAGERS))
+        )
+
+    async def startup(self):
+        """Initialize the flowise manager on startup"""
+        logger.info("🚀 Starting Flowise Gateway...")
+        self.worker_id = os.getenv("FLOWISE_GATEWAY_WORKER", f"pid-{os.getpid()}")
+
+        self.configure_endpoint_limits()
+        self.configure_batch_engine()
+        self.configure_domain_cache()
+        self.configure_session_store()
+
+        try:
+            if FlowiseManager:
+                # Reuse the manager preloaded before fork; caches and threads are per process
+                if self.flowise_manager is None:
+                    self.flowise_manager = build_manager()
+                manager = self.flowise_manager
+                manager.cache = PredictionCache.from_env()
+                if manager.cache is not None:
+                    logger.info("🗄️ Prediction cache enabled")
+                if manager.registry is not None:
+                    # Registry edits apply to every manager (and intent index) without a restart
+                    manager.registry.start_watching()
+                # Keep per-flow health fresh off the request path (metadata probes, no predictions)
+                manager.health.start_background_refresh(
+                    lambda: [flow.id for flow in manager.flows.values()]
+                )
+                logger.info("✅ Flowise manager initialized")
+            else:
+                logger.error("❌ FlowiseManager not available")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize flowise manager: {e}")
+
+        await self.initialize_backend_registry()
+        self.start_metrics_publisher()
+
+    async def shutdown(self):
+        """Release pooled connections to the flowise server"""
+        if self.metrics_task is not None:
+            self.metrics_task.cancel()
+            await run_blocking(self.worker_metrics.remove, self.worker_id)
+        if close_flowise_clients:
+            await close_flowise_clients()
+
+    async def initialize_backend_registry(self):
+        """Register the Flowise backend used by the streaming endpoints"""
+        if not (BackendRegistry and FlowiseBackend):
+            return
+        try:
+            base_url = os.getenv("FLOWISE_BASE_URL")
+            registry = BackendRegistry()
+            await registry.register_backend(FlowiseBackend(config={"base_url": base_url} if base_url else {}))
+            await registry.connect_backend(BackendType.FLOWISE)
+            self.backend_registry = registry
+            logger.info("✅ Streaming backend registry initialized")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize backend registry: {e}")
+
+    def worker_snapshot(self) -> Dict[str, Any]:
+        """This process's counters, as published to the shared metrics board (all of them add up across workers)"""
+        snapshot: Dict[str, Any] = {"endpoints": self.endpoint_stats}
+        if self.flowise_manager:
+            snapshot["coalescing"] = dict(self.flowise_manager.single_flight.metrics)
+            if self.flowise_manager.cache is not None:
+                snapshot["cache"] = dict(self.flowise_manager.cache.metrics)
+        if self.domain_manager_cache is not None:
+            snapshot["domain_cache"] = dict(self.domain_manager_cache.metrics)
+        return snapshot
+
+    def start_metrics_publisher(self):
+        """Publish worker_snapshot() to the shared board every few seconds"""
+        if self.worker_metrics is not None or not worker_metrics_from_env:
+            return
+        try:
+            self.worker_metrics = worker_metrics_from_env()
+        except Exception as e:
+            logger.error(f"❌ Failed to open worker metrics board: {e}")
+            return
+        if self.worker_metrics is None:
+            return
+        board = self.worker_metrics
+
+        async def publish_loop():
+            while True:
+                try:
+                    await run_blocking(board.publish, self.worker_id, self.worker_snapshot())
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not publish worker metrics: {e}")
+                await asyncio.sleep(board.publish_interval)
+
+        self.metrics_task = asyncio.get_running_loop().create_task(publish_loop())
+
+    async def get_session_info(self, session_id: str) -> Dict[str, Any]:
+        """Get or create session information (each use extends the session's expiry)"""
+        if self.active_sessions is None:
+            return {}
+        record = await run_blocking(self.active_sessions.touch, session_id)
+        return record.to_dict()
+
+    async def execute_batch_item(self, req: FlowRequest) -> "BatchItemResult":
+        """One batch item: holds a global batch slot, so concurrent batches share the upstream budget"""
+        session_id = request_session_id(req.session_id, req.stateless, "batch")
+        async with self.endpoint_slot("batch"):
+            result = await self.flowise_manager.adaptive_query_async(
+                question=req.question,
+                intent=req.intent,
+                session_id=session_id,
+                config_override=req.config_override,
+                bypass_cache=req.bypass_cache,
+                coalesce=session_id is None
+            )
+
+        if "error" in result:
+            return BatchItemResult(index=0, success=False, session_id=session_id, error=result["error"])
+        return BatchItemResult(
+            index=0,
+            success=True,
+            session_id=session_id,
+            response=result.get("text", result.get("answer", str(result)))
+        )
+
+def generate_session_id(flow_type: str = "session") -> str:
+    """Generate a unique session ID"""
+    return f"chat:{flow_type}:{str(uuid.uuid4())}"
+
+def request_session_id(session_id: Optional[str], stateless: bool, flow_type: str) -> Optional[str]:
+    """The caller's session, a new one, or None for a stateless request (which may then be coalesced)"""
+    if session_id or not stateless:
+        return session_id or generate_session_id(flow_type)
+    return None
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call (e.g. a SQLite session store waiting on another worker's write lock) off the event loop"""
+    return await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+def gateway_state(http_request: Request) -> GatewayState:
+    """The state of the app serving this request"""
+    return http_request.app.state.gateway
+
+# Routes are shared; each app from create_app() serves them from its own GatewayState
+router = APIRouter()
+
+@router.get("/", response_model=HealthResponse)
+async def health_check(state: GatewayState = Depends(gateway_state)):
+    """Health check endpoint"""
+    uptime = datetime.now() - state.start_time
+
+    if state.flowise_manager:
+        flows_count = len(state.flowise_manager.flows)
+    else:
+        flows_count = 0
+
+    return HealthResponse(
+        status="healthy" if state.flowise_manager else "degraded",
+        version="1.0.0",
+        uptime=str(uptime),
+        flows_available=flows_count
+    )
+
+@router.get("/api/v1/flows", response_model=FlowListResponse)
+async def list_flows(state: GatewayState = Depends(gateway_state)):
+    """List available flowise flows"""
+    if not state.flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+
+    flows_info = state.flowise_manager.list_flows()
+
+    return FlowListResponse(
+        flows=flows_info,
+        total_count=len(flows_info)
+    )
+
+@router.post("/api/v1/flows/{flow_name}", response_model=FlowResponse)
+async def query_flow(flow_name: str, request: FlowRequest, state: GatewayState = Depends(gateway_state)):
+    """Query a specific flow"""
+    flowise_manager = state.flowise_manager
+    if not flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+
+    # Generate session ID if not provided (stateless requests have none)
+    session_id = request_session_id(request.session_id, request.stateless, flow_name)
+
+    # Update session tracking
+    session_info = await state.get_session_info(session_id) if session_id else {}
+
+    try:
+        # Execute query
+        async with state.endpoint_slot("flows"):
+            result = await flowise_manager.adaptive_query_async(
+                question=request.question,
+                intent=flow_name if flow_name in flowise_manager.flows else request.intent,
+                session_id=session_id,
+                config_override=request.config_override,
+                bypass_cache=request.bypass_cache,
+                coalesce=session_id is None
+            )
+
+        # Extract response text
+        response_text = result.get("text", result.get("answer", str(result)))
+
+        # Build metadata
+        metadata = result.get("_metadata", {})
+        metadata.update({
+            "gateway_session_info": session_info,
+            "request_timestamp": datetime.now().isoformat()
+        })
+
+        return FlowResponse(
+            success=True,
+            response=response_text,
+            metadata=metadata,
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error querying flow {flow_name}: {e}")
+        raise HTTPException(status_code=500, detail=f"Flow query failed: {str(e)}")
+
+@router.post("/api/v1/flows/{flow_name}/stream")
+async def stream_flow(flow_name: str, request: FlowRequest, state: GatewayState = Depends(gateway_state)):
+    """Stream a flow's answer token by token as Server-Sent Events"""
+    flowise_manager = state.flowise_manager
+    if not flowise_manager or not state.backend_registry:
+        raise HTTPException(status_code=503, detail="Streaming backend not available")
+
+    session_id = request.session_id or generate_session_id(flow_name)
+    await state.get_session_info(session_id)
+    flow_key = flow_name if flow_name in flowise_manager.flows else \
+        (request.intent or flowise_manager.classify_intent(request.question))
+
+    async def sse_events():
+        started = time.perf_counter()
+        first_token = True
+        try:
+            async with state.endpoint_slot("flows"):
+                async for chunk in state.backend_registry.stream_flow(
+                    f"flowise_{flow_key}", request.question, request.config_override, session_id,
+                    backend_type=BackendType.FLOWISE
+                ):
+                    if first_token and chunk.get("type") == "token":
+                        first_token = False
+                        logger.info(f"⏱️ Gateway time to first token for {flow_name}: "
+                                    f"{(time.perf_counter() - started) * 1000:.0f} ms")
+                    yield f"event: {chunk.get('type', 'message')}\ndata: {json.dumps(chunk, default=str)}\n\n"
+        except HTTPException as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'data': e.detail})}\n\n"
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/api/v1/route", response_model=RouteResponse)
+async def route_query(request: RouteRequest, state: GatewayState = Depends(gateway_state)):
+    """Automatically route query to optimal flow"""
+    flowise_manager = state.flowise_manager
+    if not flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+
+    # Generate session ID if not provided (stateless requests have none)
+    session_id = request_session_id(request.session_id, request.stateless, "auto")
+
+    # Update session tracking
+    if session_id:
+        await state.get_session_info(session_id)
+
+    try:
+        # Classify intent and get confidence scores (memoised, so the manager's lookup is free)
+        classification = flowise_manager.classify_question(request.question)
+        detected_intent = flowise_manager.select_healthy_flow(classification.intent, classification)
+
+        # Ranked alternatives first, then the remaining flows
+        alternatives = [name for name in [classification.intent] + classification.alternatives(list(flowise_manager.flows.keys()))
+                        if name != detected_intent]
+
+        # Execute query with detected intent
+        async with state.endpoint_slot("route"):
+            result = await flowise_manager.adaptive_query_async(
+                question=request.question,
+                intent=detected_intent,
+                session_id=session_id,
+                coalesce=session_id is None
+            )
+
+        # Extract response
+        response_text = result.get("text", result.get("answer", str(result)))
+
+        return RouteResponse(
+            success=True,
+            selected_flow=detected_intent,
+            confidence=classification.confidence,
+            response=response_text,
+            alternatives=alternatives,
+            session_id=session_id
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error routing query: {e}")
+        raise HTTPException(status_code=500, detail=f"Query routing failed: {str(e)}")
+
+@router.post("/api/v1/sessions", response_model=SessionResponse)
+async def create_session(request: SessionRequest, state: GatewayState = Depends(gateway_state)):
+    """Create a new session"""
+    if state.active_sessions is None:
+        raise HTTPException(status_code=503, detail="Session store not available")
+    session_id = generate_session_id(request.flow_type)
+
+    # Store session info
+    record = await run_blocking(state.active_sessions.set, session_id, {
+        "flow_type": request.flow_type,
+        "workspace": request.workspace,
+        "request_count": 0
+    }, ttl=request.ttl)
+    session_info = record.to_dict()
+
+    return SessionResponse(
+        session_id=session_id,
+        flow_type=request.flow_type,
+        created_at=session_info["created_at"],
+        expires_at=session_info["expires_at"]
+    )
+
+@router.get("/api/v1/sessions/{session_id}")
+async def get_session(session_id: str, state: GatewayState = Depends(gateway_state)):
+    """Get session information"""
+    sessions = state.active_sessions
+    record = await run_blocking(sessions.get, session_id) if sessions is not None else None
+    if record is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return record.to_dict()
+
+@router.delete("/api/v1/sessions/{session_id}")
+async def delete_session(session_id: str, state: GatewayState = Depends(gateway_state)):
+    """Delete a session"""
+    sessions = state.active_sessions
+    if sessions is None or not await run_blocking(sessions.delete, session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return {"message": "Session deleted successfully"}
+
+@router.get("/api/v1/sessions")
+async def list_sessions(offset: int = 0, limit: int = 100, state: GatewayState = Depends(gateway_state)):
+    """List active sessions, most recently used first (paginated)"""
+    if state.active_sessions is None:
+        return {"sessions": {}, "total_count": 0, "offset": offset, "limit": limit}
+    limit = max(1, min(limit, 1000))
+    records, total = await run_blocking(state.active_sessions.page, offset, limit)
+    return {
+        "sessions": {record.session_id: record.to_dict() for record in records},
+        "total_count": total,
+        "offset": offset,
+        "limit": limit
+    }
+
+# Convenience endpoints for common flows
+@router.post("/api/v1/creative")
+async def creative_orientation(request: FlowRequest, state: GatewayState = Depends(gateway_state)):
+    """Quick access to creative orientation flow"""
+    return await query_flow("creative-orientation", request, state)
+
+@router.post("/api/v1/faith")
+async def faith_story(request: FlowRequest, state: GatewayState = Depends(gateway_state)):
+    """Quick access to faith2story flow"""
+    return await query_flow("faith2story", request, state)
+
+@router.post("/api/v1/auto")
+async def auto_route(request: RouteRequest, state: GatewayState = Depends(gateway_state)):
+    """Auto-route with simplified interface"""
+    return await route_query(request, state)
+
+@router.post("/api/v1/domain", response_model=FlowResponse)
+async def domain_query(request: DomainRequest, state: GatewayState = Depends(gateway_state)):
+    """Query with domain specialization and context injection"""
+    if not DomainSpecificFlowiseManager:
+        raise HTTPException(status_code=503, detail="Domain specialization not available")
+
+    try:
+        # Create domain context
+        domain_context = DomainContext(
+            name=request.domain_name,
+            description=request.domain_description,
+            stack_info=request.stack_info,
+            cultural_info=request.cultural_info,
+            specialized_keywords=request.specialized_keywords
+        )
+
+        # Reuse the domain-specific manager for this exact context; build one off the event loop on a miss
+        base_url = state.flowise_manager.base_url if state.flowise_manager else os.getenv("FLOWISE_BASE_URL")
+        domain_kwargs = {"base_url": base_url} if base_url else {}
+        if state.domain_manager_cache is None:
+            state.configure_domain_cache()
+        domain_manager_cache = state.domain_manager_cache
+        cache_key = domain_context_key(domain_context, base_url) if domain_manager_cache else None
+        domain_manager = domain_manager_cache.get(cache_key) if cache_key else None
+        if domain_manager is None:
+            domain_manager = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: DomainSpecificFlowiseManager(domain_context=domain_context, **domain_kwargs)
+            )
+            if cache_key:
+                domain_manager = domain_manager_cache.put(cache_key, domain_manager)
+
+        # Generate session ID if not provided
+        session_id = request.session_id or generate_session_id(f"domain-{request.domain_name.lower().replace(' ', '-')}")
+
+        # Update session tracking
+        session_info = await state.get_session_info(session_id)
+
+        # Execute contextualized query
+        async with state.endpoint_slot("domain"):
+            result = await domain_manager.contextualized_query_async(
+                question=request.question,
+                context_type=request.context_type,
+                session_id=session_id,
+                config_override=request.config_override
+            )
+
+        # Extract response text
+        response_text = result.get("text", result.get("answer", str(result)))
+
+        # Build metadata with domain info
+        metadata = result.get("_metadata", {})
+        metadata.update({
+            "domain_context": {
+                "name": request.domain_name,
+                "context_type": request.context_type,
+                "has_stack_info": request.stack_info is not None,
+                "has_cultural_info": request.cultural_info is not None,
+                "specialized_keywords_count": len(request.specialized_keywords) if request.specialized_keywords else 0
+            },
+            "gateway_session_info": session_info,
+            "request_timestamp": datetime.now().isoformat()
+        })
+
+        return FlowResponse(
+            success=True,
+            response=response_text,
+            metadata=metadata,
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in domain query: {e}")
+        raise HTTPException(status_code=500, detail=f"Domain query failed: {str(e)}")
+
+# Batch processing endpoints
+def _check_batch(state: GatewayState, requests: List[FlowRequest]):
+    if not state.flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+    if state.batch_engine is None:
+        state.configure_batch_engine()
+    if state.batch_engine is None:
+        raise HTTPException(status_code=503, detail="Batch engine not available")
+    try:
+        state.batch_engine.check_size(requests)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+@router.post("/api/v1/batch")
+async def batch_query(requests: List[FlowRequest], state: GatewayState = Depends(gateway_state)):
+    """Process multiple requests concurrently; results come back in request order"""
+    _check_batch(state, requests)
+
+    started = time.perf_counter()
+    results = await state.batch_engine.run(requests)
+
+    return {
+        "results": [r.to_dict() for r in results],
+        **summarize_results(results),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+@router.post("/api/v1/batch/stream")
+async def batch_query_stream(requests: List[FlowRequest], state: GatewayState = Depends(gateway_state)):
+    """Process multiple requests concurrently, streaming each result as NDJSON when it completes"""
+    _check_batch(state, requests)
+
+    async def ndjson_lines():
+        results = []
+        async for result in state.batch_engine.stream(requests):
+            results.append(result)
+            yield json.dumps(result.to_dict()) + "\n"
+        yield json.dumps({"done": True, **summarize_results(results)}) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@router.get("/api/v1/gateway/concurrency")
+async def gateway_concurrency(state: GatewayState = Depends(gateway_state)):
+    """Per-endpoint concurrency limits and current load"""
+    return {"endpoints": state.endpoint_stats, "queue_timeout": state.queue_timeout}
+
+@router.get("/api/v1/gateway/cache")
+async def gateway_cache(state: GatewayState = Depends(gateway_state)):
+    """Prediction cache hit/miss metrics"""
+    if not state.flowise_manager or state.flowise_manager.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **state.flowise_manager.cache.get_stats()}
+
+@router.get("/api/v1/gateway/domain-cache")
+async def gateway_domain_cache(state: GatewayState = Depends(gateway_state)):
+    """Domain manager LRU: hit rate, evictions and approximate memory held"""
+    if state.domain_manager_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **state.domain_manager_cache.get_stats()}
+
+@router.get("/api/v1/gateway/coalescing")
+async def gateway_coalescing(state: GatewayState = Depends(gateway_state)):
+    """Single-flight counters: upstream executions and calls saved by coalescing"""
+    if not state.flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+    return state.flowise_manager.single_flight.get_stats()
+
+@router.get("/api/v1/gateway/health")
+async def gateway_health(refresh: bool = False, state: GatewayState = Depends(gateway_state)):
+    """Cached server and per-flow health from metadata probes (refresh=true probes now)"""
+    flowise_manager = state.flowise_manager
+    if not flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+    if refresh:
+        await flowise_manager.health.refresh([flow.id for flow in flowise_manager.flows.values()])
+    return flowise_manager.health.get_stats()
+
+@router.get("/api/v1/gateway/resilience")
+async def gateway_resilience(state: GatewayState = Depends(gateway_state)):
+    """Per-flow retries, hedges, latency quantiles and circuit breaker state of the shared Flowise client"""
+    if not state.flowise_manager:
+        raise HTTPException(status_code=503, detail="Flowise manager not available")
+    return state.flowise_manager.client.get_resilience_stats()
+
+@router.get("/api/v1/gateway/workers")
+async def gateway_workers(state: GatewayState = Depends(gateway_state)):
+    """Metrics of every live worker process and their totals (this worker only without a shared board)"""
+    if state.worker_metrics is None:
+        workers = {state.worker_id: {"pid": os.getpid(), **state.worker_snapshot()}}
+    else:
+        await run_blocking(state.worker_metrics.publish, state.worker_id, state.worker_snapshot())
+        workers = await run_blocking(state.worker_metrics.collect)
+    sessions = state.active_sessions
+    return {
+        "worker": state.worker_id,
+        "count": len(workers),
+        "workers": workers,
+        "totals": aggregate(workers),
+        "sessions": await run_blocking(sessions.get_stats) if sessions is not None else None
+    }
+
+def create_app(preload: bool = False) -> FastAPI:
+    """App factory for ASGI servers (uvicorn --factory agentic_flywheel.gateway:create_app);
+    every call returns a new app with its own GatewayState, preloaded before fork with preload=True"""
+    app = FastAPI(
+        title="Flowise Automation Gateway",
+        description="REST API gateway for creative-oriented flowise automation",
+        version="1.0.0"
+    )
+
+    # CORS middleware for web access
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+
+    state = GatewayState()
+    if preload:
+        state.preload()
+    app.state.gateway = state
+    app.on_event("startup")(state.startup)
+    app.on_event("shutdown")(state.shutdown)
+    return app
+
+# Module-level app for `uvicorn agentic_flywheel.gateway:app`
+app = create_app()
+
+def share_state(state_dir: Optional[str] = None) -> str:
+    """Point sessions, the prediction cache's disk tier and worker metrics at SQLite files every worker opens
+    (settings already in the environment win)"""
+    state_dir = state_dir or tempfile.mkdtemp(prefix="flowise-gateway-")
+    os.makedirs(state_dir, exist_ok=True)
+    os.environ.setdefault("FLOWISE_SESSION_STORE", os.path.join(state_dir, "sessions.db"))
+    os.environ.setdefault("FLOWISE_PREDICTION_CACHE_DB", os.path.join(state_dir, "predictions.db"))
+    os.environ.setdefault("FLOWISE_GATEWAY_METRICS_DB", os.path.join(state_dir, "metrics.db"))
+    return state_dir
+
+def serve(host: str = "0.0.0.0", port: int = 8080, workers: int = 1, log_level: str = "info"):
+    """Serve the gateway; with several workers, preload state once and fork workers sharing one listening socket"""
+    forking = workers > 1 and hasattr(os, "fork")
+    config = uvicorn.Config(create_app(preload=forking), host=host, port=port, log_level=log_level)
+    if not forking:
+        uvicorn.Server(config).run()
+        return
+    
+    sock = config.bind_socket()
+    # Keep the preloaded objects out of the collector's reach, so workers do not touch (and copy) their pages
+    gc.freeze()
+    
+    children: Dict[int, int] = {}
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.environ["FLOWISE_GATEWAY_WORKER"] = f"worker-{index}"
+            status = 0
+            try:
+                uvicorn.Server(config).run(sockets=[sock])
+            except BaseException as e:
+                logger.error(f"❌ Worker {index} crashed: {e}")
+                status = 1
+            finally:
+                os._exit(status)
+        children[pid] = index
+    sock.close()
+    logger.info(f"👥 Started {workers} workers: {', '.join(str(pid) for pid in children)}")
+    
+    stopping = []
+    
+    def forward(signum, frame):
+        stopping.append(signum)
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        # Workers re-raise the forwarded signal once they have shut down gracefully
+        if index is not None and status and not stopping:
+            reason = f"status {os.WEXITSTATUS(status)}" if os.WIFEXITED(status) else f"signal {os.WTERMSIG(status)}"
+            logger.warning(f"⚠️ Worker {index} (pid {pid}) exited with {reason}")
 
-@click.command()
 def main():
-    """Agentic Flywheel Gateway - Placeholder"""
-    click.echo("Agentic Flywheel Gateway is a placeholder. Implementation pending.")
+    """Main entry point for the gateway"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Flowise HTTP Gateway")
+    parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind to")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--reload", action="store_true", help="Enable auto-reload for development")
+    parser.add_argument("--log-level", default="info", help="Log level")
+    parser.add_argument("--flowise-url", help="Flowise server URL (default: FLOWISE_BASE_URL or the built-in server)")
+    parser.add_argument("--concurrency", type=int,
+                       help="Upstream predictions in flight per endpoint for /flows and /route")
+    parser.add_argument("--session-db",
+                       help="SQLite file for sessions shared by all workers (default: in --state-dir with several workers)")
+    parser.add_argument("--state-dir",
+                       help="Directory for the SQLite files workers share (default: a temporary directory removed on exit)")
+    
+    args = parser.parse_args()
+    
+    # Settings travel through the environment so every worker process picks them up
+    if args.flowise_url:
+        os.environ["FLOWISE_BASE_URL"] = args.flowise_url
+    if args.concurrency:
+        os.environ["FLOWISE_GATEWAY_FLOWS_CONCURRENCY"] = str(args.concurrency)
+        os.environ["FLOWISE_GATEWAY_ROUTE_CONCURRENCY"] = str(args.concurrency)
+    if args.session_db:
+        os.environ["FLOWISE_SESSION_STORE"] = args.session_db
+    state_dir = None
+    if args.workers > 1 and not args.reload:
+        state_dir = share_state(args.state_dir)
+        logger.info(f"🗃️ Worker state shared through {state_dir}")
+    
+    logger.info(f"🌐 Starting Flowise Gateway on {args.host}:{args.port}")
+    logger.info(f"📋 API documentation: http://{args.host}:{args.port}/docs")
+    
+    try:
+        if args.reload:
+            # The reloader re-imports the app in a subprocess, so it needs the factory's import path
+            uvicorn.run(
+                "agentic_flywheel.gateway:create_app",
+                factory=True,
+                app_dir=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                host=args.host,
+                port=args.port,
+                reload=True,
+                log_level=args.log_level
+            )
+        else:
+            serve(args.host, args.port, args.workers, args.log_level)
+    finally:
+        # A temporary state directory lives only as long as the workers sharing it
+        if state_dir and not args.state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
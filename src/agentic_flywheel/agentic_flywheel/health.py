@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Flow Health Monitor
+Probes Flowise's lightweight endpoints concurrently, caches results with a TTL and refreshes them in the background
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+
+try:
+    from .flowise_client import FlowiseClient, FlowiseClientError, SyncFlowiseClient
+    from .single_flight import SingleFlight
+except ImportError:
+    from flowise_client import FlowiseClient, FlowiseClientError, SyncFlowiseClient
+    from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_TTL = 60.0        # seconds a probe result counts as fresh
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_PROBE_CONCURRENCY = 8
+STALE_AFTER_TTLS = 5             # older results are ignored by the router (treated as unknown)
+
+SERVER = "server"
+SERVER_PROBE_PATHS = ("/api/v1/ping",)
+# The chatflow lookup may need an API key; the streaming capability check is public
+FLOW_PROBE_PATHS = ("/api/v1/chatflows/{id}", "/api/v1/chatflows-streaming/{id}")
+
+
+@dataclass(frozen=True)
+class FlowHealth:
+    """Outcome of probing the server or one flow"""
+    target: str                      # "server" or a flow id
+    healthy: bool
+    status: Optional[int]            # HTTP status of the deciding probe, None when unreachable
+    latency_ms: float
+    checked_at: float                # time.time() of the probe
+    error: Optional[str] = None
+
+    def age(self) -> float:
+        return time.time() - self.checked_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "age_seconds": round(self.age(), 1)}
+
+
+class HealthMonitor:
+    """Per-flow health from metadata endpoints, never from predictions
+
+    Probes are concurrent, deduplicated while in flight and cached for ttl seconds.
+    is_healthy() never does I/O: it answers from the cache and from the client's
+    circuit breakers, and is optimistic about flows it knows nothing recent about.
+    """
+
+    def __init__(self, client: FlowiseClient, ttl: float = DEFAULT_HEALTH_TTL,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT, concurrency: int = DEFAULT_PROBE_CONCURRENCY):
+        self.client = client
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+        self.concurrency = concurrency
+        self._results: Dict[str, FlowHealth] = {}
+        self._in_flight = SingleFlight()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.metrics = {"probes": 0, "cache_hits": 0}
+
+    async def _probe(self, target: str, paths: Tuple[str, ...]) -> FlowHealth:
+        """GET each path in turn until one gives a verdict (auth refusals fall through to the next)"""
+        self.metrics["probes"] += 1
+        started = time.perf_counter()
+        status, error = None, None
+        for path in paths:
+            try:
+                response = await self.client.request("GET", path.format(id=target), timeout=self.probe_timeout)
+            except FlowiseClientError as e:
+                status, error = None, str(e)
+                break
+            status, error = response.status_code, None
+            if status not in (401, 403):
+                break
+
+        if target == SERVER:
+            healthy = status is not None and status < 500  # any answer means the server is up
+        else:
+            healthy = status is not None and status < 500 and status != 404
+        if status is not None and not healthy:
+            error = f"HTTP {status}"
+        health = FlowHealth(target, healthy, status, round((time.perf_counter() - started) * 1000, 1),
+                            time.time(), error)
+        previous = self._results.get(target)
+        if previous is not None and previous.healthy != healthy:
+            logger.info(f"{'✅' if healthy else '❌'} Health of {target} changed: {'up' if healthy else error}")
+        self._results[target] = health
+        return health
+
+    async def _check(self, target: str, paths: Tuple[str, ...], force: bool) -> FlowHealth:
+        cached = self._results.get(target)
+        if not force and cached is not None and cached.age() < self.ttl:
+            self.metrics["cache_hits"] += 1
+            return cached
+        health, _ = await self._in_flight.do(target, lambda: self._probe(target, paths))
+        return health
+
+    async def check_server(self, force: bool = False) -> FlowHealth:
+        """Server reachability via /api/v1/ping (cached for ttl)"""
+        return await self._check(SERVER, SERVER_PROBE_PATHS, force)
+
+    async def check_flows(self, flow_ids: Iterable[str], force: bool = False) -> Dict[str, FlowHealth]:
+        """Health of each flow, probing stale ones concurrently (at most concurrency at a time)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(flow_id: str) -> FlowHealth:
+            async with semaphore:
+                return await self._check(flow_id, FLOW_PROBE_PATHS, force)
+
+        flow_ids = list(dict.fromkeys(flow_ids))
+        results = await asyncio.gather(*(check(flow_id) for flow_id in flow_ids))
+        return dict(zip(flow_ids, results))
+
+    def get(self, target: str) -> Optional[FlowHealth]:
+        """Last probe result for the server or a flow id, however old"""
+        return self._results.get(target)
+
+    def is_healthy(self, flow_id: str) -> bool:
+        """Routing verdict without I/O: False only for an open circuit or a recent failed probe"""
+        resilience = self.client.resilience
+        if resilience is not None and resilience.circuit_open(flow_id):
+            return False
+        health = self._results.get(flow_id)
+        if health is None or health.age() > self.ttl * STALE_AFTER_TTLS:
+            return True
+        return health.healthy
+
+    def start_background_refresh(self, flow_ids: Callable[[], Iterable[str]],
+                                 interval: Optional[float] = None) -> None:
+        """Re-probe the server and flow_ids() on a daemon thread, so cached results stay fresh"""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(flow_ids, interval or self.ttl / 2),
+            name="flow-health-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+
+    async def refresh(self, flow_ids: Iterable[str]) -> Dict[str, FlowHealth]:
+        """Probe the server and the given flows now, ignoring cached results"""
+        server = await self.check_server(force=True)
+        flows = await self.check_flows(flow_ids, force=True) if server.healthy else {}
+        return {SERVER: server, **flows}
+
+    def _refresh_loop(self, flow_ids: Callable[[], Iterable[str]], interval: float) -> None:
+        runner = SyncFlowiseClient(self.client)
+        while True:
+            try:
+                runner.run(self.refresh(flow_ids()))
+            except Exception as e:
+                logger.error(f"❌ Health refresh failed: {e}")
+            if self._stop.wait(interval):
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Probe counters and the latest result per target"""
+        results = dict(self._results)
+        return {
+            **self.metrics,
+            "ttl": self.ttl,
+            "background_refresh": bool(self._refresher and self._refresher.is_alive() and not self._stop.is_set()),
+            "healthy": sum(1 for h in results.values() if h.healthy),
+            "unhealthy": sum(1 for h in results.values() if not h.healthy),
+            "targets": {target: health.to_dict() for target, health in results.items()},
+        }
+
+
+_monitors: Dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(client: FlowiseClient, **options) -> HealthMonitor:
+    """The shared monitor for a client's Flowise server (options only apply when it is first created;
+    ttl defaults to FLOWISE_HEALTH_TTL)"""
+    with _monitors_lock:
+        monitor = _monitors.get(client.base_url)
+        if monitor is None:
+            options.setdefault("ttl", float(os.getenv("FLOWISE_HEALTH_TTL", DEFAULT_HEALTH_TTL)))
+            monitor = HealthMonitor(client, **options)
+            _monitors[client.base_url] = monitor
+        return monitor
@@ -5,6 +5,7 @@ Rebuilt MCP server using admin layer intelligence and working flowise components
 """
 
 import asyncio
+import functools
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -12,14 +13,21 @@ import sys
 import os
 from pathlib import Path
 
+# Sessions come from this package's stdlib-only store, so they stay bounded without the admin layer
+from agentic_flywheel.session_store import MemorySessionStore, session_store_from_env
+
 # Import working flowise manager
 
 try:
     from agentic_flywheel.flowise_manager import FlowiseManager
+    from agentic_flywheel.prediction_cache import PredictionCache
+    from agentic_flywheel.intent_classifier import IntentClassifier
     from flowise_admin.config_sync import ConfigurationSync
     ADMIN_AVAILABLE = True
 except ImportError as e:
     FlowiseManager = None
+    PredictionCache = None
+    IntentClassifier = None
     ConfigurationSync = None
     ADMIN_AVAILABLE = False
     logging.warning(f"Admin integration not available: {e}")
@@ -48,14 +56,22 @@ class IntelligentFlowiseMCPServer:
         self.flowise_manager = None
         self.curated_flows = {}
         self.admin_sync = None
-        self.active_sessions = {}
+        # Bounded and expiring; in memory when the configured SQLite store cannot be opened
+        try:
+            self.active_sessions = session_store_from_env()
+        except Exception as e:
+            logger.error(f"❌ Failed to open session store, keeping sessions in memory: {e}")
+            self.active_sessions = MemorySessionStore()
+        # Keyword index over self.curated_flows, built on first classification
+        self._intent_classifier = None
         
         # Try to initialize working components
         if FlowiseManager:
             try:
                 # Determine default flow registry path
                 default_registry_path = Path(__file__).parent / "config" / "flow-registry.yaml"
-                self.flowise_manager = FlowiseManager(flow_registry_path=str(default_registry_path))
+                self.flowise_manager = FlowiseManager(flow_registry_path=str(default_registry_path),
+                                                      cache=PredictionCache.from_env())
                 logger.info("✅ Connected to working FlowiseManager")
             except Exception as e:
                 logger.error(f"❌ FlowiseManager connection failed: {e}")
@@ -122,9 +138,10 @@ class IntelligentFlowiseMCPServer:
                 }
             }
             
-            # Test flows to ensure they work
+            # Probe the flows together to ensure they exist
+            available = self.flowise_manager.check_flow_health([d['id'] for d in working_flows.values()])
             for flow_key, flow_data in working_flows.items():
-                if self._test_flow_availability(flow_data['id']):
+                if available.get(flow_data['id']):
                     self.curated_flows[flow_key] = flow_data
             
             logger.info(f"✅ Loaded {len(self.curated_flows)} fallback flows")
@@ -138,8 +155,8 @@ class IntelligentFlowiseMCPServer:
             return False
         
         try:
-            # Simple connectivity test
-            return self.flowise_manager.test_connection()
+            # Cached metadata probe of this flow
+            return self.flowise_manager.check_flow_health([flow_id]).get(flow_id, False)
         except:
             return False
     
@@ -163,7 +180,7 @@ class IntelligentFlowiseMCPServer:
             flow_data = self.curated_flows[selected_flow]
             
             # Use working flowise manager for actual query
-            result = self.flowise_manager.adaptive_query(
+            result = await self.flowise_manager.adaptive_query_async(
                 question=question,
                 intent=selected_flow,
                 session_id=session_id
@@ -179,13 +196,14 @@ class IntelligentFlowiseMCPServer:
                     'success_metrics': flow_data.get('success_metrics')
                 }
             
-            # Track session
+            # Track session (off the event loop, as a SQLite store may wait on another process's write lock)
             if session_id:
-                self.active_sessions[session_id] = {
-                    'flow_used': selected_flow,
-                    'last_query': question[:100],
-                    'timestamp': asyncio.get_event_loop().time()
-                }
+                await asyncio.get_event_loop().run_in_executor(None, functools.partial(
+                    self.active_sessions.set, session_id, {
+                        'flow_used': selected_flow,
+                        'last_query': question[:100]
+                    }
+                ))
             
             return result
             
@@ -198,21 +216,17 @@ class IntelligentFlowiseMCPServer:
     
     def _classify_intent(self, question: str) -> str:
         """Classify intent using available flows"""
-        question_lower = question.lower()
+        if not self.curated_flows:
+            return "creative-orientation"
         
-        # Score flows based on keyword matches
-        scores = {}
-        for flow_key, flow_data in self.curated_flows.items():
-            score = sum(1 for keyword in flow_data['intent_keywords'] 
-                       if keyword in question_lower)
-            scores[flow_key] = score
+        if self._intent_classifier is None:
+            self._intent_classifier = IntentClassifier(
+                {key: flow['intent_keywords'] for key, flow in self.curated_flows.items()},
+                default=next(iter(self.curated_flows))
+            )
         
         # Return best match or first available flow
-        if scores:
-            best_flow = max(scores.items(), key=lambda x: x[1])
-            return best_flow[0] if best_flow[1] > 0 else list(self.curated_flows.keys())[0]
-        
-        return list(self.curated_flows.keys())[0] if self.curated_flows else "creative-orientation"
+        return self._intent_classifier.classify(question).intent
     
     def list_available_flows(self) -> Dict[str, Any]:
         """List flows available to users"""
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Intent Classifier
+Precompiled keyword index that scores every flow against a question in one pass and ranks the matches
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+CLASSIFICATION_CACHE_SIZE = 1024  # recent questions whose classification is memoised
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """A flow and how many of its intent keywords occur in the question"""
+    flow: str
+    score: int
+
+
+@dataclass(frozen=True)
+class IntentClassification:
+    """Outcome of classifying one question"""
+    intent: Optional[str]                # best flow, or the default when nothing matched
+    score: int
+    confidence: float                    # 0.0 when nothing matched
+    ranked: Tuple[IntentMatch, ...] = field(default_factory=tuple)  # matching flows, best first
+
+    @property
+    def matched(self) -> bool:
+        return self.score > 0
+
+    def alternatives(self, flows: Sequence[str]) -> List[str]:
+        """Other flows: ranked matches first, then the rest in registry order"""
+        ranked = [m.flow for m in self.ranked if m.flow != self.intent]
+        seen = set(ranked)
+        return ranked + [f for f in flows if f != self.intent and f not in seen]
+
+
+def _trie_regex(keywords) -> str:
+    """Regex matching the longest of the keywords, shaped as a prefix trie so each position
+    only explores branches that agree with the text so far"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: prefer the longer keyword, fall back to the one ending here
+            return body + "?" if len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class IntentClassifier:
+    """Scores flows by the number of their keywords found (as case-insensitive substrings) in a question
+
+    Build it once per registry version: all keywords are compiled into one prefix-trie regex
+    scanned in a single pass, instead of a substring search per keyword per flow.
+    """
+
+    def __init__(self, keywords_by_flow: Mapping[str, Sequence[str]], default: Optional[str] = None):
+        self.flows: Tuple[str, ...] = tuple(keywords_by_flow)
+        self.default = default
+        self._flow_index = flow_index = {flow: i for i, flow in enumerate(self.flows)}
+
+        # keyword -> Counter({flow index: times the flow lists it})
+        weights: Dict[str, Counter] = {}
+        for flow, keywords in keywords_by_flow.items():
+            for keyword in keywords:
+                if keyword:
+                    weights.setdefault(keyword.lower(), Counter())[flow_index[flow]] += 1
+
+        # The lookahead reports the longest keyword at each position without consuming it, so
+        # overlapping keywords are seen; shorter keywords starting at the same position are its
+        # prefixes, so each keyword also stands for its keyword prefixes.
+        self._expansion: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(keyword[:n] for n in range(1, len(keyword) + 1) if keyword[:n] in weights)
+            for keyword in weights
+        }
+        self._weights = weights
+        self._pattern = re.compile(f"(?=({_trie_regex(weights)}))") if weights else None
+        self.keyword_count = len(weights)
+        self.classify = lru_cache(maxsize=CLASSIFICATION_CACHE_SIZE)(self._classify)
+
+    def scores(self, question: str) -> Dict[str, int]:
+        """Score of every flow with at least one keyword in the question"""
+        if self._pattern is None or not question:
+            return {}
+        found = set()
+        for match in self._pattern.finditer(question.lower()):
+            found.update(self._expansion[match.group(1)])
+
+        totals: Counter = Counter()
+        for keyword in found:
+            totals.update(self._weights[keyword])
+        return {self.flows[i]: score for i, score in totals.items()}
+
+    def rank(self, question: str) -> List[IntentMatch]:
+        """Matching flows by descending score; ties keep registry order"""
+        scores = self.scores(question)
+        order = sorted(scores, key=lambda flow: (-scores[flow], self._flow_index[flow]))
+        return [IntentMatch(flow, scores[flow]) for flow in order]
+
+    def _classify(self, question: str) -> IntentClassification:
+        ranked = tuple(self.rank(question))
+        if not ranked:
+            return IntentClassification(intent=self.default, score=0, confidence=0.0)
+        best = ranked[0].score
+        runner_up = ranked[1].score if len(ranked) > 1 else 0
+        # More evidence raises confidence, a close runner-up lowers it
+        confidence = round(best / (best + runner_up + 1), 3)
+        return IntentClassification(intent=ranked[0].flow, score=best, confidence=confidence, ranked=ranked)
+
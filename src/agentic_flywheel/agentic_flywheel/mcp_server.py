@@ -6,18 +6,24 @@ Exposes flowise capabilities as MCP services with dynamic flow registry
 
 import os
 import asyncio
+import functools
 import json
 import logging
-import yaml
-from pathlib import Path
 from typing import Any, Dict, List, Optional
-import httpx
 import click
 import webbrowser # Added for flowise_browse tool
 from mcp import server, types
 from mcp.server.models import InitializationOptions
 from mcp.server.lowlevel.server import NotificationOptions
 import mcp.server.stdio
+from agentic_flywheel.flowise_client import FlowiseClientError, get_flowise_client
+from agentic_flywheel.prediction_cache import PredictionCache, caller_session, make_cache_key
+from agentic_flywheel.single_flight import get_single_flight
+from agentic_flywheel.intent_classifier import IntentClassifier
+from agentic_flywheel.session_store import DEFAULT_PAGE_SIZE, session_store_from_env
+from agentic_flywheel.flow_registry import (
+    DEFAULT_REGISTRY_PATHS, RegistrySnapshot, find_registry_path, get_flow_registry, thaw, write_registry
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +34,18 @@ class FlowiseMCPServer:
     
     def __init__(self, flowise_base_url: str = "https://beagle-emerging-gnu.ngrok-free.app", config_path: Optional[str] = None):
         self.flowise_base_url = flowise_base_url
-        self.active_sessions = {}
+        self.client = get_flowise_client(flowise_base_url)
+        # Enabled with FLOWISE_PREDICTION_CACHE=1 (see prediction_cache.py)
+        self.cache = PredictionCache.from_env()
+        # Concurrent identical stateless queries share one upstream call
+        self.single_flight = get_single_flight()
+        # Bounded and expiring (FLOWISE_SESSION_TTL / _MAX; FLOWISE_SESSION_STORE=<sqlite path> to share)
+        self.active_sessions = session_store_from_env()
+        # Keyword index over self.flows, built on first classification
+        self._intent_classifier: Optional[IntentClassifier] = None
+        # Hot-reloading registry service (None when flows come from a config file or the defaults)
+        self.registry = None
+        self._registry_version = 0
 
         if config_path:
             try:
@@ -57,55 +74,42 @@ class FlowiseMCPServer:
             self._load_from_yaml_registry()
 
     def _load_from_yaml_registry(self):
-        """Load flows from YAML registry, filtering by active flag"""
-        registry_paths = [
-            Path(__file__).parent / "config" / "flow-registry.yaml",  # Package location
-            Path(__file__).parent.parent / "flow-registry.yaml"       # Development location
-        ]
+        """Load active flows from the shared YAML registry service and follow its reloads"""
+        try:
+            registry = get_flow_registry()
+        except Exception as e:
+            logger.error(f"❌ Failed to load flows from YAML registry: {e}")
+            registry = None
         
-        for registry_path in registry_paths:
-            if registry_path.exists():
-                try:
-                    with open(registry_path, 'r') as f:
-                        registry = yaml.safe_load(f)
-                    
-                    self.flows = {}
-                    # Load operational flows that are active
-                    for flow_key, flow_config in registry.get('operational_flows', {}).items():
-                        if flow_config.get('active', 0) == 1:
-                            self.flows[flow_key] = {
-                                "id": flow_config['id'],
-                                "name": flow_config['name'],
-                                "description": flow_config['description'],
-                                "default_config": flow_config.get('config', {
-                                    "temperature": 0.7,
-                                    "maxOutputTokens": 2000
-                                }),
-                                "intent_keywords": flow_config['intent_keywords']
-                            }
-                    
-                    # Load routing flows that are active
-                    for flow_key, flow_config in registry.get('routing_flows', {}).items():
-                        if flow_config.get('active', 0) == 1:
-                            self.flows[flow_key] = {
-                                "id": flow_config['id'],
-                                "name": flow_config['name'],
-                                "description": flow_config['description'],
-                                "default_config": flow_config.get('config', {
-                                    "temperature": 0.7,
-                                    "maxOutputTokens": 2000
-                                }),
-                                "intent_keywords": flow_config['intent_keywords']
-                            }
-                    
-                    logger.info(f"✅ Loaded {len(self.flows)} active flows from YAML registry: {registry_path}")
-                    return
-                except Exception as e:
-                    logger.error(f"❌ Failed to load flows from {registry_path}: {e}")
-                    continue
+        if registry is None:
+            logger.warning("❌ Flow registry not found. Using default flows.")
+            self._load_default_flows()
+            return
         
-        logger.warning("❌ Flow registry not found. Using default flows.")
-        self._load_default_flows()
+        self.registry = registry
+        self._apply_registry(registry.snapshot)
+        registry.subscribe(self._apply_registry)
+        logger.info(f"✅ Loaded {len(self.flows)} active flows from YAML registry: {registry.path}")
+    
+    def _apply_registry(self, snapshot: RegistrySnapshot) -> None:
+        """Rebuild the flow list (and, lazily, the intent index) from a registry snapshot"""
+        if snapshot.version <= self._registry_version:
+            return
+        self.flows = {
+            flow_key: {
+                "id": flow_config['id'],
+                "name": flow_config['name'],
+                "description": flow_config['description'],
+                "default_config": thaw(flow_config.get('config', {
+                    "temperature": 0.7,
+                    "maxOutputTokens": 2000
+                })),
+                "intent_keywords": thaw(flow_config['intent_keywords'])
+            }
+            for flow_key, flow_config in snapshot.flows(active_only=True).items()
+        }
+        self._registry_version = snapshot.version
+        self._intent_classifier = None
 
     def _load_default_flows(self):
         self.flows = {
@@ -151,8 +155,15 @@ class FlowiseMCPServer:
                                 question: str,
                                 intent: Optional[str] = None,
                                 session_id: Optional[str] = None,
-                                flow_override: Optional[str] = None) -> Dict[str, Any]:
-        """Execute intelligent flowise query with flow selection"""
+                                flow_override: Optional[str] = None,
+                                bypass_cache: bool = False,
+                                stateless: bool = False) -> Dict[str, Any]:
+        """Execute intelligent flowise query with flow selection
+
+        A stateless query without a session gets none and may share an identical in-flight prediction.
+        """
+        if self.registry:
+            self.registry.current()  # picks up registry edits
         
         # Determine flow to use
         if flow_override and flow_override in self.flows:
@@ -166,21 +177,25 @@ class FlowiseMCPServer:
         flow_config = self.flows[flow_key]
         flow_id = flow_config["id"]
         
-        # Generate session ID if not provided
-        if not session_id:
+        # Caller sessions are never coalesced or answered from the cache
+        supplied_session = caller_session(session_id)
+        coalesce = stateless and not supplied_session
+        
+        # Generate session ID if not provided (coalesced answers are shared, so they get none)
+        if not session_id and not coalesce:
             import time, uuid
             session_id = f"mcp-session-{int(time.time())}-{str(uuid.uuid4())[:8]}"
         
         # Build configuration
         config = flow_config["default_config"].copy()
-        config["sessionId"] = session_id
-        
-        # Track active session
-        self.active_sessions[session_id] = {
-            "flow_key": flow_key,
-            "flow_name": flow_config["name"],
-            "created_at": asyncio.get_event_loop().time()
-        }
+        if session_id:
+            config["sessionId"] = session_id
+            
+            # Track active session (off the event loop, as a SQLite store may wait on another process's write lock)
+            await self._run_blocking(self.active_sessions.set, session_id, {
+                "flow_key": flow_key,
+                "flow_name": flow_config["name"]
+            })
         
         # Build payload
         payload = {
@@ -191,37 +206,49 @@ class FlowiseMCPServer:
         logger.info(f"Querying flow: {flow_config['name']} ({flow_id})")
         logger.info(f"Session: {session_id}")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.flowise_base_url}/api/v1/prediction/{flow_id}",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Add metadata
-                result["_mcp_metadata"] = {
-                    "flow_used": flow_config["name"],
-                    "flow_key": flow_key,
-                    "flow_id": flow_id,
-                    "session_id": session_id,
-                    "intent_detected": flow_key,
-                    "config_used": config
-                }
-                
-                return result
-                
-            except httpx.RequestError as e:
-                logger.error(f"Request failed: {e}")
-                return {
-                    "error": f"Request failed: {str(e)}",
-                    "flow_attempted": flow_config["name"],
-                    "session_id": session_id
-                }
+        cache_key = None
+        if self.cache is not None:
+            if bypass_cache:
+                self.cache.record_bypass()
+            else:
+                cache_key = self.cache.key_for(flow_id, question, config, supplied_session)
+        
+        try:
+            result = self.cache.get(cache_key) if cache_key else None
+            cached = result is not None
+            coalesced = False
+            if not cached:
+                if coalesce:
+                    result, coalesced = await self.single_flight.do(
+                        make_cache_key(flow_id, question, config),
+                        lambda: self.client.predict(flow_id, payload, timeout=30.0, idempotent=True)
+                    )
+                else:
+                    result = await self.client.predict(flow_id, payload, timeout=30.0, idempotent=False)
+                if cache_key and not coalesced and isinstance(result, dict):
+                    self.cache.put(cache_key, result)
+            
+            # Add metadata
+            result["_mcp_metadata"] = {
+                "flow_used": flow_config["name"],
+                "flow_key": flow_key,
+                "flow_id": flow_id,
+                "session_id": session_id,
+                "intent_detected": flow_key,
+                "config_used": config,
+                "cached": cached,
+                "coalesced": coalesced
+            }
+            
+            return result
+            
+        except FlowiseClientError as e:
+            logger.error(f"Request failed: {e}")
+            return {
+                "error": f"Request failed: {str(e)}",
+                "flow_attempted": flow_config["name"],
+                "session_id": session_id
+            }
     
     async def _configure_flow(self,
                              flow_id: str,
@@ -261,22 +288,22 @@ class FlowiseMCPServer:
     
     def _classify_intent(self, question: str) -> str:
         """Classify user intent based on question content"""
-        question_lower = question.lower()
-        
-        # Score each flow based on keyword matches
-        scores = {}
-        for flow_key, flow_config in self.flows.items():
-            score = sum(1 for keyword in flow_config["intent_keywords"] 
-                       if keyword in question_lower)
-            scores[flow_key] = score
-        
-        # Return the flow with highest score, default to creative-orientation
-        best_flow = max(scores.items(), key=lambda x: x[1])
-        return best_flow[0] if best_flow[1] > 0 else "creative-orientation"
+        if self._intent_classifier is None:
+            default = "creative-orientation" if "creative-orientation" in self.flows else next(iter(self.flows), None)
+            self._intent_classifier = IntentClassifier(
+                {key: flow["intent_keywords"] for key, flow in self.flows.items()}, default=default
+            )
+        # Flow with the most keyword matches, default to creative-orientation (or the first flow)
+        return self._intent_classifier.classify(question).intent
     
-    async def _get_active_sessions(self) -> Dict[str, Any]:
-        """Get currently tracked sessions"""
-        return self.active_sessions.copy()
+    async def _get_active_sessions(self, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Get currently tracked sessions, most recently used first"""
+        records, _ = await self._run_blocking(self.active_sessions.page, 0, limit)
+        return {record.session_id: record.to_dict() for record in records}
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking session store call off the event loop"""
+        return await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
 
 # Create server instance
 app = server.Server("flowise-mcp-server")
@@ -308,6 +335,14 @@ async def handle_list_tools() -> List[types.Tool]:
                     "flow_override": {
                         "type": "string",
                         "description": "Override automatic flow selection with specific flow key"
+                    },
+                    "bypass_cache": {
+                        "type": "boolean",
+                        "description": "Skip the prediction cache and always query flowise"
+                    },
+                    "stateless": {
+                        "type": "boolean",
+                        "description": "One-off query without a session: none is created or returned, and identical in-flight stateless queries share one prediction"
                     }
                 },
                 "required": ["question"]
@@ -488,7 +523,9 @@ async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent
                 arguments["question"],
                 arguments.get("intent"),
                 arguments.get("session_id"),
-                arguments.get("flow_override")
+                arguments.get("flow_override"),
+                arguments.get("bypass_cache", False),
+                arguments.get("stateless", False)
             )
             
             # Extract response text
@@ -524,7 +561,8 @@ async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent
         elif name == "flowise_session_info":
             session_id = arguments.get("session_id")
             if session_id:
-                session_info = flowise_server.active_sessions.get(session_id, {"error": "Session not found"})
+                record = await flowise_server._run_blocking(flowise_server.active_sessions.get, session_id)
+                session_info = record.to_dict() if record else {"error": "Session not found"}
             else:
                 session_info = await flowise_server._get_active_sessions()
             
@@ -570,29 +608,18 @@ Query: {arguments['question']}
         
         elif name == "flowise_add_flow":
             # Add new flow to registry
-            # Try package-bundled config first, then fallback to development location  
-            registry_paths = [
-                Path(__file__).parent / "config" / "flow-registry.yaml",  # Package location
-                Path(__file__).parent.parent / "flow-registry.yaml"       # Development location  
-            ]
-            
-            registry_path = None
-            for path in registry_paths:
-                if path.exists():
-                    registry_path = path
-                    break
+            registry_path = find_registry_path()
             
             if not registry_path:
                 error_result = {
                     "status": "error", 
-                    "message": f"Flow registry not found. Searched: {[str(p) for p in registry_paths]}"
+                    "message": f"Flow registry not found. Searched: {[str(p) for p in DEFAULT_REGISTRY_PATHS]}"
                 }
                 return [types.TextContent(type="text", text=json.dumps(error_result, indent=2))]
             
             try:
-                # Load existing registry
-                with open(registry_path, 'r') as f:
-                    registry = yaml.safe_load(f)
+                # Load existing registry (a mutable copy of the shared snapshot)
+                registry = get_flow_registry(registry_path).current().to_dict()
                 
                 # Create flow key from name
                 flow_key = arguments["flow_name"].lower().replace(' ', '-').replace('_', '-')
@@ -611,7 +638,8 @@ Query: {arguments['question']}
                         'responsePrompt': f"Provide guidance for {arguments['flow_name'].lower()}: {{context}}"
                     },
                     'intent_keywords': arguments["intent_keywords"],
-                    'status': 'active'
+                    'status': 'active',
+                    'active': 1
                 }
                 
                 # Add to operational flows
@@ -619,18 +647,17 @@ Query: {arguments['question']}
                     registry['operational_flows'] = {}
                 registry['operational_flows'][flow_key] = new_flow
                 
-                # Save back to file
-                with open(registry_path, 'w') as f:
-                    yaml.dump(registry, f, default_flow_style=False, sort_keys=False)
-                
-                # Update flowise_server flows dynamically
-                flowise_server.flows[flow_key] = {
-                    "id": new_flow["id"],
-                    "name": new_flow["name"],
-                    "description": new_flow["description"],
-                    "default_config": new_flow["config"],
-                    "intent_keywords": new_flow["intent_keywords"]
-                }
+                # Save back to file atomically; the registry reload updates flowise_server.flows
+                write_registry(registry_path, registry)
+                if flowise_server.registry is None:
+                    flowise_server.flows[flow_key] = {
+                        "id": new_flow["id"],
+                        "name": new_flow["name"],
+                        "description": new_flow["description"],
+                        "default_config": new_flow["config"],
+                        "intent_keywords": new_flow["intent_keywords"]
+                    }
+                    flowise_server._intent_classifier = None
                 
                 result = {
                     "status": "success",
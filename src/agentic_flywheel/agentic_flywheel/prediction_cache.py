@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Prediction Cache
+Opt-in two-tier (in-memory LRU + SQLite) cache for deterministic Flowise predictions
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024          # in-memory tier
+DEFAULT_MAX_DB_ENTRIES = 10000      # SQLite tier
+DEFAULT_TTL = 3600.0                # seconds
+DEFAULT_MAX_TEMPERATURE = 0.3       # hotter flows are not deterministic enough to cache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold and collapse whitespace so trivially different phrasings share an entry"""
+    return _WHITESPACE.sub(" ", question).strip().casefold()
+
+
+def make_cache_key(flow_id: str,
+                   question: str,
+                   override_config: Optional[Dict[str, Any]] = None,
+                   history_hash: Optional[str] = None) -> str:
+    """Stable key for a prediction: flow, normalised question, overrideConfig without sessionId, history"""
+    config = {k: v for k, v in (override_config or {}).items() if k != "sessionId"}
+    material = json.dumps(
+        [flow_id, normalize_question(question), config, history_hash],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def caller_session(session_id: Optional[str], override_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """The session a caller asked for, explicitly or through overrideConfig (None for one-off queries)"""
+    return session_id or (override_config or {}).get("sessionId") or None
+
+
+class PredictionCache:
+    """LRU memory tier in front of an optional SQLite tier, both bounded and expiring after ttl seconds
+
+    Entries are stored as JSON text, so callers always get a fresh copy they may mutate.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: float = DEFAULT_TTL,
+                 db_path: Optional[str] = None,
+                 max_db_entries: int = DEFAULT_MAX_DB_ENTRIES,
+                 max_temperature: Optional[float] = DEFAULT_MAX_TEMPERATURE,
+                 history_hasher: Optional[Callable[[str], Optional[str]]] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max(1, max_db_entries)
+        self.max_temperature = max_temperature
+        # history_hasher(session_id) -> hash of the conversation so far, when answers depend on it
+        self.history_hasher = history_hasher
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.metrics = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+            "evictions": 0, "expirations": 0, "bypasses": 0
+        }
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_env(cls) -> Optional["PredictionCache"]:
+        """Cache configured by FLOWISE_PREDICTION_CACHE* variables, or None when not enabled"""
+        if os.getenv("FLOWISE_PREDICTION_CACHE", "").lower() not in ("1", "true", "yes", "on"):
+            return None
+        max_temperature = os.getenv("FLOWISE_PREDICTION_CACHE_MAX_TEMPERATURE")
+        return cls(
+            max_entries=int(os.getenv("FLOWISE_PREDICTION_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+            ttl=float(os.getenv("FLOWISE_PREDICTION_CACHE_TTL", DEFAULT_TTL)),
+            db_path=os.getenv("FLOWISE_PREDICTION_CACHE_DB") or None,
+            max_db_entries=int(os.getenv("FLOWISE_PREDICTION_CACHE_DB_SIZE", DEFAULT_MAX_DB_ENTRIES)),
+            max_temperature=float(max_temperature) if max_temperature else DEFAULT_MAX_TEMPERATURE
+        )
+
+    def _open_db(self, db_path: str) -> None:
+        Path(db_path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(Path(db_path).expanduser()), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_predictions_last_access ON predictions(last_access)")
+        self._db.execute("DELETE FROM predictions WHERE expires_at <= ?", (time.time(),))
+
+    def is_cacheable(self, override_config: Optional[Dict[str, Any]]) -> bool:
+        """Only low-temperature (near-deterministic) configurations are cached"""
+        if self.max_temperature is None:
+            return True
+        temperature = (override_config or {}).get("temperature")
+        try:
+            return temperature is not None and float(temperature) <= self.max_temperature
+        except (TypeError, ValueError):
+            return False
+
+    def key_for(self, flow_id: str, question: str, override_config: Optional[Dict[str, Any]],
+                session_id: Optional[str] = None) -> Optional[str]:
+        """Cache key for a prediction request, or None when it must not be cached
+
+        session_id is the caller's conversation, if they supplied one. Its answers depend on the
+        conversation so far, and Flowise must see every turn, so such requests are bypassed unless a
+        history_hasher can tell conversations apart.
+        """
+        if not self.is_cacheable(override_config):
+            return None
+        history_hash = None
+        if session_id:
+            if self.history_hasher is None:
+                self.record_bypass()
+                return None
+            history_hash = self.history_hasher(session_id)
+        return make_cache_key(flow_id, question, override_config, history_hash)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.metrics["bypasses"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, promoting disk hits into memory; None on miss or expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.metrics["memory_hits"] += 1
+                    return json.loads(value)
+                del self._memory[key]
+                self.metrics["expirations"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM predictions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        self._db.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (now, key))
+                        self._remember(key, expires_at, value)
+                        self.metrics["disk_hits"] += 1
+                        return json.loads(value)
+                    self._db.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                    self.metrics["expirations"] += 1
+
+            self.metrics["misses"] += 1
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a successful prediction result in both tiers"""
+        value = json.dumps(result, default=str)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO predictions (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                self._trim_db(now)
+            self.metrics["stores"] += 1
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _trim_db(self, now: float) -> None:
+        self._db.execute("DELETE FROM predictions WHERE expires_at <= ?", (now,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        if count > self.max_db_entries:
+            self._db.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY last_access LIMIT ?)",
+                (count - self.max_db_entries,)
+            )
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and tier sizes"""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats["memory_entries"] = len(self._memory)
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the SQLite tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Resilience
+Per-flow retries with jittered backoff, hedged requests, circuit breaking and latency-driven timeouts
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """How hard to try one prediction call"""
+    max_attempts: int = 3                  # first try included
+    backoff_base: float = 0.2              # seconds; full jitter up to base * 2^retry
+    backoff_max: float = 2.0
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+    hedge: bool = False                    # send a second copy of slow idempotent calls
+    hedge_quantile: float = 0.95           # ... once they run longer than this latency quantile
+    hedge_min_delay: float = 0.05
+    hedge_max_ratio: float = 0.1           # at most this share of calls is hedged
+    adaptive_timeout: bool = True
+    timeout_quantile: float = 0.99         # attempt timeout = quantile * multiplier, within [min_timeout, caller timeout]
+    timeout_multiplier: float = 3.0
+    min_timeout: float = 5.0
+    min_samples: int = 20                  # latencies needed before hedging or adapting timeouts
+    total_timeout: float = 60.0            # budget for all attempts of one call
+    breaker_threshold: int = 5             # consecutive failures that open a flow's circuit (0 disables)
+    breaker_reset: float = 30.0            # seconds an open circuit waits before letting a probe through
+
+    @classmethod
+    def from_env(cls) -> Optional["ResiliencePolicy"]:
+        """Policy from FLOWISE_* environment variables; None when FLOWISE_RESILIENCE=0"""
+        if os.getenv("FLOWISE_RESILIENCE", "1").lower() in ("0", "false", "no", "off"):
+            return None
+        default = cls()
+        return cls(
+            max_attempts=int(os.getenv("FLOWISE_RETRY_ATTEMPTS", default.max_attempts)),
+            backoff_base=float(os.getenv("FLOWISE_RETRY_BACKOFF", default.backoff_base)),
+            hedge=os.getenv("FLOWISE_HEDGE", "0").lower() in ("1", "true", "yes", "on"),
+            hedge_quantile=float(os.getenv("FLOWISE_HEDGE_QUANTILE", default.hedge_quantile)),
+            adaptive_timeout=os.getenv("FLOWISE_ADAPTIVE_TIMEOUT", "1").lower() not in ("0", "false", "no", "off"),
+            timeout_multiplier=float(os.getenv("FLOWISE_TIMEOUT_MULTIPLIER", default.timeout_multiplier)),
+            min_timeout=float(os.getenv("FLOWISE_MIN_TIMEOUT", default.min_timeout)),
+            total_timeout=float(os.getenv("FLOWISE_TOTAL_TIMEOUT", default.total_timeout)),
+            breaker_threshold=int(os.getenv("FLOWISE_BREAKER_THRESHOLD", default.breaker_threshold)),
+            breaker_reset=float(os.getenv("FLOWISE_BREAKER_RESET", default.breaker_reset)),
+        )
+
+
+class CircuitOpenError(Exception):
+    """A call was refused because the flow's circuit is open"""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Circuit open for {key}: failing fast for another {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram whose counts halve every half_life samples, so quantiles follow recent traffic"""
+
+    def __init__(self, min_seconds: float = 0.005, max_seconds: float = 300.0,
+                 growth: float = 1.2, half_life: int = 256):
+        bounds = []
+        bound = min_seconds
+        while bound < max_seconds:
+            bounds.append(bound)
+            bound *= growth
+        bounds.append(max_seconds)
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        self.half_life = half_life
+        self.count = 0
+        self._counts: List[float] = [0.0] * len(bounds)
+        self._since_decay = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        index = min(bisect_left(self.bounds, seconds), len(self.bounds) - 1)
+        with self._lock:
+            self._counts[index] += 1.0
+            self.count += 1
+            self._since_decay += 1
+            if self._since_decay >= self.half_life:
+                self._counts = [c / 2 for c in self._counts]
+                self._since_decay = 0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None before any sample)"""
+        with self._lock:
+            total = sum(self._counts)
+            if not total:
+                return None
+            target = q * total
+            cumulative = 0.0
+            for bound, count in zip(self.bounds, self._counts):
+                cumulative += count
+                if cumulative >= target:
+                    return bound
+            return self.bounds[-1]
+
+
+class CircuitBreaker:
+    """Closed -> open after threshold consecutive failures -> half-open (one probe) after reset seconds"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, reset: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.reset = reset
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._changed_at = clock()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; moving to half-open lets exactly one probe through"""
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            # An open circuit admits a probe after reset; a probe that never reported back is replaced after reset too
+            if self.clock() - self._changed_at >= self.reset:
+                self.state = self.HALF_OPEN
+                self._changed_at = self.clock()
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset - (self.clock() - self._changed_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("✅ Circuit closed after a successful probe")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.threshold):
+                self.state = self.OPEN
+                self._changed_at = self.clock()
+
+
+class _FlowState:
+    __slots__ = ("histogram", "breaker", "metrics")
+
+    def __init__(self, policy: ResiliencePolicy):
+        self.histogram = LatencyHistogram()
+        self.breaker = CircuitBreaker(policy.breaker_threshold, policy.breaker_reset)
+        self.metrics = {"calls": 0, "attempts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0,
+                        "timeouts": 0, "failures": 0, "rejected": 0}
+
+
+class Resilience:
+    """Runs calls for a key (a flow id) under a ResiliencePolicy, keeping latency and breaker state per key
+
+    errors are the exception types that mean "the remote call failed"; they may carry
+    status_code (HTTP status or None), request_sent (False when the server never saw the
+    request) and timed_out. Anything else propagates untouched.
+    """
+
+    def __init__(self, policy: Optional[ResiliencePolicy] = None,
+                 errors: Tuple[Type[BaseException], ...] = (Exception,), rng: Optional[random.Random] = None):
+        self.policy = policy or ResiliencePolicy()
+        self.errors = errors
+        self.rng = rng or random.Random()
+        self._flows: Dict[str, _FlowState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> _FlowState:
+        state = self._flows.get(key)
+        if state is None:
+            with self._lock:
+                state = self._flows.setdefault(key, _FlowState(self.policy))
+        return state
+
+    def timeout_for(self, key: str, ceiling: float) -> float:
+        """Attempt timeout: a multiple of the flow's tail latency, never above the caller's timeout"""
+        state = self._state(key)
+        policy = self.policy
+        if not policy.adaptive_timeout or state.histogram.count < policy.min_samples:
+            return ceiling
+        tail = state.histogram.quantile(policy.timeout_quantile)
+        return min(ceiling, max(policy.min_timeout, tail * policy.timeout_multiplier))
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """How long to wait before hedging a call, or None when hedging is off or latency is still unknown"""
+        state = self._state(key)
+        if not self.policy.hedge or state.histogram.count < self.policy.min_samples:
+            return None
+        return max(self.policy.hedge_min_delay, state.histogram.quantile(self.policy.hedge_quantile))
+
+    def circuit_open(self, key: str) -> bool:
+        """Whether calls for key are currently being refused (false again once a probe is due)"""
+        state = self._flows.get(key)
+        return state is not None and state.breaker.state == CircuitBreaker.OPEN and state.breaker.retry_after() > 0
+
+    def is_failure(self, error: BaseException) -> bool:
+        """Errors that count against the circuit: transport failures, timeouts and 5xx answers"""
+        if not isinstance(error, self.errors):
+            return False
+        status = getattr(error, "status_code", None)
+        return status is None or status >= 500
+
+    def is_retryable(self, error: BaseException, idempotent: bool) -> bool:
+        """Calls the server never saw are always retried; anything else only when repeating it is safe"""
+        if not isinstance(error, self.errors):
+            return False
+        if not getattr(error, "request_sent", True):
+            return True
+        status = getattr(error, "status_code", None)
+        return idempotent and (status is None or status in self.policy.retry_statuses)
+
+    def _backoff(self, retry: int) -> float:
+        return self.rng.uniform(0, min(self.policy.backoff_max, self.policy.backoff_base * (2 ** retry)))
+
+    async def call(self, key: str, attempt: Callable[[float], Awaitable[T]], timeout: float,
+                   idempotent: bool = False) -> T:
+        """Run attempt(timeout_seconds) with retries, hedging and the flow's circuit breaker"""
+        state = self._state(key)
+        state.metrics["calls"] += 1
+        if not state.breaker.allow():
+            state.metrics["rejected"] += 1
+            raise CircuitOpenError(key, state.breaker.retry_after())
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(timeout, self.policy.total_timeout)
+        attempt_timeout = self.timeout_for(key, timeout)
+        attempts = max(1, self.policy.max_attempts)
+        for number in range(1, attempts + 1):
+            budget = min(attempt_timeout, deadline - loop.time())
+            try:
+                result = await self._attempt(key, state, attempt, budget, idempotent)
+            except Exception as e:
+                timed_out = getattr(e, "timed_out", False)
+                if timed_out:
+                    state.metrics["timeouts"] += 1
+                    state.histogram.record(budget)  # the call took at least this long
+                if self.is_failure(e):
+                    state.metrics["failures"] += 1
+                    state.breaker.record_failure()
+                elif isinstance(e, self.errors):
+                    state.breaker.record_success()  # the flow answered, the request was wrong
+                if number == attempts or not self.is_retryable(e, idempotent) \
+                        or state.breaker.state == CircuitBreaker.OPEN:
+                    raise
+                delay = self._backoff(number - 1)
+                if loop.time() + delay >= deadline:
+                    raise
+                state.metrics["retries"] += 1
+                logger.warning(f"🔁 Retrying {key} in {delay * 1000:.0f} ms (attempt {number + 1}): {e}")
+                await asyncio.sleep(delay)
+                if timed_out:
+                    attempt_timeout = min(timeout, attempt_timeout * 2)
+            else:
+                state.breaker.record_success()
+                return result
+
+    async def _timed(self, state: _FlowState, attempt: Callable[[float], Awaitable[T]], budget: float) -> T:
+        state.metrics["attempts"] += 1
+        started = time.perf_counter()
+        result = await attempt(budget)
+        state.histogram.record(time.perf_counter() - started)
+        return result
+
+    async def _attempt(self, key: str, state: _FlowState, attempt: Callable[[float], Awaitable[T]],
+                       budget: float, idempotent: bool) -> T:
+        """One attempt, plus a hedged copy if it outlives the flow's hedge delay; the first success wins"""
+        delay = self.hedge_delay(key) if idempotent else None
+        if delay is None or delay >= budget:
+            return await self._timed(state, attempt, budget)
+
+        primary = asyncio.ensure_future(self._timed(state, attempt, budget))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or state.metrics["hedges"] >= self.policy.hedge_max_ratio * state.metrics["calls"]:
+                return await primary
+
+            state.metrics["hedges"] += 1
+            hedge = asyncio.ensure_future(self._timed(state, attempt, budget - delay))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            state.metrics["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals plus, per flow: circuit state, latency quantiles, hedge delay and counters"""
+        with self._lock:
+            flows = dict(self._flows)
+        per_flow = {}
+        totals: Dict[str, int] = {}
+        for key, state in flows.items():
+            for name, value in state.metrics.items():
+                totals[name] = totals.get(name, 0) + value
+            quantiles = {f"p{int(q * 100)}_ms": state.histogram.quantile(q) for q in (0.5, 0.95, 0.99)}
+            hedge_delay = self.hedge_delay(key)
+            per_flow[key] = {
+                "circuit": state.breaker.state,
+                "consecutive_failures": state.breaker.failures,
+                "samples": state.histogram.count,
+                **{name: round(v * 1000, 1) if v is not None else None for name, v in quantiles.items()},
+                "hedge_delay_ms": round(hedge_delay * 1000, 1) if hedge_delay else None,
+                **state.metrics,
+            }
+        return {"policy": {"max_attempts": self.policy.max_attempts, "hedge": self.policy.hedge,
+                           "adaptive_timeout": self.policy.adaptive_timeout,
+                           "breaker_threshold": self.policy.breaker_threshold},
+                **totals, "flows": per_flow}
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Session Store
+Bounded, expiring session records: an in-process LRU + TTL store or a SQLite (WAL) store shared by worker processes
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = 3600.0       # seconds of inactivity before a session expires
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_PAGE_SIZE = 100
+PURGE_INTERVAL = 60.0              # seconds between sweeps for expired sessions
+TRIM_EVERY = 64                    # SQLite writes between max_sessions checks
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class SessionRecord:
+    """One session: its data plus creation, last use and expiry times (epoch seconds)"""
+    __slots__ = ("session_id", "data", "created_at", "last_used", "expires_at", "ttl")
+
+    def __init__(self, session_id: str, data: Any, ttl: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.session_id = session_id
+        self.data = data
+        self.ttl = ttl
+        self.created_at = now
+        self.last_used = now
+        self.expires_at = now + ttl
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at <= now
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The session's data with its timestamps as ISO strings"""
+        data = self.data if isinstance(self.data, dict) else {"value": self.data}
+        return {
+            **data,
+            "created_at": _iso(self.created_at),
+            "last_used": _iso(self.last_used),
+            "expires_at": _iso(self.expires_at),
+            "ttl": self.ttl,
+        }
+
+
+class SessionStore(ABC):
+    """Interface shared by the session backends
+
+    Sessions expire ttl seconds after their last use and the least recently used one is
+    evicted when max_sessions is exceeded.
+    """
+
+    default_ttl: float
+    max_sessions: int
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """The live session, or None if unknown or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, session_id: str, data: Any, ttl: Optional[float] = None) -> SessionRecord:
+        """Create or replace a session"""
+        pass
+
+    @abstractmethod
+    def touch(self, session_id: str, defaults: Optional[Dict[str, Any]] = None,
+              ttl: Optional[float] = None) -> SessionRecord:
+        """Record a use: create the session from defaults if needed, bump request_count and extend its expiry"""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a live session; returns whether there was one"""
+        pass
+
+    @abstractmethod
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[SessionRecord], int]:
+        """Live sessions, most recently used first: (one page, total count)"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Drop expired sessions; returns how many"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of live sessions"""
+        pass
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Backend, size and eviction/expiry counters"""
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU + TTL store: O(1) get/set/touch, values kept as given (any Python object)"""
+
+    def __init__(self, default_ttl: float = DEFAULT_SESSION_TTL, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.default_ttl = default_ttl
+        self.max_sessions = max(1, max_sessions)
+        self._records: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        self.metrics = {"evictions": 0, "expirations": 0}
+
+    def _live(self, session_id: str, now: float) -> Optional[SessionRecord]:
+        record = self._records.get(session_id)
+        if record is not None and record.expired(now):
+            del self._records[session_id]
+            self.metrics["expirations"] += 1
+            return None
+        return record
+
+    def _insert(self, record: SessionRecord, now: float) -> None:
+        self._records[record.session_id] = record
+        self._records.move_to_end(record.session_id)
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._purge(now)
+        while len(self._records) > self.max_sessions:
+            self._records.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            return self._live(session_id, time.time())
+
+    def set(self, session_id: str, data: Any, ttl: Optional[float] = None) -> SessionRecord:
+        now = time.time()
+        record = SessionRecord(session_id, data, self.default_ttl if ttl is None else ttl, now)
+        with self._lock:
+            previous = self._live(session_id, now)
+            if previous is not None:
+                record.created_at = previous.created_at
+            self._insert(record, now)
+        return record
+
+    def touch(self, session_id: str, defaults: Optional[Dict[str, Any]] = None,
+              ttl: Optional[float] = None) -> SessionRecord:
+        now = time.time()
+        with self._lock:
+            record = self._live(session_id, now)
+            if record is None:
+                record = SessionRecord(session_id, {**(defaults or {}), "request_count": 0},
+                                       self.default_ttl if ttl is None else ttl, now)
+            elif ttl is not None:
+                record.ttl = ttl
+            if isinstance(record.data, dict):
+                record.data["request_count"] = record.data.get("request_count", 0) + 1
+            record.last_used = now
+            record.expires_at = now + record.ttl
+            self._insert(record, now)
+            return record
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._records.pop(session_id, None) is not None
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[SessionRecord], int]:
+        with self._lock:
+            self._purge(time.time())
+            newest_first: Iterator[SessionRecord] = reversed(self._records.values())
+            return list(islice(newest_first, max(0, offset), max(0, offset) + max(0, limit))), len(self._records)
+
+    def _purge(self, now: float) -> int:
+        expired = [sid for sid, record in self._records.items() if record.expired(now)]
+        for session_id in expired:
+            del self._records[session_id]
+        self.metrics["expirations"] += len(expired)
+        self._last_purge = now
+        return len(expired)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(time.time())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "sessions": len(self._records), "max_sessions": self.max_sessions,
+                    "default_ttl": self.default_ttl, **self.metrics}
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite (WAL) store shared by every process that opens the same file; values must be JSON-serialisable
+
+    Lookups go through the primary key; the size bound is enforced every TRIM_EVERY writes.
+    """
+
+    def __init__(self, db_path: str, default_ttl: float = DEFAULT_SESSION_TTL,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.db_path = str(Path(db_path).expanduser())
+        self.default_ttl = default_ttl
+        self.max_sessions = max(1, max_sessions)
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._writes = 0
+        self.metrics = {"evictions": 0, "expirations": 0}
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                ttl REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_used ON sessions(last_used)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)")
+
+    @staticmethod
+    def _record(row: Tuple) -> SessionRecord:
+        session_id, data, created_at, last_used, expires_at, ttl = row
+        record = SessionRecord(session_id, json.loads(data), ttl, created_at)
+        record.last_used = last_used
+        record.expires_at = expires_at
+        return record
+
+    def _select(self, session_id: str, now: float) -> Optional[SessionRecord]:
+        row = self._db.execute(
+            "SELECT session_id, data, created_at, last_used, expires_at, ttl FROM sessions "
+            "WHERE session_id = ? AND expires_at > ?", (session_id, now)
+        ).fetchone()
+        return self._record(row) if row else None
+
+    def _write(self, record: SessionRecord, now: float) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, data, created_at, last_used, expires_at, ttl) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (record.session_id, json.dumps(record.data, default=str), record.created_at,
+             record.last_used, record.expires_at, record.ttl)
+        )
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._purge(now)
+        # Counting rows on every write is wasteful; checking every TRIM_EVERY writes bounds the overshoot
+        self._writes += 1
+        if self._writes % TRIM_EVERY:
+            return
+        (count,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        if count > self.max_sessions:
+            self._db.execute(
+                "DELETE FROM sessions WHERE session_id IN "
+                "(SELECT session_id FROM sessions ORDER BY last_used LIMIT ?)", (count - self.max_sessions,)
+            )
+            self.metrics["evictions"] += count - self.max_sessions
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            return self._select(session_id, time.time())
+
+    def set(self, session_id: str, data: Any, ttl: Optional[float] = None) -> SessionRecord:
+        now = time.time()
+        record = SessionRecord(session_id, data, self.default_ttl if ttl is None else ttl, now)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                previous = self._select(session_id, now)
+                if previous is not None:
+                    record.created_at = previous.created_at
+                self._write(record, now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return record
+
+    def touch(self, session_id: str, defaults: Optional[Dict[str, Any]] = None,
+              ttl: Optional[float] = None) -> SessionRecord:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so concurrent workers cannot lose an increment
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                record = self._select(session_id, now)
+                if record is None:
+                    record = SessionRecord(session_id, {**(defaults or {}), "request_count": 0},
+                                           self.default_ttl if ttl is None else ttl, now)
+                elif ttl is not None:
+                    record.ttl = ttl
+                if isinstance(record.data, dict):
+                    record.data["request_count"] = record.data.get("request_count", 0) + 1
+                record.last_used = now
+                record.expires_at = now + record.ttl
+                self._write(record, now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return record
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM sessions WHERE session_id = ? AND expires_at > ?", (session_id, time.time())
+            )
+            return cursor.rowcount > 0
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[SessionRecord], int]:
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT session_id, data, created_at, last_used, expires_at, ttl FROM sessions "
+                "WHERE expires_at > ? ORDER BY last_used DESC LIMIT ? OFFSET ?",
+                (now, max(0, limit), max(0, offset))
+            ).fetchall()
+            (total,) = self._db.execute("SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (now,)).fetchone()
+        return [self._record(row) for row in rows], total
+
+    def _purge(self, now: float) -> int:
+        deleted = self._db.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,)).rowcount
+        self.metrics["expirations"] += deleted
+        self._last_purge = now
+        return deleted
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(time.time())
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "sqlite", "db_path": self.db_path, "sessions": len(self),
+                "max_sessions": self.max_sessions, "default_ttl": self.default_ttl, **self.metrics}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def session_store_from_env(prefix: str = "FLOWISE_SESSION") -> SessionStore:
+    """Store configured by {prefix}_STORE (a SQLite file path, or unset/"memory"), {prefix}_TTL and {prefix}_MAX"""
+    backend = os.getenv(f"{prefix}_STORE", "memory")
+    ttl = float(os.getenv(f"{prefix}_TTL", DEFAULT_SESSION_TTL))
+    max_sessions = int(os.getenv(f"{prefix}_MAX", DEFAULT_MAX_SESSIONS))
+    if backend and backend != "memory":
+        logger.info(f"🗃️ Sessions shared through SQLite: {backend}")
+        return SQLiteSessionStore(backend, default_ttl=ttl, max_sessions=max_sessions)
+    return MemorySessionStore(default_ttl=ttl, max_sessions=max_sessions)
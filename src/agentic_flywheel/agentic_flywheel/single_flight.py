@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Single Flight
+Collapses concurrent identical async calls into one in-flight call whose result is fanned out to every caller
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Dict, Any, Awaitable, Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Concurrent do(key, ...) calls with the same key share one execution
+
+    The call runs as its own task, so a caller that is cancelled does not cancel it for the
+    others. Followers get a deep copy of the result so per-caller metadata can be attached
+    safely; an exception is raised to every caller. Sharing only happens within one event loop.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Run call() unless an identical call is in flight; returns (result, shared)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.metrics["calls"] += 1
+            task = self._calls.get(key)
+            shared = task is not None and task.get_loop() is loop
+            if shared:
+                self.metrics["coalesced"] += 1
+            else:
+                self.metrics["executions"] += 1
+                task = loop.create_task(call())
+                if key not in self._calls:
+                    self._calls[key] = task
+                    task.add_done_callback(lambda done, key=key: self._forget(key, done))
+
+        result = await asyncio.shield(task)
+        return (copy.deepcopy(result), True) if shared else (result, False)
+
+    def _forget(self, key: str, task: "asyncio.Future[Any]") -> None:
+        with self._lock:
+            if self._calls.get(key) is task:
+                del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller went away
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls seen, upstream executions and calls saved by coalescing"""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats["in_flight"] = len(self._calls)
+        stats["saved_ratio"] = round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
+
+
+_shared = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """The process-wide single-flight group shared by every Flowise entry point"""
+    return _shared
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Worker Metrics Board
+Each gateway worker process publishes a metrics snapshot to a shared SQLite (WAL) file; any worker can read them all
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBLISH_INTERVAL = 2.0     # seconds between snapshots from one worker
+STALE_AFTER_INTERVALS = 5          # workers silent for longer are considered gone
+PER_WORKER_KEYS = ("pid", "age_seconds")
+
+
+def aggregate(snapshots: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the numeric leaves of several snapshots (nested dicts are merged key by key, other values dropped)"""
+    totals: Dict[str, Any] = {}
+    for snapshot in snapshots.values():
+        _add(totals, {key: value for key, value in snapshot.items() if key not in PER_WORKER_KEYS})
+    return totals
+
+
+def _add(totals: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+    for key, value in snapshot.items():
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            totals[key] = totals.get(key, 0) + value
+        elif isinstance(value, dict):
+            _add(totals.setdefault(key, {}), value)
+
+
+class WorkerMetricsBoard:
+    """Latest snapshot per worker in a SQLite file shared by every process that opens it"""
+
+    def __init__(self, db_path: str, publish_interval: float = DEFAULT_PUBLISH_INTERVAL):
+        self.db_path = str(Path(db_path).expanduser())
+        self.publish_interval = publish_interval
+        self._lock = threading.Lock()
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS worker_metrics (
+                worker TEXT PRIMARY KEY,
+                pid INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                snapshot TEXT NOT NULL
+            )
+        """)
+
+    def publish(self, worker: str, snapshot: Dict[str, Any]) -> None:
+        """Replace this worker's snapshot"""
+        data = json.dumps(snapshot, default=str)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO worker_metrics (worker, pid, updated_at, snapshot) VALUES (?, ?, ?, ?)",
+                (worker, os.getpid(), time.time(), data)
+            )
+
+    def collect(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Snapshots of the workers heard from within max_age seconds, with pid and age added"""
+        max_age = self.publish_interval * STALE_AFTER_INTERVALS if max_age is None else max_age
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT worker, pid, updated_at, snapshot FROM worker_metrics WHERE updated_at > ? ORDER BY worker",
+                (now - max_age,)
+            ).fetchall()
+        return {
+            worker: {"pid": pid, "age_seconds": round(now - updated_at, 1), **json.loads(snapshot)}
+            for worker, pid, updated_at, snapshot in rows
+        }
+
+    def remove(self, worker: str) -> None:
+        """Forget a worker that is shutting down"""
+        with self._lock:
+            self._db.execute("DELETE FROM worker_metrics WHERE worker = ?", (worker,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def worker_metrics_from_env() -> Optional[WorkerMetricsBoard]:
+    """Board at FLOWISE_GATEWAY_METRICS_DB (interval FLOWISE_GATEWAY_METRICS_INTERVAL), or None when unset"""
+    db_path = os.getenv("FLOWISE_GATEWAY_METRICS_DB")
+    if not db_path:
+        return None
+    interval = float(os.getenv("FLOWISE_GATEWAY_METRICS_INTERVAL", DEFAULT_PUBLISH_INTERVAL))
+    return WorkerMetricsBoard(db_path, publish_interval=interval)
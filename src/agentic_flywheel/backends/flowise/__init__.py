@@ -4,5 +4,6 @@ Integrates with existing Flowise admin layer intelligence
 """
 
 from .flowise_backend import FlowiseBackend
+from .sse import SSEParser, SSEEvent, iter_flowise_events
 
-__all__ = ['FlowiseBackend']
\ No newline at end of file
+__all__ = ['FlowiseBackend', 'SSEParser', 'SSEEvent', 'iter_flowise_events']
\ No newline at end of file
@@ -7,6 +7,7 @@ Integrates existing flowise_admin intelligence with universal backend interface
 import asyncio
 import logging
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
@@ -15,11 +16,13 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backends.base import FlowBackend, BackendType, UniversalFlow, UniversalSession, UniversalPerformanceMetrics, FlowStatus
+from backends.flowise.sse import iter_flowise_events
 
 # Import existing flowise admin components
 try:
     from flowise_admin import FlowiseDBInterface, FlowAnalyzer, ConfigurationSync
-    from flowise_manager import FlowiseManager
+    from agentic_flywheel.flowise_manager import FlowiseManager
+    from agentic_flywheel.flowise_client import FlowiseClientError
     FLOWISE_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Flowise admin components not available: {e}")
@@ -27,6 +30,7 @@ except ImportError as e:
     FlowAnalyzer = None
     ConfigurationSync = None
     FlowiseManager = None
+    FlowiseClientError = Exception
     FLOWISE_AVAILABLE = False
 
 
@@ -59,19 +63,22 @@ class FlowiseBackend(FlowBackend):
         """Initialize Flowise admin components"""
         try:
             if FlowiseManager:
-                self.flowise_manager = FlowiseManager()
+                base_url = self.config.get('base_url')
+                self.flowise_manager = FlowiseManager(base_url=base_url) if base_url else FlowiseManager()
                 logger.info("✅ FlowiseManager initialized")
             
             if FlowiseDBInterface:
-                self.db_interface = FlowiseDBInterface()
+                database_path = self.config.get('database_path')
+                self.db_interface = FlowiseDBInterface(database_path) if database_path else FlowiseDBInterface()
                 logger.info("✅ FlowiseDBInterface initialized")
             
-            if FlowAnalyzer:
-                self.flow_analyzer = FlowAnalyzer()
+            # Analyzer and sync share the single db interface and its pooled connections
+            if FlowAnalyzer and self.db_interface:
+                self.flow_analyzer = FlowAnalyzer(db=self.db_interface)
                 logger.info("✅ FlowAnalyzer initialized")
             
-            if ConfigurationSync:
-                self.config_sync = ConfigurationSync()
+            if ConfigurationSync and self.db_interface:
+                self.config_sync = ConfigurationSync(db=self.db_interface, analyzer=self.flow_analyzer)
                 logger.info("✅ ConfigurationSync initialized")
                 
         except Exception as e:
@@ -87,7 +94,7 @@ class FlowiseBackend(FlowBackend):
         try:
             # Test connection through flowise manager
             if self.flowise_manager:
-                connection_test = self.flowise_manager.test_connection()
+                connection_test = await self.flowise_manager.test_connection_async()
                 if connection_test:
                     self._is_connected = True
                     logger.info("🔗 Connected to Flowise backend")
@@ -121,7 +128,7 @@ class FlowiseBackend(FlowBackend):
         try:
             # Test through flowise manager if available
             if self.flowise_manager:
-                return self.flowise_manager.test_connection()
+                return await self.flowise_manager.test_connection_async()
             
             # Test database interface
             if self.db_interface:
@@ -227,14 +234,7 @@ class FlowiseBackend(FlowBackend):
             return {"error": "Flowise backend not connected"}
         
         try:
-            # Get Flowise flow ID
-            flowise_flow_id = self._flow_id_mapping.get(flow_id)
-            if not flowise_flow_id:
-                # Try to extract from universal ID
-                if flow_id.startswith("flowise_"):
-                    flow_key = flow_id[8:]  # Remove "flowise_" prefix
-                    flowise_flow_id = self._get_flowise_id_from_key(flow_key)
-            
+            flow_key, flowise_flow_id = self._resolve_flow(flow_id)
             if not flowise_flow_id:
                 return {"error": f"Flow ID {flow_id} not found in Flowise"}
             
@@ -244,9 +244,9 @@ class FlowiseBackend(FlowBackend):
                 flowise_session_id = self._session_mapping.get(session_id, session_id)
             
             # Execute using flowise manager
-            result = self.flowise_manager.adaptive_query(
+            result = await self.flowise_manager.adaptive_query_async(
                 question=str(input_data),
-                intent=flow_key if 'flow_key' in locals() else None,
+                intent=flow_key,
                 session_id=flowise_session_id
             )
             
@@ -265,6 +265,17 @@ class FlowiseBackend(FlowBackend):
             logger.error(f"❌ Flowise flow execution failed: {e}")
             return {"error": f"Execution failed: {str(e)}"}
     
+    def _resolve_flow(self, flow_id: str):
+        """Map a universal flow ID to (flow key, Flowise chatflow ID)"""
+        flow_key = flow_id[8:] if flow_id.startswith("flowise_") else None  # Remove "flowise_" prefix
+        flowise_flow_id = self._flow_id_mapping.get(flow_id)
+        if not flowise_flow_id and flow_key:
+            if self.flowise_manager and flow_key in self.flowise_manager.flows:
+                flowise_flow_id = self.flowise_manager.flows[flow_key].id
+            else:
+                flowise_flow_id = self._get_flowise_id_from_key(flow_key)
+        return flow_key, flowise_flow_id
+    
     def _get_flowise_id_from_key(self, flow_key: str) -> Optional[str]:
         """Get Flowise ID from flow key using config sync"""
         if not self.config_sync:
@@ -281,10 +292,65 @@ class FlowiseBackend(FlowBackend):
                          input_data: Any,
                          parameters: Optional[Dict[str, Any]] = None,
                          session_id: Optional[str] = None):
-        """Execute flow with streaming (not implemented - requires streaming API)"""
-        # For now, return regular execution as single yield
-        result = await self.execute_flow(flow_id, input_data, parameters, session_id)
-        yield result
+        """Execute flow with Flowise SSE streaming, yielding {"type", "data"} chunks as they arrive"""
+        if not self._is_connected or not self.flowise_manager:
+            yield {"type": "error", "data": "Flowise backend not connected"}
+            return
+        
+        flow_key, flowise_flow_id = self._resolve_flow(flow_id)
+        if not flowise_flow_id:
+            yield {"type": "error", "data": f"Flow ID {flow_id} not found in Flowise"}
+            return
+        
+        flowise_session_id = self._session_mapping.get(session_id, session_id) if session_id else None
+        routing, lines = self.flowise_manager.adaptive_stream(
+            question=str(input_data),
+            intent=flow_key,
+            session_id=flowise_session_id,
+            flow_override=flowise_flow_id,
+            config_override=parameters
+        )
+        
+        started = time.perf_counter()
+        ttft_ms = None
+        tokens = 0
+        events = iter_flowise_events(lines)
+        try:
+            async for chunk in events:
+                if chunk["type"] == "token":
+                    tokens += 1
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                        logger.info(f"⏱️ Flowise time to first token for {flow_id}: {ttft_ms:.0f} ms")
+                if chunk["type"] == "end":
+                    break
+                yield chunk
+        except FlowiseClientError as e:
+            logger.error(f"❌ Flowise stream failed: {e}")
+            yield {"type": "error", "data": f"Streaming failed: {str(e)}"}
+            return
+        finally:
+            # Leaving early (the end event, an error, or our consumer closing us) must still
+            # close both generators so the upstream response goes back to the pool now
+            await events.aclose()
+            await lines.aclose()
+        
+        total_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"✅ Streamed {tokens} tokens from {flow_id} in {total_ms:.0f} ms")
+        yield {
+            "type": "end",
+            "data": "[DONE]",
+            "_universal_metadata": {
+                'backend': 'flowise',
+                'flow_id': flow_id,
+                'flowise_flow_id': flowise_flow_id,
+                'session_id': routing['session_id'],
+                'flow_used': routing['flow_used'],
+                'ttft_ms': round(ttft_ms, 1) if ttft_ms is not None else None,
+                'total_ms': round(total_ms, 1),
+                'token_count': tokens
+            }
+        }
     
     # Session Management
     async def create_session(self, flow_id: str, config: Optional[Dict[str, Any]] = None) -> UniversalSession:
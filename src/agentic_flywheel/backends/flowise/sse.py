@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Flowise SSE Parser
+Incremental text/event-stream parsing and decoding of Flowise streaming prediction events
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+@dataclass
+class SSEEvent:
+    """One dispatched server-sent event"""
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """Feed it lines (without line endings); a blank line dispatches the buffered event"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self._event = "message"
+        self._data: List[str] = []
+        self._id: Optional[str] = None
+
+    def feed(self, line: str) -> Optional[SSEEvent]:
+        """Consume one line, returning an event when the line completes one"""
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None  # comment / keep-alive
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value or "message"
+        elif field == "id":
+            self._id = value
+        # "retry" and unknown fields (Flowise sends a bare "message:" line) are ignored
+        return None
+
+    def flush(self) -> Optional[SSEEvent]:
+        """Dispatch whatever is buffered (also used at end of stream)"""
+        if not self._data:
+            self._reset()
+            return None
+        event = SSEEvent(event=self._event, data="\n".join(self._data), id=self._id)
+        self._reset()
+        return event
+
+
+def decode_flowise_event(event: SSEEvent) -> Dict[str, Any]:
+    """Flowise sends {"event": ..., "data": ...} JSON in each data field; other payloads pass through"""
+    try:
+        payload = json.loads(event.data)
+    except ValueError:
+        return {"type": "token" if event.event == "message" else event.event, "data": event.data}
+    if isinstance(payload, dict) and "event" in payload:
+        return {"type": payload["event"], "data": payload.get("data")}
+    return {"type": event.event, "data": payload}
+
+
+async def iter_flowise_events(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Decode an async stream of SSE lines into Flowise events ({"type", "data"})"""
+    parser = SSEParser()
+    async for line in lines:
+        event = parser.feed(line)
+        if event is not None:
+            yield decode_flowise_event(event)
+    event = parser.flush()
+    if event is not None:
+        yield decode_flowise_event(event)
@@ -7,7 +7,7 @@ Manages discovery, registration, and lifecycle of flow execution backends
 import asyncio
 import importlib
 import logging
-from typing import Any, Dict, List, Optional, Type, Set
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, Set
 from pathlib import Path
 import json
 from dataclasses import asdict
@@ -297,6 +297,34 @@ class BackendRegistry:
             logger.error(f"❌ Flow execution failed: {e}")
             return {"error": f"Flow execution failed: {str(e)}"}
     
+    async def stream_flow(self,
+                          flow_id: str,
+                          input_data: Any,
+                          parameters: Optional[Dict[str, Any]] = None,
+                          session_id: Optional[str] = None,
+                          backend_type: Optional[BackendType] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a flow's output chunk by chunk from the backend that owns it"""
+        if backend_type is None:
+            flow = await self.find_flow(flow_id)
+            if not flow:
+                yield {"type": "error", "data": f"Flow {flow_id} not found"}
+                return
+            backend_type = flow.backend
+        
+        backend = self.backends.get(backend_type)
+        if backend and not backend.is_connected:
+            await self.connect_backend(backend_type)
+        if not backend or not backend.is_connected:
+            yield {"type": "error", "data": f"Backend {backend_type.value} not available"}
+            return
+        
+        try:
+            async for chunk in backend.stream_flow(flow_id, input_data, parameters, session_id):
+                yield chunk
+        except Exception as e:
+            logger.error(f"❌ Flow streaming failed: {e}")
+            yield {"type": "error", "data": f"Flow streaming failed: {str(e)}"}
+    
     async def _refresh_flows_cache(self, backend_type: BackendType) -> None:
         """Refresh flow cache for a specific backend"""
         backend = self.backends.get(backend_type)
@@ -0,0 +1,3 @@
+"""
+Admin and gateway benchmarks run against synthetic databases and stub servers
+"""
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Flow Statistics Benchmark
+Compares the single-pass statistics engine with the per-flow query path on a synthetic database
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from flowise_admin.db_interface import FlowiseDBInterface
+from benchmarks.synthetic_db import generate_database
+
+
+def _time(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_benchmark(database: str, repeat: int = 3) -> dict:
+    """Time both statistics paths and verify they agree"""
+    db = FlowiseDBInterface(database)
+
+    legacy_time, legacy_stats = _time(db._get_flow_statistics_per_flow, repeat)
+    engine_time, engine_stats = _time(db.get_flow_statistics, repeat)
+
+    legacy_by_id = {s.chatflow_id: s for s in legacy_stats}
+    mismatches = []
+    for stat in engine_stats:
+        reference = legacy_by_id.get(stat.chatflow_id)
+        if reference is None:
+            mismatches.append(stat.chatflow_id)
+            continue
+        same = (
+            reference.message_count == stat.message_count
+            and reference.session_count == stat.session_count
+            and reference.first_message == stat.first_message
+            and reference.last_message == stat.last_message
+            and abs(reference.success_score - stat.success_score) < 1e-9
+            and abs(reference.engagement_score - stat.engagement_score) < 1e-9
+        )
+        if not same:
+            mismatches.append(stat.chatflow_id)
+
+    return {
+        "flows": len(engine_stats),
+        "per_flow_seconds": legacy_time,
+        "single_pass_seconds": engine_time,
+        "speedup": legacy_time / engine_time if engine_time else float("inf"),
+        "mismatched_flows": mismatches,
+    }
+
+
+def main():
+    """CLI interface for the statistics benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark FlowiseDBInterface.get_flow_statistics")
+    parser.add_argument("--database", help="Existing database to benchmark (default: generate a synthetic one)")
+    parser.add_argument("--messages", type=int, default=200_000, help="Synthetic database size")
+    parser.add_argument("--flows", type=int, default=60, help="Synthetic chatflow count")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best time is reported)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = args.database
+        if not database:
+            database = str(generate_database(Path(tmp) / "database.sqlite", args.messages, args.flows))
+            print(f"🧪 Generated synthetic database: {args.messages:,} messages, {args.flows} flows")
+
+        result = run_benchmark(database, args.repeat)
+
+    print(f"📊 Flows: {result['flows']}")
+    print(f"   🐢 Per-flow queries: {result['per_flow_seconds'] * 1000:.1f} ms")
+    print(f"   🚀 Single pass:      {result['single_pass_seconds'] * 1000:.1f} ms")
+    print(f"   ⚡ Speedup:          {result['speedup']:.1f}x")
+    if result["mismatched_flows"]:
+        print(f"❌ Results differ for {len(result['mismatched_flows'])} flows")
+        sys.exit(1)
+    print("✅ Both paths return identical FlowStats")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Gateway Load Benchmark
+Drives the FastAPI gateway with concurrent clients against a stub Flowise and reports how throughput scales
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.stub_flowise import StubFlowiseApp, BackgroundServer
+
+
+
+def load_gateway_module():
+    """Import the gateway app module (agentic_flywheel.gateway)"""
+    return importlib.import_module("agentic_flywheel.gateway")
+
+
+def use_blocking_manager(manager) -> None:
+    """Route the gateway through the synchronous manager call, as the endpoints did before the async path"""
+
+    async def blocking_adaptive_query(**kwargs):
+        return manager.adaptive_query(**kwargs)
+
+    manager.adaptive_query_async = blocking_adaptive_query
+
+
+async def _drive(url: str, flow_name: str, clients: int, requests_per_client: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    failures = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120.0, limits=limits) as client:
+        async def worker(worker_id: int):
+            nonlocal failures
+            for i in range(requests_per_client):
+                started = time.perf_counter()
+                response = await client.post(f"/api/v1/flows/{flow_name}", json={
+                    "question": f"load test {worker_id}-{i}",
+                    "session_id": f"load-{worker_id}"
+                })
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "failures": failures,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+    }
+
+
+def run_benchmark(concurrency_levels: List[int], latency: float, requests_per_client: int,
+                  gateway_concurrency: int, blocking: bool = False) -> List[Dict[str, Any]]:
+    """Start a stub Flowise and the gateway, then measure each client concurrency level"""
+    stub = StubFlowiseApp(latency=latency)
+    results = []
+    with BackgroundServer(stub) as flowise:
+        os.environ["FLOWISE_BASE_URL"] = flowise.url
+        os.environ["FLOWISE_GATEWAY_FLOWS_CONCURRENCY"] = str(gateway_concurrency)
+        app = load_gateway_module().create_app()
+
+        with BackgroundServer(app) as server:
+            manager = app.state.gateway.flowise_manager
+            if manager is None or not manager.flows:
+                raise RuntimeError("Gateway started without a flowise manager or flows")
+            if blocking:
+                use_blocking_manager(manager)
+            flow_name = next(iter(manager.flows))
+
+            for clients in concurrency_levels:
+                stub.reset_stats()
+                result = asyncio.run(_drive(server.url, flow_name, clients, requests_per_client))
+                result["upstream_max_in_flight"] = stub.max_in_flight
+                results.append(result)
+    return results
+
+
+def main():
+    """CLI interface for the gateway load benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the Flowise gateway against a stub Flowise server")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64],
+                       help="Concurrent client counts to measure")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub prediction latency in seconds")
+    parser.add_argument("--requests-per-client", type=int, default=5, help="Sequential requests per client")
+    parser.add_argument("--gateway-concurrency", type=int, default=32,
+                       help="Gateway per-endpoint concurrency limit for /api/v1/flows")
+    parser.add_argument("--compare-blocking", action="store_true",
+                       help="Also measure the old blocking (synchronous manager) execution path")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    modes = [("async", False)] + ([("blocking", True)] if args.compare_blocking else [])
+    for mode, blocking in modes:
+        results = run_benchmark(args.clients, args.latency, args.requests_per_client,
+                                args.gateway_concurrency, blocking)
+        print(f"📊 Gateway ({mode} path), stub latency {args.latency * 1000:.0f} ms, "
+              f"limit {args.gateway_concurrency} in flight")
+        baseline = results[0]["throughput"]
+        for r in results:
+            print(f"   👥 {r['clients']:>3} clients: {r['throughput']:7.1f} req/s "
+                  f"({r['throughput'] / baseline:4.1f}x)  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+                  f"upstream peak {r['upstream_max_in_flight']:>3}  failures {r['failures']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Gateway Workers Benchmark
+Serves the gateway with 1..N worker processes against a stub Flowise and reports requests/sec, latency, startup and memory
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.stub_flowise import free_port
+
+ROOT = Path(__file__).parent.parent
+QUESTIONS = [
+    "Analyze this CSV of quarterly sales",
+    "Tell me a faith story about hope",
+    "Help me structure my creative vision",
+    "Research the history of the flywheel pattern",
+]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, path: str = "/", timeout: float = 60.0) -> float:
+    """Seconds until the server answers GET path"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode}")
+        try:
+            if httpx.get(url + path, timeout=1.0).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"{url} did not start within {timeout:.0f}s")
+
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _pss_mb(pids: List[int]) -> Optional[float]:
+    """Proportional set size of the processes in MB (pages shared copy-on-write are split between them)"""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+        except (OSError, StopIteration):
+            return None
+    return total / 1024
+
+
+async def _drive(url: str, clients: int, duration: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    failures = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        async def worker(worker_id: int):
+            nonlocal failures
+            i = 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/v1/route", json={
+                        "question": f"{QUESTIONS[i % len(QUESTIONS)]} ({worker_id}-{i})",
+                        "session_id": f"bench-{worker_id}"
+                    })
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                failures += not ok
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000 if ordered else 0.0,
+    }
+
+
+def run_benchmark(worker_counts: List[int], clients: int, duration: float, latency: float) -> List[Dict[str, Any]]:
+    """Start one stub Flowise, then the gateway once per worker count, and load each for duration seconds"""
+    stub_port = free_port()
+    stub = subprocess.Popen(
+        [sys.executable, str(ROOT / "benchmarks" / "stub_flowise.py"), "--port", str(stub_port),
+         "--latency", str(latency)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    results = []
+    try:
+        _wait_ready(stub_url, stub, "/api/v1/ping")
+        for workers in worker_counts:
+            port = free_port()
+            url = f"http://127.0.0.1:{port}"
+            env = dict(os.environ, FLOWISE_GATEWAY_ROUTE_CONCURRENCY=str(max(32, clients)))
+            with tempfile.TemporaryDirectory(prefix="gateway-bench-") as state_dir:
+                gateway = subprocess.Popen(
+                    [sys.executable, str(ROOT / "flowise-gateway.py"), "--host", "127.0.0.1", "--port", str(port),
+                     "--workers", str(workers), "--flowise-url", stub_url, "--log-level", "warning",
+                     "--state-dir", state_dir],
+                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                try:
+                    startup = _wait_ready(url, gateway)
+                    asyncio.run(_drive(url, clients, min(1.0, duration)))  # warm every worker's pool
+                    result = asyncio.run(_drive(url, clients, duration))
+                    pids = [gateway.pid] + _children(gateway.pid)
+                    result.update(workers=workers, startup_s=startup, pss_mb=_pss_mb(pids),
+                                  reported_workers=httpx.get(url + "/api/v1/gateway/workers").json()["count"])
+                    results.append(result)
+                finally:
+                    gateway.send_signal(signal.SIGTERM)
+                    try:
+                        gateway.wait(timeout=15)
+                    except subprocess.TimeoutExpired:
+                        gateway.kill()
+    finally:
+        stub.terminate()
+        stub.wait(timeout=10)
+    return results
+
+
+def main():
+    """CLI interface for the gateway workers benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure gateway throughput with 1..N worker processes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to measure")
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per worker count")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub prediction latency in seconds")
+
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = run_benchmark(args.workers, args.clients, args.duration, args.latency)
+
+    print(f"📊 POST /api/v1/route, {args.clients} clients for {args.duration:.0f}s each, "
+          f"stub {args.latency * 1000:.0f} ms, {os.cpu_count()} CPUs")
+    baseline = results[0]["rps"] if results else 0.0
+    for r in results:
+        memory = f"{r['pss_mb']:6.1f} MB PSS" if r["pss_mb"] is not None else "PSS n/a"
+        print(f"   {r['workers']:>2} workers ({r['reported_workers']} reporting): {r['rps']:7.1f} req/s "
+              f"(x{r['rps'] / baseline:.2f})  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+              f"startup {r['startup_s']:.2f}s  {memory}  failures {r['failures']}")
+
+
+if __name__ == "__main__":
+    main()
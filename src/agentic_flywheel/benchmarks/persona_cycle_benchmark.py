@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Persona Cycle Benchmark
+Runs full flywheel cycles against a simulated-latency persona backend and compares sequential and concurrent phases
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from persona_system import FlywheelPersonaOrchestrator, PersonaType
+
+DEFAULT_LATENCIES = {
+    PersonaType.STRUCTURAL_DIAGNOSTICIAN.value: 0.30,
+    PersonaType.NARRATIVE_ALCHEMIST.value: 0.20,
+    PersonaType.CEREMONIAL_RESEARCHER.value: 0.25,
+    PersonaType.CREATIVE_ARCHITECT.value: 0.15,
+}
+
+
+class SimulatedPersonaBackend:
+    """Stands in for the orchestrator's backend_manager: each persona query sleeps for that persona's latency
+
+    serial=True admits one query at a time, which reproduces awaiting the personas one after another.
+    """
+
+    def __init__(self, latencies: Dict[str, float], jitter: float = 0.0, serial: bool = False,
+                 seed: Optional[int] = None):
+        self.latencies = latencies
+        self.jitter = jitter
+        self.serial = serial
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def query_flow(self, prompt: str, persona: str) -> Dict[str, Any]:
+        if self.serial:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                return await self._answer(prompt, persona)
+        return await self._answer(prompt, persona)
+
+    async def _answer(self, prompt: str, persona: str) -> Dict[str, Any]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latencies[persona] + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        return {"text": f"Simulated {persona} analysis of a {len(prompt)} character prompt"}
+
+
+async def _run_cycles(orchestrator: FlywheelPersonaOrchestrator, cycles: int) -> List[float]:
+    durations = []
+    query = "How can our team turn scattered research notes into a living knowledge practice?"
+    for cycle in range(1, cycles + 1):
+        started = time.perf_counter()
+        result = await orchestrator.execute_flywheel_cycle(query, cycle_number=cycle)
+        durations.append(time.perf_counter() - started)
+        query = result.next_cycle_input
+    return durations
+
+
+def run_benchmark(cycles: int, latencies: Dict[str, float], jitter: float,
+                  stalled_persona: Optional[str], stall_latency: float, timeout: float) -> List[Dict[str, Any]]:
+    """Time full cycles with sequential phases, concurrent phases and concurrent phases with one stalled persona"""
+    stalled = dict(latencies)
+    if stalled_persona:
+        stalled[stalled_persona] = stall_latency
+    modes = [
+        ("sequential phases", SimulatedPersonaBackend(latencies, jitter, serial=True, seed=7), None),
+        ("concurrent phases", SimulatedPersonaBackend(latencies, jitter, seed=7), None),
+    ]
+    if stalled_persona:
+        modes.append((f"concurrent, {stalled_persona} stalls ({timeout:.1f}s timeout)",
+                      SimulatedPersonaBackend(stalled, jitter, seed=7), timeout))
+
+    results = []
+    for mode, backend, persona_timeout in modes:
+        orchestrator = FlywheelPersonaOrchestrator(backend, persona_timeout=persona_timeout)
+        durations = asyncio.run(_run_cycles(orchestrator, cycles))
+        results.append({
+            "mode": mode,
+            "mean_s": statistics.mean(durations),
+            "max_s": max(durations),
+            "calls": backend.calls,
+            "cancelled": backend.cancelled,
+            "max_in_flight": backend.max_in_flight,
+        })
+    return results
+
+
+def main():
+    """CLI interface for the persona cycle benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark flywheel cycles against a simulated-latency backend")
+    parser.add_argument("--cycles", type=int, default=5, help="Chained cycles per mode")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the default persona latencies")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency per query, up to this many seconds")
+    parser.add_argument("--stall", default=PersonaType.CEREMONIAL_RESEARCHER.value,
+                       choices=list(DEFAULT_LATENCIES) + ["none"], help="Persona that stalls in the timeout run")
+    parser.add_argument("--stall-latency", type=float, default=30.0, help="Seconds the stalled persona would take")
+    parser.add_argument("--timeout", type=float, default=0.5, help="Per-persona timeout in the stall run")
+
+    args = parser.parse_args()
+    latencies = {persona: latency * args.scale for persona, latency in DEFAULT_LATENCIES.items()}
+    results = run_benchmark(args.cycles, latencies, args.jitter,
+                            None if args.stall == "none" else args.stall, args.stall_latency, args.timeout)
+
+    # Phase 1 queries all four personas, phase 2 re-runs all but the structural diagnostician
+    enriched = [latency for persona, latency in latencies.items()
+                if persona != PersonaType.STRUCTURAL_DIAGNOSTICIAN.value]
+    described = ", ".join(f"{persona.split('_')[0]} {latency * 1000:.0f} ms" for persona, latency in latencies.items())
+    print(f"📊 {args.cycles} chained cycles per mode; persona latencies {described}")
+    print(f"   Expected per cycle: sum {sum(latencies.values()) + sum(enriched):.2f}s, "
+          f"max per phase {max(latencies.values()) + max(enriched):.2f}s")
+    baseline = results[0]["mean_s"]
+    for r in results:
+        print(f"   {r['mode']:<56} mean {r['mean_s']:6.3f}s (x{baseline / r['mean_s']:.2f})  max {r['max_s']:6.3f}s  "
+              f"{r['calls']} queries, peak {r['max_in_flight']} in flight, {r['cancelled']} cancelled")
+
+
+if __name__ == "__main__":
+    main()
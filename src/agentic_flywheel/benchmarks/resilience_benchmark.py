@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Resilience Benchmark
+Drives predictions through the Flowise client against a fault-injecting stub and compares success rate and tail latency
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agentic_flywheel.flowise_client import FlowiseClient, FlowiseClientError
+from agentic_flywheel.resilience import ResiliencePolicy
+from benchmarks.stub_flowise import StubFlowiseApp, BackgroundServer
+
+MODES = {
+    "single attempt": None,
+    "retries": ResiliencePolicy(backoff_base=0.05, min_timeout=0.5),
+    "retries + hedging": ResiliencePolicy(backoff_base=0.05, min_timeout=0.5, hedge=True),
+}
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[int(q * (len(ordered) - 1))] * 1000 if ordered else 0.0
+
+
+async def _drive(client: FlowiseClient, flow_id: str, requests: int, concurrency: int,
+                 timeout: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await client.predict(flow_id, {"question": f"resilience {i}"}, timeout=timeout)
+                latencies.append(time.perf_counter() - started)
+            except FlowiseClientError:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    ordered = sorted(latencies)
+    return {
+        "requests": requests,
+        "failures": failures,
+        "seconds": elapsed,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p95_ms": _quantile(ordered, 0.95),
+        "p99_ms": _quantile(ordered, 0.99),
+    }
+
+
+def run_benchmark(requests: int, concurrency: int, latency: float, error_rate: float, slow_rate: float,
+                  slow_latency: float, timeout: float, modes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """One run per mode against the same faulty stub, plus a circuit breaker run against an always-failing flow"""
+    results = []
+    stub = StubFlowiseApp(latency=latency, error_rate=error_rate, slow_rate=slow_rate,
+                          slow_latency=slow_latency, failing_flows=["broken-flow"], seed=42)
+    with BackgroundServer(stub) as server:
+        for mode in modes or list(MODES):
+            stub.reset_stats()
+            client = FlowiseClient(server.url, resilience=MODES[mode])
+            result = asyncio.run(_drive(client, "stub-flow", requests, concurrency, timeout))
+            result.update(mode=mode, upstream=stub.get_stats()["requests"])
+            if client.resilience:
+                stats = client.resilience.get_stats()
+                result.update(retries=stats.get("retries", 0), hedges=stats.get("hedges", 0),
+                              hedge_wins=stats.get("hedge_wins", 0), timeouts=stats.get("timeouts", 0))
+            results.append(result)
+
+        stub.reset_stats()
+        client = FlowiseClient(server.url, resilience=MODES["retries"])
+        result = asyncio.run(_drive(client, "broken-flow", requests, concurrency, timeout))
+        stats = client.resilience.get_stats()
+        result.update(mode="circuit breaker (failing flow)", upstream=stub.get_stats()["requests"],
+                      rejected=stats.get("rejected", 0))
+        results.append(result)
+    return results
+
+
+def main():
+    """CLI interface for the resilience benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark retries, hedging and circuit breaking against faults")
+    parser.add_argument("--requests", type=int, default=400, help="Predictions per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Predictions in flight at once")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub seconds per prediction")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Share of stub predictions that fail")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Share of stub predictions that are slow")
+    parser.add_argument("--slow-latency", type=float, default=1.5, help="Seconds a slow stub prediction takes")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Caller timeout per prediction")
+    parser.add_argument("--mode", action="append", choices=list(MODES), help="Only run these modes")
+
+    args = parser.parse_args()
+    logging.getLogger("agentic_flywheel").setLevel(logging.ERROR)
+    results = run_benchmark(args.requests, args.concurrency, args.latency, args.error_rate,
+                            args.slow_rate, args.slow_latency, args.timeout, args.mode)
+
+    print(f"📊 {args.requests} predictions per mode, {args.concurrency} in flight, stub {args.latency * 1000:.0f} ms, "
+          f"{args.error_rate:.0%} errors, {args.slow_rate:.0%} slow ({args.slow_latency:.1f}s)")
+    for r in results:
+        success = 1 - r["failures"] / r["requests"]
+        extra = ""
+        if "rejected" in r:
+            extra = f", {r['rejected']} failed fast"
+        elif "retries" in r:
+            extra = f", {r['retries']} retries, {r['hedges']} hedges ({r['hedge_wins']} won), {r['timeouts']} timeouts"
+        print(f"   {r['mode']:<32} success {success:6.1%}  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+              f"p99 {r['p99_ms']:7.1f} ms  upstream {r['upstream']}{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Session Metrics Benchmark
+Compares the row-by-row session duration/turn statistics with the columnar (julianday + NumPy) path
+"""
+
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from flowise_admin.db_interface import FlowiseDBInterface
+from flowise_admin import session_metrics
+from benchmarks.synthetic_db import generate_database
+
+# Every session in the database, not just one flow, so the run covers 100k+ sessions
+LEGACY_SESSION_QUERY = """
+SELECT sessionId, COUNT(*) as message_count,
+       MIN(createdDate) as start_time,
+       MAX(createdDate) as end_time
+FROM chat_message
+WHERE sessionId IS NOT NULL
+GROUP BY chatflowid, sessionId
+"""
+
+COLUMNAR_SESSION_QUERY = session_metrics.SESSION_COLUMNS_QUERY.replace(
+    "WHERE chatflowid = ? AND sessionId IS NOT NULL\nGROUP BY sessionId",
+    "WHERE sessionId IS NOT NULL\nGROUP BY chatflowid, sessionId"
+)
+
+
+def _legacy_statistics(session_data):
+    """The per-row path FlowAnalyzer used before the columnar metrics"""
+    session_lengths = [s['message_count'] for s in session_data]
+    distribution = {
+        'short_sessions': len([s for s in session_lengths if s <= 2]),
+        'medium_sessions': len([s for s in session_lengths if 3 <= s <= 10]),
+        'long_sessions': len([s for s in session_lengths if s > 10])
+    }
+    durations_minutes = []
+    for session in session_data:
+        if session['message_count'] <= 1:
+            continue
+        start = datetime.fromisoformat(session['start_time'].replace('Z', '+00:00'))
+        end = datetime.fromisoformat(session['end_time'].replace('Z', '+00:00'))
+        durations_minutes.append((end - start).total_seconds() / 60)
+    return distribution, {
+        'mean': statistics.mean(durations_minutes),
+        'median': statistics.median(durations_minutes),
+        'max': max(durations_minutes),
+    }
+
+
+def _columnar_statistics(columns):
+    durations = session_metrics.multi_turn_durations(columns)
+    return (
+        session_metrics.turn_length_distribution(columns),
+        session_metrics.summarize(durations, session_metrics.DURATION_BIN_EDGES),
+        session_metrics.summarize(columns.turns, session_metrics.TURN_BIN_EDGES),
+    )
+
+
+def _time(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_benchmark(database: str, repeat: int = 3) -> dict:
+    """Time both paths end to end (query + statistics) and the statistics step alone"""
+    db = FlowiseDBInterface(database)
+
+    legacy_rows = db._execute_query(LEGACY_SESSION_QUERY)
+    columns = session_metrics.load_session_columns(db._stream_query(COLUMNAR_SESSION_QUERY))
+
+    legacy_compute, (legacy_distribution, legacy_durations) = _time(lambda: _legacy_statistics(legacy_rows), repeat)
+    columnar_compute, (distribution, durations, _) = _time(lambda: _columnar_statistics(columns), repeat)
+
+    legacy_total, _ = _time(lambda: _legacy_statistics(db._execute_query(LEGACY_SESSION_QUERY)), repeat)
+    columnar_total, _ = _time(lambda: _columnar_statistics(
+        session_metrics.load_session_columns(db._stream_query(COLUMNAR_SESSION_QUERY))
+    ), repeat)
+
+    agree = (
+        legacy_distribution == distribution
+        and abs(legacy_durations['mean'] - durations['mean']) < 1e-6
+        and abs(legacy_durations['median'] - durations['median']) < 1e-6
+        and abs(legacy_durations['max'] - durations['max']) < 1e-6
+    )
+
+    return {
+        "sessions": len(columns),
+        "numpy": session_metrics.NUMPY_AVAILABLE,
+        "legacy_compute_seconds": legacy_compute,
+        "columnar_compute_seconds": columnar_compute,
+        "legacy_total_seconds": legacy_total,
+        "columnar_total_seconds": columnar_total,
+        "compute_speedup": legacy_compute / columnar_compute if columnar_compute else float("inf"),
+        "total_speedup": legacy_total / columnar_total if columnar_total else float("inf"),
+        "results_agree": agree,
+        "duration_p90": durations.get('p90'),
+        "duration_p99": durations.get('p99'),
+    }
+
+
+def main():
+    """CLI interface for the session metrics benchmark"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark columnar session statistics")
+    parser.add_argument("--database", help="Existing database to benchmark (default: generate a synthetic one)")
+    parser.add_argument("--messages", type=int, default=600_000, help="Synthetic database size (~4.5 messages/session)")
+    parser.add_argument("--flows", type=int, default=60, help="Synthetic chatflow count")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best time is reported)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = args.database
+        if not database:
+            database = str(generate_database(Path(tmp) / "database.sqlite", args.messages, args.flows))
+            print(f"🧪 Generated synthetic database: {args.messages:,} messages, {args.flows} flows")
+
+        result = run_benchmark(database, args.repeat)
+
+    backend = "NumPy" if result["numpy"] else "pure Python fallback"
+    print(f"📊 Sessions: {result['sessions']:,} ({backend})")
+    print(f"   🐢 Row-by-row statistics: {result['legacy_compute_seconds'] * 1000:.1f} ms "
+          f"({result['legacy_total_seconds'] * 1000:.1f} ms with query)")
+    print(f"   🚀 Columnar statistics:   {result['columnar_compute_seconds'] * 1000:.1f} ms "
+          f"({result['columnar_total_seconds'] * 1000:.1f} ms with query)")
+    print(f"   ⚡ Speedup: {result['compute_speedup']:.1f}x statistics, {result['total_speedup']:.1f}x end to end")
+    print(f"   ⏱️ Session duration p90 {result['duration_p90']:.1f} min, p99 {result['duration_p99']:.1f} min")
+    if not result["results_agree"]:
+        print("❌ Columnar and row-by-row statistics differ")
+        sys.exit(1)
+    print("✅ Both paths agree on distribution, mean, median and max")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Stub Flowise Server
+A minimal ASGI stand-in for the Flowise prediction API with configurable latency and injected faults, for load tests
+"""
+
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+
+import uvicorn
+
+
+class StubFlowiseApp:
+    """Answers /api/v1/prediction/{flow_id} after a fixed (optionally jittered) delay
+
+    Requests with "streaming": true get Flowise-style SSE: the first token after the
+    latency, then one token every token_delay seconds.
+
+    Faults: a share of predictions (error_rate) answer error_status, another share
+    (slow_rate) takes slow_latency instead of latency, and failing_flows always error.
+    missing_flows are unknown to the chatflow lookups used by health probes.
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, token_delay: float = 0.02,
+                 error_rate: float = 0.0, error_status: int = 503, slow_rate: float = 0.0,
+                 slow_latency: float = 2.0, failing_flows: Iterable[str] = (), missing_flows: Iterable[str] = (),
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.failing_flows = set(failing_flows)
+        self.missing_flows = set(missing_flows)
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.metadata_requests = 0
+        self.errors = 0
+        self.slow = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.metadata_requests = 0
+        self.errors = 0
+        self.slow = 0
+        self.max_in_flight = self.in_flight
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "metadata_requests": self.metadata_requests,
+                "errors": self.errors, "slow": self.slow,
+                "in_flight": self.in_flight, "max_in_flight": self.max_in_flight}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        path = scope["path"]
+        if scope["method"] == "POST" and path.startswith("/api/v1/prediction/"):
+            await self._predict(path.rsplit("/", 1)[-1], body, send)
+        elif path == "/api/v1/ping":
+            self.metadata_requests += 1
+            await self._respond(send, 200, "pong")
+        elif path == "/api/v1/chatflows":
+            await self._respond(send, 200, [{"id": "stub-flow", "name": "Stub Flow"}])
+        elif path.startswith(("/api/v1/chatflows/", "/api/v1/chatflows-streaming/")):
+            self.metadata_requests += 1
+            flow_id = path.rsplit("/", 1)[-1]
+            if flow_id in self.missing_flows:
+                await self._respond(send, 404, {"error": f"Chatflow {flow_id} not found"})
+            elif path.startswith("/api/v1/chatflows-streaming/"):
+                await self._respond(send, 200, {"isStreaming": True})
+            else:
+                await self._respond(send, 200, {"id": flow_id, "name": flow_id, "deployed": True})
+        elif path == "/api/v1/stub/stats":
+            await self._respond(send, 200, self.get_stats())
+        else:
+            await self._respond(send, 404, {"error": f"Not found: {path}"})
+
+    async def _predict(self, flow_id: str, body: bytes, send) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            payload = json.loads(body or b"{}")
+            slow = self.slow_rate and self.rng.random() < self.slow_rate
+            self.slow += bool(slow)
+            delay = (self.slow_latency if slow else self.latency) + \
+                (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            await asyncio.sleep(delay)
+            if flow_id in self.missing_flows:
+                self.errors += 1
+                await self._respond(send, 404, {"error": f"Chatflow {flow_id} not found"})
+                return
+            if flow_id in self.failing_flows or (self.error_rate and self.rng.random() < self.error_rate):
+                self.errors += 1
+                await self._respond(send, self.error_status, {"error": f"injected fault for {flow_id}"})
+                return
+            session_id = payload.get("overrideConfig", {}).get("sessionId")
+            answer = f"stub answer to: {payload.get('question', '')}"
+            if payload.get("streaming"):
+                await self._stream(send, answer, flow_id, session_id)
+                return
+            await self._respond(send, 200, {
+                "text": answer,
+                "question": payload.get("question"),
+                "chatflowid": flow_id,
+                "sessionId": session_id,
+                "chatId": session_id
+            })
+        finally:
+            self.in_flight -= 1
+
+    async def _stream(self, send, answer: str, flow_id: str, session_id: Optional[str]) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")]
+        })
+
+        async def event(name: str, data: Any) -> None:
+            frame = f"message:\ndata: {json.dumps({'event': name, 'data': data})}\n\n"
+            await send({"type": "http.response.body", "body": frame.encode(), "more_body": True})
+
+        await event("start", "")
+        for i, word in enumerate(answer.split(" ")):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            await event("token", word if i == 0 else " " + word)
+        await event("metadata", {"chatflowid": flow_id, "sessionId": session_id, "chatId": session_id})
+        await event("end", "[DONE]")
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _respond(send, status: int, document: Any) -> None:
+        data = json.dumps(document).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())]
+        })
+        await send({"type": "http.response.body", "body": data})
+
+
+def free_port() -> int:
+    """A localhost port nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BackgroundServer:
+    """Runs an ASGI app under uvicorn on a daemon thread (context manager)"""
+
+    def __init__(self, app, port: Optional[int] = None, host: str = "127.0.0.1"):
+        self.app = app
+        self.host = host
+        self.port = port or free_port()
+        self.server = uvicorn.Server(uvicorn.Config(
+            app, host=host, port=self.port, log_level="warning", lifespan="on", access_log=False
+        ))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "BackgroundServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"Server on port {self.port} failed to start")
+            time.sleep(0.02)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+    def __enter__(self) -> "BackgroundServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    """CLI interface: serve a stub Flowise on a port"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stub Flowise prediction server for load tests")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=3222, help="Port to bind to")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds each prediction takes")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of predictions that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected failures")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of predictions that are slow")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="Seconds a slow prediction takes")
+    parser.add_argument("--failing-flow", action="append", default=[], help="Flow id that always fails (repeatable)")
+
+    args = parser.parse_args()
+    print(f"🧪 Stub Flowise on http://{args.host}:{args.port} ({args.latency * 1000:.0f} ms per prediction)")
+    if args.error_rate or args.slow_rate or args.failing_flow:
+        print(f"   💥 Faults: {args.error_rate:.0%} errors ({args.error_status}), "
+              f"{args.slow_rate:.0%} slow ({args.slow_latency:.1f}s), failing flows: {args.failing_flow or 'none'}")
+    uvicorn.run(StubFlowiseApp(args.latency, args.jitter, args.token_delay, args.error_rate, args.error_status,
+                               args.slow_rate, args.slow_latency, args.failing_flow),
+                host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Synthetic Flowise Database Generator
+Builds a chat_message table with Flowise's SQLite schema for admin-layer benchmarks
+"""
+
+import random
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Mirrors packages/server/src/database/migrations/sqlite (chat_message after AddFollowUpPrompts)
+CHAT_MESSAGE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "chat_message" (
+    "id" varchar PRIMARY KEY NOT NULL,
+    "role" varchar NOT NULL,
+    "chatflowid" varchar NOT NULL,
+    "content" text NOT NULL,
+    "sourceDocuments" varchar,
+    "createdDate" datetime NOT NULL DEFAULT (datetime('now')),
+    "chatType" VARCHAR NOT NULL DEFAULT 'INTERNAL',
+    "chatId" VARCHAR NOT NULL,
+    "memoryType" VARCHAR,
+    "sessionId" VARCHAR,
+    "usedTools" text,
+    "fileAnnotations" text,
+    "fileUploads" text,
+    "leadEmail" text,
+    "agentReasoning" text,
+    "action" text,
+    "artifacts" text,
+    "followUpPrompts" text
+);
+CREATE INDEX IF NOT EXISTS "IDX_e574527322272fd838f4f0f3d3" ON "chat_message" ("chatflowid");
+"""
+
+VOCABULARY = [
+    "vision", "goal", "dream", "outcome", "achieve", "tension", "desired", "story",
+    "experience", "journey", "faith", "meaning", "implement", "code", "build", "debug",
+    "error", "fix", "create", "develop", "structural", "current reality", "research",
+    "the", "a", "we", "want", "to", "how", "can", "with", "and", "this", "our", "next",
+    "unclear", "confused", "plan", "advancement", "purpose", "grace", "path"
+]
+
+KNOWN_FLOW_IDS = [
+    "7d405a51-968d-4467-9ae6-d49bf182cdf9",
+    "896f7eed-342e-4596-9429-6fb9b5fbd91b",
+    "2f4dd89f-af8a-4606-bba7-219f32ade711",
+    "aad975b2-289f-4acc-acc0-f19f4cfcb013",
+]
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words)))
+
+
+def generate_database(path: str,
+                      messages: int = 200_000,
+                      flows: int = 60,
+                      seed: int = 42,
+                      days: int = 180,
+                      batch_size: int = 10_000) -> Path:
+    """Create (or replace) a synthetic Flowise database with roughly `messages` rows"""
+    db_path = Path(path)
+    if db_path.exists():
+        db_path.unlink()
+
+    rng = random.Random(seed)
+    flow_ids = (KNOWN_FLOW_IDS + [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(flows)])[:flows]
+    # Skewed popularity so a few flows dominate, as in real usage
+    weights = [1.0 / (rank + 1) for rank in range(len(flow_ids))]
+    start = datetime.now() - timedelta(days=days)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(CHAT_MESSAGE_SCHEMA)
+        batch = []
+        written = 0
+        while written < messages:
+            flow_id = rng.choices(flow_ids, weights)[0]
+            session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            turns = min(int(rng.expovariate(1 / 4.0)) + 1, 60)
+            created = start + timedelta(seconds=rng.randint(0, days * 86400))
+            for turn in range(turns):
+                role = "userMessage" if turn % 2 == 0 else "apiMessage"
+                content = _sentence(rng, 3, 25) if role == "userMessage" else _sentence(rng, 20, 120)
+                batch.append((
+                    str(uuid.UUID(int=rng.getrandbits(128))),
+                    role,
+                    flow_id,
+                    content,
+                    created.strftime("%Y-%m-%d %H:%M:%S"),
+                    session_id,
+                    session_id,
+                ))
+                created += timedelta(seconds=rng.randint(5, 600))
+                written += 1
+            if len(batch) >= batch_size or written >= messages:
+                conn.executemany(
+                    'INSERT INTO chat_message (id, role, chatflowid, content, createdDate, sessionId, chatId) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    batch
+                )
+                batch = []
+        conn.commit()
+
+    return db_path
+
+
+def main():
+    """CLI interface for synthetic database generation"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic Flowise database")
+    parser.add_argument("path", help="Output database path")
+    parser.add_argument("--messages", type=int, default=200_000, help="Approximate number of chat messages")
+    parser.add_argument("--flows", type=int, default=60, help="Number of chatflows")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    args = parser.parse_args()
+
+    db_path = generate_database(args.path, args.messages, args.flows, args.seed)
+    print(f"✅ Synthetic database written to {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -80,6 +80,40 @@ def cycle(query, session_id, context, output):
     asyncio.run(run_cycle())
 
 
+@cli.command()
+@click.argument('queries', nargs=-1, required=True)
+@click.option('--cycles', default=3, help='Chained cycles per query')
+@click.option('--concurrency', default=4, help='Cycles in flight across all queries')
+@click.option('--output-dir', default='flywheel-runs', help='Directory for the per-session JSON lines files')
+@click.option('--retain', default=10, help='Cycle summaries kept in memory per session')
+def cycles(queries, cycles, concurrency, output_dir, retain):
+    """Run chained flywheel cycles for several queries concurrently, streaming results to disk."""
+    
+    async def run_cycles():
+        flywheel = AgenticFlywheel()
+        click.echo(f"🔄 Running {cycles} cycles for {len(queries)} queries ({concurrency} in flight)")
+        click.echo("=" * 60)
+        
+        runner = await flywheel.run_cycles(
+            list(queries), cycles=cycles, output_dir=output_dir,
+            max_concurrent_cycles=concurrency, retain_cycles=retain
+        )
+        
+        for session_id, history in runner.summaries.items():
+            last = history[-1]
+            click.echo(f"✅ {session_id}: {len(history)} cycles, last took {last.duration_s:.2f}s")
+            click.echo(f"   Key Themes: {last.key_themes}")
+            click.echo(f"   💾 {last.output_path}")
+        for session_id, error in runner.errors.items():
+            click.echo(f"❌ {session_id}: {error}", err=True)
+        
+        stats = runner.get_stats()
+        click.echo(f"\n📊 {stats['cycles']} cycles, peak {stats['max_in_flight']} in flight, "
+                   f"{stats['bytes_written']} bytes written")
+    
+    asyncio.run(run_cycles())
+
+
 @cli.command() 
 def personas():
     """List all available personas with their descriptions."""
@@ -10,21 +10,41 @@ __email__ = "jgwill@jgwill.com"
 
 # Import admin modules
 from .db_interface import FlowiseDBInterface, ChatMessage, FlowStats, ConversationPattern
+from .connection import ConnectionManager, get_connection_manager
+from .snapshot import AnalysisSnapshot, SnapshotCache
+from .incremental import IncrementalAnalytics
+from .search_index import ConversationSearchIndex
+from .exporter import StreamingExporter
+from .pattern_matcher import ConversationPatternMatcher, KeywordMatcher, PatternDefinition, PATTERN_DEFINITIONS
 try:
     from .flow_analyzer import FlowAnalyzer, FlowPerformanceReport
     from .config_sync import ConfigurationSync
+    from .index_advisor import IndexAdvisor
 except ImportError:
     # Handle missing dependencies gracefully
     FlowAnalyzer = None
     FlowPerformanceReport = None
     ConfigurationSync = None
+    IndexAdvisor = None
 
 __all__ = [
     "FlowiseDBInterface", 
     "ChatMessage", 
     "FlowStats", 
     "ConversationPattern",
+    "ConnectionManager",
+    "get_connection_manager",
+    "AnalysisSnapshot",
+    "SnapshotCache",
+    "IncrementalAnalytics",
+    "ConversationSearchIndex",
+    "StreamingExporter",
+    "ConversationPatternMatcher",
+    "KeywordMatcher",
+    "PatternDefinition",
+    "PATTERN_DEFINITIONS",
     "FlowAnalyzer",
     "FlowPerformanceReport", 
-    "ConfigurationSync"
+    "ConfigurationSync",
+    "IndexAdvisor"
 ]
\ No newline at end of file
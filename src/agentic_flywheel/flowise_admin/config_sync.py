@@ -30,6 +30,13 @@ except ImportError:
     FlowiseManager = None
     FlowConfig = None
 
+# Shared registry service (parse once, hot reload); plain YAML I/O when unavailable
+try:
+    from agentic_flywheel.flow_registry import get_flow_registry, write_registry
+except ImportError:
+    get_flow_registry = None
+    write_registry = None
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -49,18 +56,20 @@ class ConfigurationSync:
     
     def __init__(self, 
                  database_path: str = "/home/jgi/.flowise/database.sqlite",
-                 config_base_path: str = "/a/src/api/flowise"):
-        self.db = FlowiseDBInterface(database_path)
-        self.analyzer = FlowAnalyzer(database_path)
+                 config_base_path: str = "/a/src/api/flowise",
+                 db: Optional[FlowiseDBInterface] = None,
+                 analyzer: Optional[FlowAnalyzer] = None):
+        self.db = db or FlowiseDBInterface(database_path)
+        self.analyzer = analyzer or FlowAnalyzer(database_path, db=self.db)
         self.config_base_path = Path(config_base_path)
         
         # Configuration file paths
         self.flow_registry_path = self.config_base_path / "flow-registry.yaml"
         self.global_config_path = self.config_base_path / "global-config-template.yaml"
         
-        # Initialize flowise manager for live integration
-        self.flow_manager = None
-        if FlowiseManager:
+        # Initialize flowise manager for live integration (shared with the db interface when it has one)
+        self.flow_manager = self.db.flow_manager
+        if self.flow_manager is None and FlowiseManager:
             try:
                 self.flow_manager = FlowiseManager()
                 logger.info("✅ Connected to live FlowiseManager for sync")
@@ -71,7 +80,8 @@ class ConfigurationSync:
         """Discover actively used flows from database analysis"""
         logger.info("🔍 Discovering active flows from database...")
         
-        flow_stats = self.db.get_flow_statistics()
+        snapshot = self.db.get_analysis_snapshot()
+        flow_stats = snapshot.flow_stats
         
         # Filter for meaningful flows (enough usage to be worth configuring)
         active_flows = {}
@@ -79,7 +89,7 @@ class ConfigurationSync:
         for stat in flow_stats:
             if stat.message_count >= 10:  # Minimum threshold
                 # Get patterns for this flow
-                patterns = self.db.extract_conversation_patterns(stat.chatflow_id)
+                patterns = snapshot.patterns_for(stat.chatflow_id)
                 
                 # Extract keywords from patterns
                 keywords = set()
@@ -225,6 +235,8 @@ class ConfigurationSync:
     def _load_flow_registry(self) -> Dict[str, Any]:
         """Load current flow registry configuration"""
         try:
+            if get_flow_registry and self.flow_registry_path.exists():
+                return get_flow_registry(self.flow_registry_path).current().to_dict()
             with open(self.flow_registry_path, 'r') as f:
                 return yaml.safe_load(f) or {}
         except FileNotFoundError:
@@ -248,6 +260,9 @@ class ConfigurationSync:
         registry['metadata']['updated'] = datetime.now().isoformat()
         registry['metadata']['auto_sync'] = True
         
+        if write_registry:
+            write_registry(self.flow_registry_path, registry)
+            return
         with open(self.flow_registry_path, 'w') as f:
             yaml.dump(registry, f, default_flow_style=False, sort_keys=False)
     
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Connection Manager - Admin Layer
+Persistent, per-thread read-only SQLite connections shared by all admin components
+"""
+
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+DEFAULT_CACHE_SIZE_KB = 64 * 1024      # negative cache_size pragma = KiB
+DEFAULT_STATEMENT_CACHE = 256          # prepared statements kept per connection
+DEFAULT_FETCH_SIZE = 1000
+
+
+class ConnectionManager:
+    """Hands out one read-only, WAL-aware connection per thread for a flowise database"""
+
+    def __init__(self,
+                 database_path: str,
+                 mmap_size: int = DEFAULT_MMAP_SIZE,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+                 statement_cache_size: int = DEFAULT_STATEMENT_CACHE):
+        self.database_path = Path(database_path)
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.statement_cache_size = statement_cache_size
+        self.journal_mode: Optional[str] = None
+        self._trace_callback: Optional[Callable[[str], None]] = None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a read-only connection, falling back to query_only when the URI form is refused"""
+        uri = f"{self.database_path.resolve().as_uri()}?mode=ro"
+        # Each connection is only used by the thread that opened it; check_same_thread is
+        # relaxed solely so close() can release every thread's connection from one place.
+        options = {'cached_statements': self.statement_cache_size, 'check_same_thread': False}
+        try:
+            conn = sqlite3.connect(uri, uri=True, **options)
+            # Touch the schema so WAL/shm permission problems surface here, not mid-query
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1")
+        except sqlite3.OperationalError as e:
+            # A WAL database in a read-only directory cannot create its -shm file in mode=ro
+            logger.warning(f"⚠️ Read-only open failed ({e}), using query_only connection")
+            conn = sqlite3.connect(self.database_path, **options)
+
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.set_trace_callback(self._trace_callback)
+
+        if self.journal_mode is None:
+            self.journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            logger.info(f"✅ Opened {self.database_path} (journal_mode={self.journal_mode})")
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def release(self) -> None:
+        """Close the calling thread's connection, e.g. before a pooled worker thread goes away"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def execute(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Execute a query and return results as list of dictionaries"""
+        cursor = self.connection().execute(query, params)
+        columns = [column[0] for column in cursor.description or ()]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def stream(self, query: str, params: Tuple = (), fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Tuple]:
+        """Yield result rows as plain tuples, fetched in batches of fetch_size"""
+        cursor = self.connection().execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def set_trace_callback(self, callback: Optional[Callable[[str], None]]) -> None:
+        """Trace every statement on current and future connections (None to stop)"""
+        with self._lock:
+            self._trace_callback = callback
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+
+    def close(self) -> None:
+        """Close every connection opened by this manager, across all threads"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __repr__(self) -> str:
+        return f"ConnectionManager(path={self.database_path}, open={len(self._connections)})"
+
+
+_managers: Dict[Path, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(database_path: str) -> ConnectionManager:
+    """Get the shared connection manager for a database file"""
+    key = Path(database_path).resolve()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(str(key))
+            _managers[key] = manager
+        return manager
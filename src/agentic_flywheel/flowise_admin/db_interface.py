@@ -4,17 +4,32 @@ Flowise Database Interface - Admin Layer
 Provides intelligent access to local flowise SQLite databases with full admin capabilities
 """
 
-import sqlite3
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import uuid
+import time
 from pathlib import Path
 import sys
 import os
 
+try:
+    from .connection import ConnectionManager, get_connection_manager
+    from .stats_engine import FlowStatisticsEngine
+    from .snapshot import AnalysisSnapshot, DatabaseGeneration, SnapshotCache, GENERATION_QUERY
+    from .incremental import IncrementalAnalytics
+    from .search_index import ConversationSearchIndex
+    from .pattern_matcher import ConversationPatternMatcher
+except ImportError:
+    from connection import ConnectionManager, get_connection_manager
+    from stats_engine import FlowStatisticsEngine
+    from snapshot import AnalysisSnapshot, DatabaseGeneration, SnapshotCache, GENERATION_QUERY
+    from incremental import IncrementalAnalytics
+    from search_index import ConversationSearchIndex
+    from pattern_matcher import ConversationPatternMatcher
+
 # Import working flowise manager
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 try:
@@ -70,7 +85,8 @@ class ConversationPattern:
 class FlowiseDBInterface:
     """Admin-level interface for accessing flowise SQLite databases with full capabilities"""
     
-    def __init__(self, database_path: str = "/home/jgi/.flowise/database.sqlite"):
+    def __init__(self, database_path: str = "/home/jgi/.flowise/database.sqlite",
+                 connection_manager: Optional[ConnectionManager] = None):
         self.database_path = Path(database_path)
         
         # Initialize flow manager for live integration
@@ -98,23 +114,84 @@ class FlowiseDBInterface:
         
         if not self.database_path.exists():
             raise FileNotFoundError(f"Database not found: {database_path}")
+        
+        # Pooled read-only connections, shared with every other interface on this file
+        self.connections = connection_manager or get_connection_manager(database_path)
+        self.stats_engine = FlowStatisticsEngine(self._execute_query)
+        self.snapshots = SnapshotCache(self._build_analysis_snapshot, self._get_database_generation)
+        self.incremental: Optional[IncrementalAnalytics] = None
+        self.search_index: Optional[ConversationSearchIndex] = None
+        self.pattern_matcher = ConversationPatternMatcher()
             
         logger.info(f"✅ FlowiseDBInterface initialized with database: {database_path}")
     
     def _execute_query(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries"""
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                return [dict(row) for row in cursor.fetchall()]
+            return self.connections.execute(query, params)
         except Exception as e:
             logger.error(f"Database query error: {e}")
             return []
     
+    def _stream_query(self, query: str, params: Tuple = ()) -> Iterator[Tuple]:
+        """Execute a query and yield result rows as tuples without materializing them"""
+        return self.connections.stream(query, params)
+    
+    def enable_incremental(self, sidecar_path: Optional[str] = None) -> IncrementalAnalytics:
+        """Serve aggregates from a sidecar that only folds in new rows on each refresh"""
+        if self.incremental is None:
+            self.incremental = IncrementalAnalytics(self, sidecar_path)
+            self.snapshots.invalidate()
+        return self.incremental
+    
+    def enable_search_index(self, index_path: Optional[str] = None) -> ConversationSearchIndex:
+        """Answer search_conversations from an FTS5 index instead of LIKE scans"""
+        if self.search_index is None:
+            self.search_index = ConversationSearchIndex(self, index_path)
+        return self.search_index
+    
+    def _get_database_generation(self) -> DatabaseGeneration:
+        """Fingerprint chat_message by row count and newest createdDate"""
+        rows = self._execute_query(GENERATION_QUERY)
+        row = rows[0] if rows else {}
+        return DatabaseGeneration(
+            row_count=row.get('row_count') or 0,
+            max_created_date=row.get('max_created_date')
+        )
+    
+    def _build_analysis_snapshot(self, generation: DatabaseGeneration) -> AnalysisSnapshot:
+        """Compute flow statistics and patterns once for the given generation"""
+        flow_stats = self.get_flow_statistics()
+        return AnalysisSnapshot(
+            generation=generation,
+            flow_stats=tuple(flow_stats),
+            conversation_patterns=tuple(self._extract_patterns_from_stats(flow_stats))
+        )
+    
+    def get_analysis_snapshot(self) -> AnalysisSnapshot:
+        """Get the memoized analysis snapshot, recomputed only when chat_message changes"""
+        return self.snapshots.get()
+    
     def get_flow_statistics(self) -> List[FlowStats]:
         """Get comprehensive statistics for all chatflows with enhanced analytics"""
+        stats = []
+        
+        if self.incremental:
+            rows = self.incremental.get_flow_aggregates()
+        else:
+            rows = self.stats_engine.compute_flow_aggregates()
+        
+        for row in rows:
+            stats.append(self._build_flow_stats(
+                row,
+                most_active_session=row['most_active_session'],
+                engagement_score=row['engagement_score']
+            ))
+        
+        return stats
+    
+    def _get_flow_statistics_per_flow(self) -> List[FlowStats]:
+        """Reference implementation issuing two extra queries per flow (kept for benchmarks)"""
         query = """
         SELECT 
             chatflowid,
@@ -135,36 +212,29 @@ class FlowiseDBInterface:
         stats = []
         
         for row in results:
-            # Calculate enhanced metrics
-            avg_msgs = row['message_count'] / max(row['session_count'], 1)
-            
-            # Get most active session for this flow
-            most_active_session = self._get_most_active_session(row['chatflowid'])
-            
-            # Calculate success score (based on user engagement)
-            success_score = self._calculate_success_score(row)
-            
-            # Calculate engagement score (multi-turn conversations)
-            engagement_score = self._calculate_engagement_score(row['chatflowid'])
-            
-            # Get flow name
-            flow_name = self.flow_id_mapping.get(row['chatflowid'], 'unknown')
-            
-            stats.append(FlowStats(
-                chatflow_id=row['chatflowid'],
-                flow_name=flow_name,
-                message_count=row['message_count'],
-                session_count=row['session_count'],
-                first_message=datetime.fromisoformat(row['first_message'].replace('Z', '+00:00')),
-                last_message=datetime.fromisoformat(row['last_message'].replace('Z', '+00:00')),
-                avg_messages_per_session=avg_msgs,
-                most_active_session=most_active_session,
-                success_score=success_score,
-                engagement_score=engagement_score
+            stats.append(self._build_flow_stats(
+                row,
+                most_active_session=self._get_most_active_session(row['chatflowid']),
+                engagement_score=self._calculate_engagement_score(row['chatflowid'])
             ))
         
         return stats
     
+    def _build_flow_stats(self, row: Dict[str, Any], most_active_session: Optional[str], engagement_score: float) -> FlowStats:
+        """Build a FlowStats record from an aggregate row"""
+        return FlowStats(
+            chatflow_id=row['chatflowid'],
+            flow_name=self.flow_id_mapping.get(row['chatflowid'], 'unknown'),
+            message_count=row['message_count'],
+            session_count=row['session_count'],
+            first_message=datetime.fromisoformat(row['first_message'].replace('Z', '+00:00')),
+            last_message=datetime.fromisoformat(row['last_message'].replace('Z', '+00:00')),
+            avg_messages_per_session=row['message_count'] / max(row['session_count'], 1),
+            most_active_session=most_active_session,
+            success_score=self._calculate_success_score(row),
+            engagement_score=engagement_score
+        )
+    
     def _calculate_success_score(self, row: Dict[str, Any]) -> float:
         """Calculate success score based on conversation quality indicators"""
         try:
@@ -217,6 +287,23 @@ class FlowiseDBInterface:
         results = self._execute_query(query, (chatflow_id,))
         return results[0]['sessionId'] if results else None
     
+    def _row_to_chat_message(self, row: Dict[str, Any]) -> ChatMessage:
+        """Build a ChatMessage from a chat_message row"""
+        return ChatMessage(
+            id=row['id'],
+            role=row['role'], 
+            chatflowid=row['chatflowid'],
+            content=row['content'],
+            created_date=datetime.fromisoformat(row['createdDate'].replace('Z', '+00:00')),
+            session_id=row.get('sessionId'),
+            source_documents=row.get('sourceDocuments'),
+            used_tools=row.get('usedTools'),
+            chat_id=row.get('chatId'),
+            memory_type=row.get('memoryType'),
+            agent_reasoning=row.get('agentReasoning'),
+            artifacts=row.get('artifacts')
+        )
+    
     def get_recent_conversations(self, limit: int = 10, flow_id: Optional[str] = None) -> List[ChatMessage]:
         """Get recent conversation messages with optional flow filtering"""
         where_clause = "WHERE 1=1"
@@ -239,34 +326,16 @@ class FlowiseDBInterface:
         params.append(limit)
         
         results = self._execute_query(query, tuple(params))
-        messages = []
-        
-        for row in results:
-            messages.append(ChatMessage(
-                id=row['id'],
-                role=row['role'],
-                chatflowid=row['chatflowid'],
-                content=row['content'],
-                created_date=datetime.fromisoformat(row['createdDate'].replace('Z', '+00:00')),
-                session_id=row.get('sessionId'),
-                source_documents=row.get('sourceDocuments'),
-                used_tools=row.get('usedTools'),
-                chat_id=row.get('chatId'),
-                memory_type=row.get('memoryType'),
-                agent_reasoning=row.get('agentReasoning'),
-                artifacts=row.get('artifacts')
-            ))
-        
-        return messages
+        return [self._row_to_chat_message(row) for row in results]
     
     def extract_conversation_patterns(self, flow_id: Optional[str] = None) -> List[ConversationPattern]:
         """Extract patterns from successful conversations for flow enhancement"""
+        return list(self.get_analysis_snapshot().patterns_for(flow_id))
+    
+    def _extract_patterns_from_stats(self, flow_stats: List[FlowStats]) -> List[ConversationPattern]:
+        """Extract patterns for every high-performing flow in the given statistics"""
         patterns = []
         
-        # Get flow statistics for context
-        flow_stats = self.get_flow_statistics()
-        stats_by_id = {stat.chatflow_id: stat for stat in flow_stats}
-        
         # Focus on high-performing flows
         high_performing_flows = [
             stat for stat in flow_stats 
@@ -274,9 +343,6 @@ class FlowiseDBInterface:
         ]
         
         for flow_stat in high_performing_flows:
-            if flow_id and flow_stat.chatflow_id != flow_id:
-                continue
-                
             patterns.extend(self._extract_flow_specific_patterns(flow_stat))
         
         return patterns
@@ -285,134 +351,35 @@ class FlowiseDBInterface:
         """Extract patterns for a specific high-performing flow"""
         patterns = []
         
-        # Get successful conversations for this flow
-        query = """
-        SELECT content, role, sessionId, createdDate
-        FROM chat_message 
-        WHERE chatflowid = ?
-        AND role = 'userMessage'
-        AND length(content) > 20
-        ORDER BY createdDate DESC
-        LIMIT 100
-        """
-        
-        results = self._execute_query(query, (flow_stat.chatflow_id,))
-        
-        if flow_stat.flow_name == "creative-orientation":
-            patterns.extend(self._extract_creative_orientation_patterns(results, flow_stat))
-        elif flow_stat.flow_name == "faith2story":
-            patterns.extend(self._extract_faith_story_patterns(results, flow_stat))
-        elif flow_stat.flow_name == "miadi46code":
-            patterns.extend(self._extract_coding_patterns(results, flow_stat))
-        
-        # Always extract general engagement patterns
-        patterns.extend(self._extract_engagement_patterns(flow_stat))
-        
-        return patterns
-    
-    def _extract_creative_orientation_patterns(self, messages: List[Dict], flow_stat: FlowStats) -> List[ConversationPattern]:
-        """Extract patterns from creative orientation conversations"""
-        vision_keywords = []
-        outcome_keywords = []
-        structural_keywords = []
-        
-        for row in messages:
-            content_lower = row['content'].lower()
-            
-            if any(word in content_lower for word in ['vision', 'want to create', 'goal', 'dream', 'aspire']):
-                vision_keywords.append(row['content'][:100])
-            
-            if any(word in content_lower for word in ['outcome', 'achieve', 'result', 'accomplish']):
-                outcome_keywords.append(row['content'][:100])
-            
-            if any(word in content_lower for word in ['tension', 'current reality', 'desired', 'advancement']):
-                structural_keywords.append(row['content'][:100])
-        
-        patterns = []
-        
-        if vision_keywords:
-            patterns.append(ConversationPattern(
-                pattern_type="vision_creation",
-                flow_id=flow_stat.chatflow_id,
-                flow_name=flow_stat.flow_name,
-                confidence=min(len(vision_keywords) / 20.0, 1.0),
-                examples=vision_keywords[:5],
-                success_indicators=["clear vision articulation", "outcome focus"],
-                context_keywords=["vision", "create", "goal", "dream", "aspire"],
-                usage_frequency=len(vision_keywords)
-            ))
-        
-        if outcome_keywords:
-            patterns.append(ConversationPattern(
-                pattern_type="outcome_focus",
-                flow_id=flow_stat.chatflow_id,
-                flow_name=flow_stat.flow_name,
-                confidence=min(len(outcome_keywords) / 20.0, 1.0),
-                examples=outcome_keywords[:5],
-                success_indicators=["outcome clarity", "action orientation"],
-                context_keywords=["outcome", "achieve", "result", "accomplish"],
-                usage_frequency=len(outcome_keywords)
-            ))
-        
-        return patterns
-    
-    def _extract_faith_story_patterns(self, messages: List[Dict], flow_stat: FlowStats) -> List[ConversationPattern]:
-        """Extract patterns from faith story conversations"""
-        narrative_patterns = []
-        experience_patterns = []
-        
-        for row in messages:
-            content_lower = row['content'].lower()
-            
-            if any(word in content_lower for word in ['story', 'experience', 'journey', 'path']):
-                narrative_patterns.append(row['content'][:100])
-            
-            if any(word in content_lower for word in ['faith', 'spiritual', 'grace', 'meaning', 'purpose']):
-                experience_patterns.append(row['content'][:100])
-        
-        patterns = []
-        
-        if narrative_patterns:
-            patterns.append(ConversationPattern(
-                pattern_type="narrative_transformation",
-                flow_id=flow_stat.chatflow_id,
-                flow_name=flow_stat.flow_name,
-                confidence=min(len(narrative_patterns) / 20.0, 1.0),
-                examples=narrative_patterns[:5],
-                success_indicators=["story structure", "personal connection"],
-                context_keywords=["story", "experience", "journey", "path"],
-                usage_frequency=len(narrative_patterns)
-            ))
-        
-        return patterns
-    
-    def _extract_coding_patterns(self, messages: List[Dict], flow_stat: FlowStats) -> List[ConversationPattern]:
-        """Extract patterns from coding-related conversations"""
-        implementation_patterns = []
-        problem_solving_patterns = []
-        
-        for row in messages:
-            content_lower = row['content'].lower()
+        # Only fetch conversations when some pattern definition reports for this flow
+        if self.pattern_matcher.definitions_for_flow(flow_stat.flow_name):
+            query = """
+            SELECT content, role, sessionId, createdDate
+            FROM chat_message 
+            WHERE chatflowid = ?
+            AND role = 'userMessage'
+            AND length(content) > 20
+            ORDER BY createdDate DESC
+            LIMIT 100
+            """
             
-            if any(word in content_lower for word in ['implement', 'code', 'build', 'create', 'develop']):
-                implementation_patterns.append(row['content'][:100])
+            results = self._execute_query(query, (flow_stat.chatflow_id,))
+            matches = self.pattern_matcher.collect((row['content'] for row in results), flow_stat.flow_name)
             
-            if any(word in content_lower for word in ['debug', 'fix', 'error', 'issue', 'problem']):
-                problem_solving_patterns.append(row['content'][:100])
-        
-        patterns = []
+            for definition, examples in matches:
+                patterns.append(ConversationPattern(
+                    pattern_type=definition.pattern_type,
+                    flow_id=flow_stat.chatflow_id,
+                    flow_name=flow_stat.flow_name,
+                    confidence=min(len(examples) / definition.confidence_divisor, 1.0),
+                    examples=examples[:5],
+                    success_indicators=list(definition.success_indicators),
+                    context_keywords=list(definition.context_keywords),
+                    usage_frequency=len(examples)
+                ))
         
-        if implementation_patterns:
-            patterns.append(ConversationPattern(
-                pattern_type="code_implementation",
-                flow_id=flow_stat.chatflow_id,
-                flow_name=flow_stat.flow_name,
-                confidence=min(len(implementation_patterns) / 15.0, 1.0),
-                examples=implementation_patterns[:5],
-                success_indicators=["clear requirements", "implementation focus"],
-                context_keywords=["implement", "code", "build", "create", "develop"],
-                usage_frequency=len(implementation_patterns)
-            ))
+        # Always extract general engagement patterns
+        patterns.extend(self._extract_engagement_patterns(flow_stat))
         
         return patterns
     
@@ -437,8 +404,9 @@ class FlowiseDBInterface:
     def get_admin_dashboard_data(self) -> Dict[str, Any]:
         """Get comprehensive dashboard data for admin interface"""
         # Get basic statistics
-        flow_stats = self.get_flow_statistics()
-        patterns = self.extract_conversation_patterns()
+        snapshot = self.get_analysis_snapshot()
+        flow_stats = snapshot.flow_stats
+        patterns = snapshot.conversation_patterns
         
         # Calculate overall system health
         total_messages = sum(stat.message_count for stat in flow_stats)
@@ -452,7 +420,10 @@ class FlowiseDBInterface:
         GROUP BY DATE(createdDate)
         ORDER BY date DESC
         """
-        recent_activity = self._execute_query(recent_query)
+        if self.incremental:
+            recent_activity = self.incremental.get_daily_activity(days=7)
+        else:
+            recent_activity = self._execute_query(recent_query)
         
         # Live integration status
         live_status = {
@@ -480,11 +451,16 @@ class FlowiseDBInterface:
             'conversation_patterns': [asdict(pattern) for pattern in patterns],
             'recent_activity': recent_activity,
             'live_integration': live_status,
+            'snapshot_cache': self.snapshots.get_stats(),
             'analysis_timestamp': datetime.now().isoformat()
         }
     
     def search_conversations(self, search_term: str, flow_id: Optional[str] = None, limit: int = 20) -> List[ChatMessage]:
         """Search conversation content for specific terms"""
+        if self.search_index:
+            # Ranked by BM25; supports "quoted phrases" and prefix* terms
+            return self.search_index.search(search_term, flow_id, limit)
+        
         where_clause = "WHERE content LIKE ?"
         params = [f"%{search_term}%"]
         
@@ -505,25 +481,7 @@ class FlowiseDBInterface:
         params.append(limit)
         
         results = self._execute_query(query, tuple(params))
-        messages = []
-        
-        for row in results:
-            messages.append(ChatMessage(
-                id=row['id'],
-                role=row['role'], 
-                chatflowid=row['chatflowid'],
-                content=row['content'],
-                created_date=datetime.fromisoformat(row['createdDate'].replace('Z', '+00:00')),
-                session_id=row.get('sessionId'),
-                source_documents=row.get('sourceDocuments'),
-                used_tools=row.get('usedTools'),
-                chat_id=row.get('chatId'),
-                memory_type=row.get('memoryType'),
-                agent_reasoning=row.get('agentReasoning'),
-                artifacts=row.get('artifacts')
-            ))
-        
-        return messages
+        return [self._row_to_chat_message(row) for row in results]
 
 def main():
     """CLI interface for admin database analysis"""
@@ -536,14 +494,33 @@ def main():
     parser.add_argument("--flows", action="store_true", help="Show flow statistics")
     parser.add_argument("--patterns", action="store_true", help="Extract conversation patterns")
     parser.add_argument("--search", help="Search conversations for term")
+    parser.add_argument("--fts", action="store_true",
+                       help="Use the FTS5 search index for --search (BM25 ranked, phrase/prefix queries)")
     parser.add_argument("--export", help="Export analysis to JSON file")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Read aggregates from the incremental analytics sidecar")
+    parser.add_argument("--stream-export", metavar="DIR",
+                       help="Stream flow stats, patterns, sessions and messages into DIR")
+    parser.add_argument("--export-format", choices=["ndjson", "parquet"], default="ndjson",
+                       help="File format for --stream-export")
     
     args = parser.parse_args()
     
     try:
         db = FlowiseDBInterface(args.database)
+        if args.incremental:
+            db.enable_incremental()
         
-        if args.dashboard:
+        if args.stream_export:
+            try:
+                from .exporter import StreamingExporter
+            except ImportError:
+                from exporter import StreamingExporter
+            counts = StreamingExporter(db).export_all(args.stream_export, args.export_format)
+            for dataset, count in counts.items():
+                print(f"✅ Exported {count:,} {dataset} rows to {args.stream_export}")
+        
+        elif args.dashboard:
             dashboard = db.get_admin_dashboard_data()
             if args.export:
                 with open(args.export, 'w') as f:
@@ -553,7 +530,7 @@ def main():
                 print(json.dumps(dashboard, indent=2, default=str))
         
         elif args.flows:
-            stats = db.get_flow_statistics()
+            stats = db.get_analysis_snapshot().flow_stats
             for stat in stats[:10]:
                 print(f"\n🔥 Flow: {stat.flow_name} ({stat.chatflow_id[:8]}...)")
                 print(f"   📊 Messages: {stat.message_count} | Sessions: {stat.session_count}")
@@ -569,7 +546,15 @@ def main():
                 print(f"   📝 Usage: {pattern.usage_frequency} times")
         
         elif args.search:
+            if args.fts:
+                index = db.enable_search_index()
+                started = time.perf_counter()
+                indexed = index.refresh()
+                print(f"🗂️ Search index refreshed: {indexed:,} new messages in {(time.perf_counter() - started) * 1000:.1f} ms")
+            started = time.perf_counter()
             messages = db.search_conversations(args.search)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"⏱️ {len(messages)} results in {elapsed:.1f} ms ({'fts5' if args.fts else 'like'})")
             for msg in messages[:5]:
                 flow_name = db.flow_id_mapping.get(msg.chatflowid, 'unknown')
                 print(f"\n[{msg.created_date.strftime('%Y-%m-%d %H:%M')}] {flow_name}")
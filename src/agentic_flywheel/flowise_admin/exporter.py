@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Streaming Exporter - Admin Tool
+Writes flow statistics, patterns, session aggregates and raw messages as NDJSON or Parquet with bounded memory
+"""
+
+import gzip
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+EXPORT_FORMATS = ("ndjson", "parquet")
+
+# Column layouts are fixed up front so every Parquet row group shares one schema,
+# even when the first chunk happens to contain only NULLs for a column.
+DATASET_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    'flow_stats': [
+        ('chatflow_id', 'string'), ('flow_name', 'string'), ('message_count', 'int64'),
+        ('session_count', 'int64'), ('first_message', 'string'), ('last_message', 'string'),
+        ('avg_messages_per_session', 'float64'), ('most_active_session', 'string'),
+        ('success_score', 'float64'), ('engagement_score', 'float64'),
+    ],
+    'patterns': [
+        ('pattern_type', 'string'), ('flow_id', 'string'), ('flow_name', 'string'),
+        ('confidence', 'float64'), ('examples', 'list<string>'), ('success_indicators', 'list<string>'),
+        ('context_keywords', 'list<string>'), ('usage_frequency', 'int64'),
+    ],
+    'sessions': [
+        ('chatflowid', 'string'), ('sessionId', 'string'), ('turn_count', 'int64'),
+        ('first_message', 'string'), ('last_message', 'string'), ('user_messages', 'int64'),
+        ('api_messages', 'int64'), ('content_length', 'int64'),
+    ],
+    'messages': [
+        ('id', 'string'), ('role', 'string'), ('chatflowid', 'string'), ('content', 'string'),
+        ('createdDate', 'string'), ('sessionId', 'string'), ('sourceDocuments', 'string'),
+        ('usedTools', 'string'), ('chatId', 'string'), ('memoryType', 'string'),
+        ('agentReasoning', 'string'), ('artifacts', 'string'),
+    ],
+    'flow_reports': None,  # nested report dicts: NDJSON only
+}
+
+SESSION_EXPORT_QUERY = """
+SELECT
+    chatflowid,
+    sessionId,
+    COUNT(*) AS turn_count,
+    MIN(createdDate) AS first_message,
+    MAX(createdDate) AS last_message,
+    SUM(role = 'userMessage') AS user_messages,
+    SUM(role = 'apiMessage') AS api_messages,
+    SUM(length(content)) AS content_length
+FROM chat_message
+WHERE sessionId IS NOT NULL
+GROUP BY chatflowid, sessionId
+"""
+
+MESSAGE_EXPORT_QUERY = """
+SELECT
+    id, role, chatflowid, content, createdDate, sessionId,
+    sourceDocuments, usedTools, chatId, memoryType,
+    agentReasoning, artifacts
+FROM chat_message
+WHERE rowid > ?
+ORDER BY rowid
+"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _arrow_type(type_name: str):
+    if type_name == 'list<string>':
+        return pa.list_(pa.string())
+    return {'string': pa.string(), 'int64': pa.int64(), 'float64': pa.float64()}[type_name]
+
+
+def _open_text(path: Path):
+    """Open a text file for writing, gzip-compressed when the name ends in .gz"""
+    if path.suffix == '.gz':
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+class StreamingExporter:
+    """Generator-driven export of admin datasets; memory stays bounded by the chunk size"""
+
+    def __init__(self, db, chunk_size: int = DEFAULT_CHUNK_SIZE, analyzer=None):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.analyzer = analyzer
+
+    def datasets(self) -> Dict[str, Callable[[], Iterator[Dict[str, Any]]]]:
+        """Dataset name to row generator"""
+        return {
+            'flow_stats': self.iter_flow_stats,
+            'patterns': self.iter_patterns,
+            'sessions': self.iter_sessions,
+            'messages': self.iter_messages,
+            'flow_reports': self.iter_flow_reports,
+        }
+
+    def iter_flow_stats(self) -> Iterator[Dict[str, Any]]:
+        """One row per chatflow from the analysis snapshot"""
+        for stat in self.db.get_analysis_snapshot().flow_stats:
+            row = asdict(stat)
+            row['first_message'] = stat.first_message.isoformat()
+            row['last_message'] = stat.last_message.isoformat()
+            yield row
+
+    def iter_patterns(self) -> Iterator[Dict[str, Any]]:
+        """One row per extracted conversation pattern"""
+        for pattern in self.db.get_analysis_snapshot().conversation_patterns:
+            yield asdict(pattern)
+
+    def iter_sessions(self) -> Iterator[Dict[str, Any]]:
+        """One row per (chatflow, session), streamed straight from the GROUP BY cursor"""
+        columns = [name for name, _ in DATASET_SCHEMAS['sessions']]
+        for row in self.db._stream_query(SESSION_EXPORT_QUERY):
+            yield dict(zip(columns, row))
+
+    def iter_messages(self, after_rowid: int = 0) -> Iterator[Dict[str, Any]]:
+        """Every chat message in insertion order, fetched chunk_size rows at a time"""
+        columns = [name for name, _ in DATASET_SCHEMAS['messages']]
+        for row in self.db.connections.stream(MESSAGE_EXPORT_QUERY, (after_rowid,), self.chunk_size):
+            yield dict(zip(columns, row))
+
+    def iter_flow_reports(self) -> Iterator[Dict[str, Any]]:
+        """Flow performance reports, analyzed and yielded one flow at a time"""
+        analyzer = self.analyzer
+        if analyzer is None:
+            try:
+                from .flow_analyzer import FlowAnalyzer
+            except ImportError:
+                from flow_analyzer import FlowAnalyzer
+            analyzer = self.analyzer = FlowAnalyzer(db=self.db)
+
+        snapshot = self.db.get_analysis_snapshot()
+        analyzer.flow_stats = snapshot.flow_stats
+        analyzer.conversation_patterns = snapshot.conversation_patterns
+        for flow_stat in snapshot.flow_stats:
+            if flow_stat.message_count < 20:
+                continue
+            report = analyzer._try_analyze_single_flow(flow_stat)
+            if report is not None:
+                yield asdict(report)
+
+    def _chunks(self, rows: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def write_ndjson(self, rows: Iterator[Dict[str, Any]], path: str) -> int:
+        """Write rows as newline-delimited JSON (gzip when path ends in .gz); returns row count"""
+        count = 0
+        with _open_text(Path(path)) as f:
+            for chunk in self._chunks(rows):
+                f.write("".join(
+                    json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in chunk
+                ))
+                count += len(chunk)
+        return count
+
+    def write_parquet(self, rows: Iterator[Dict[str, Any]], path: str, dataset: str) -> int:
+        """Write rows as Parquet, one row group per chunk; returns row count"""
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        layout = DATASET_SCHEMAS.get(dataset)
+        if not layout:
+            raise ValueError(f"Dataset '{dataset}' has no flat schema; export it as NDJSON")
+
+        schema = pa.schema([(name, _arrow_type(type_name)) for name, type_name in layout])
+        count = 0
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            for chunk in self._chunks(rows):
+                columns = {name: [row.get(name) for row in chunk] for name in schema.names}
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                count += len(chunk)
+        return count
+
+    def export(self, dataset: str, path: str, export_format: str = "ndjson") -> int:
+        """Export one dataset to a file"""
+        generators = self.datasets()
+        if dataset not in generators:
+            raise ValueError(f"Unknown dataset '{dataset}' (choose from {', '.join(generators)})")
+        rows = generators[dataset]()
+        if export_format == "parquet":
+            return self.write_parquet(rows, path, dataset)
+        return self.write_ndjson(rows, path)
+
+    def export_all(self, directory: str, export_format: str = "ndjson",
+                   datasets: Optional[List[str]] = None, compress: bool = False) -> Dict[str, int]:
+        """Export several datasets into a directory, one file each; returns row counts"""
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        suffix = ".parquet" if export_format == "parquet" else (".ndjson.gz" if compress else ".ndjson")
+
+        counts = {}
+        for dataset in datasets or ['flow_stats', 'patterns', 'sessions', 'messages']:
+            path = target / f"{dataset}{suffix}"
+            counts[dataset] = self.export(dataset, str(path), export_format)
+            logger.info(f"✅ Exported {counts[dataset]:,} {dataset} rows to {path}")
+        return counts
+
+
+def main():
+    """CLI interface for streaming exports"""
+    import argparse
+    import time
+
+    try:
+        from .db_interface import FlowiseDBInterface
+    except ImportError:
+        from db_interface import FlowiseDBInterface
+
+    parser = argparse.ArgumentParser(description="Flowise Admin Streaming Exporter")
+    parser.add_argument("--database", default="/home/jgi/.flowise/database.sqlite",
+                       help="Path to flowise database")
+    parser.add_argument("--output", required=True, help="Directory to write export files into")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="Export file format")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASET_SCHEMAS),
+                       help="Datasets to export (default: flow_stats patterns sessions messages)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip NDJSON output")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per write chunk")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        db = FlowiseDBInterface(args.database)
+        exporter = StreamingExporter(db, chunk_size=args.chunk_size)
+        started = time.perf_counter()
+        counts = exporter.export_all(args.output, args.format, args.datasets, compress=args.gzip)
+        print(f"✅ Export finished in {time.perf_counter() - started:.1f}s")
+        for dataset, count in counts.items():
+            print(f"   📦 {dataset}: {count:,} rows")
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,19 @@ Analyzes conversation patterns and flow performance to optimize flowise automati
 
 import json
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-import statistics
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from .db_interface import FlowiseDBInterface, FlowStats, ConversationPattern
+    from . import session_metrics
 except ImportError:
     from db_interface import FlowiseDBInterface, FlowStats, ConversationPattern
+    import session_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -56,18 +59,57 @@ class FlowPerformanceReport:
 class FlowAnalyzer:
     """Advanced flow intelligence analyzer for admin optimization"""
     
-    def __init__(self, database_path: str = "/home/jgi/.flowise/database.sqlite"):
-        self.db = FlowiseDBInterface(database_path)
+    def __init__(self, database_path: str = "/home/jgi/.flowise/database.sqlite",
+                 db: Optional[FlowiseDBInterface] = None,
+                 workers: int = 1):
+        # Reuse the caller's interface (and its pooled connections) when one is supplied
+        self.db = db or FlowiseDBInterface(database_path)
+        self.workers = workers
         self.flow_stats = None
         self.conversation_patterns = None
+        # One worker pool for the analyzer's lifetime: each of its threads keeps a pooled connection
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+    
+    def _get_executor(self, workers: int) -> ThreadPoolExecutor:
+        """The analyzer's worker pool, rebuilt only when a different worker count is asked for"""
+        if self._executor is None or self._executor_workers != workers:
+            self._shutdown_executor()
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flow-analyzer")
+            self._executor_workers = workers
+        return self._executor
+    
+    def _shutdown_executor(self) -> None:
+        """Stop the worker pool after each of its threads has closed its read-only connection"""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # Every release task waits at the barrier, so each one runs on a different pool thread
+        barrier = threading.Barrier(self._executor_workers)
+        
+        def release():
+            try:
+                barrier.wait(timeout=10)
+            except threading.BrokenBarrierError:
+                pass
+            self.db.connections.release()
+        
+        for _ in range(self._executor_workers):
+            executor.submit(release)
+        executor.shutdown(wait=True)
+    
+    def close(self) -> None:
+        """Stop the worker pool and release its connections"""
+        self._shutdown_executor()
         
-    def analyze_all_flows(self) -> Dict[str, FlowPerformanceReport]:
+    def analyze_all_flows(self, workers: Optional[int] = None) -> Dict[str, FlowPerformanceReport]:
         """Analyze all flows and generate performance reports"""
         logger.info("🔍 Analyzing all flows for performance optimization...")
         
-        # Get fresh data
-        self.flow_stats = self.db.get_flow_statistics()
-        self.conversation_patterns = self.db.extract_conversation_patterns()
+        # Read from the shared snapshot; it is only recomputed when chat_message changes
+        snapshot = self.db.get_analysis_snapshot()
+        self.flow_stats = snapshot.flow_stats
+        self.conversation_patterns = snapshot.conversation_patterns
         
         reports = {}
         
@@ -77,18 +119,34 @@ class FlowAnalyzer:
             if stat.message_count >= 20  # Minimum threshold for meaningful analysis
         ]
         
-        logger.info(f"📊 Found {len(significant_flows)} flows with significant usage")
+        workers = max(1, workers or self.workers)
+        logger.info(f"📊 Found {len(significant_flows)} flows with significant usage ({workers} workers)")
         
-        for flow_stat in significant_flows:
-            try:
-                report = self._analyze_single_flow(flow_stat)
+        if workers > 1:
+            # Each worker thread gets its own read-only connection from the pool; SQLite
+            # releases the GIL while a query runs, so per-flow queries overlap.
+            executor = self._get_executor(workers)
+            results = list(executor.map(self._try_analyze_single_flow, significant_flows))
+        else:
+            results = [self._try_analyze_single_flow(flow_stat) for flow_stat in significant_flows]
+        
+        # Reports keep the snapshot's flow order regardless of completion order
+        for flow_stat, report in zip(significant_flows, results):
+            if report is not None:
                 reports[flow_stat.flow_name] = report
-                logger.info(f"✅ Analyzed {flow_stat.flow_name}: {report.performance_score:.2f} score")
-            except Exception as e:
-                logger.error(f"❌ Failed to analyze {flow_stat.flow_name}: {e}")
         
         return reports
     
+    def _try_analyze_single_flow(self, flow_stat: FlowStats) -> Optional[FlowPerformanceReport]:
+        """Analyze one flow, logging (not raising) failures"""
+        try:
+            report = self._analyze_single_flow(flow_stat)
+            logger.info(f"✅ Analyzed {flow_stat.flow_name}: {report.performance_score:.2f} score")
+            return report
+        except Exception as e:
+            logger.error(f"❌ Failed to analyze {flow_stat.flow_name}: {e}")
+            return None
+    
     def _analyze_single_flow(self, flow_stat: FlowStats) -> FlowPerformanceReport:
         """Analyze a single flow comprehensively"""
         
@@ -98,17 +156,20 @@ class FlowAnalyzer:
             if p.flow_id == flow_stat.chatflow_id
         ]
         
+        # Hourly histogram and per-session rows are shared by the usage, quality and timing analyses
+        activity = self._load_flow_activity(flow_stat)
+        
         # Usage analysis
-        usage_metrics = self._analyze_usage_patterns(flow_stat)
+        usage_metrics = self._analyze_usage_patterns(flow_stat, activity)
         
         # Quality analysis
-        quality_metrics = self._analyze_quality_indicators(flow_stat)
+        quality_metrics = self._analyze_quality_indicators(flow_stat, activity)
         
         # Content analysis
         content_analysis = self._analyze_content_patterns(flow_stat, flow_patterns)
         
         # Timing analysis
-        timing_analysis = self._analyze_timing_patterns(flow_stat)
+        timing_analysis = self._analyze_timing_patterns(flow_stat, activity)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
@@ -153,8 +214,16 @@ class FlowAnalyzer:
             technical_improvements=recommendations['technical']
         )
     
-    def _analyze_usage_patterns(self, flow_stat: FlowStats) -> Dict[str, Any]:
-        """Analyze usage patterns for a flow"""
+    def _load_flow_activity(self, flow_stat: FlowStats) -> Dict[str, Any]:
+        """Fetch the per-flow rows several analyses need, once per flow"""
+        if self.db.incremental:
+            return {
+                'hourly_usage': self.db.incremental.get_hourly_usage(flow_stat.chatflow_id),
+                'sessions': session_metrics.load_session_columns(
+                    self.db.incremental.get_session_columns(flow_stat.chatflow_id)
+                ),
+                'role_breakdown': self.db.incremental.get_role_breakdown(flow_stat.chatflow_id)
+            }
         
         # Get hourly usage distribution
         hourly_query = """
@@ -164,61 +233,49 @@ class FlowAnalyzer:
         GROUP BY strftime('%H', createdDate)
         ORDER BY count DESC
         """
-        hourly_usage = self.db._execute_query(hourly_query, (flow_stat.chatflow_id,))
         
-        # Session distribution analysis
-        session_query = """
-        SELECT sessionId, COUNT(*) as message_count,
-               MIN(createdDate) as start_time,
-               MAX(createdDate) as end_time
+        # User vs API message ratio analysis
+        message_query = """
+        SELECT role, COUNT(*) as count, AVG(length(content)) as avg_length
         FROM chat_message 
-        WHERE chatflowid = ? AND sessionId IS NOT NULL
-        GROUP BY sessionId
+        WHERE chatflowid = ?
+        GROUP BY role
         """
-        session_data = self.db._execute_query(session_query, (flow_stat.chatflow_id,))
         
-        session_lengths = [s['message_count'] for s in session_data]
+        params = (flow_stat.chatflow_id,)
+        return {
+            'hourly_usage': self.db._execute_query(hourly_query, params),
+            # Per-session turns and durations as columns; julianday() does the date math in SQL
+            'sessions': session_metrics.load_session_columns(
+                self.db._stream_query(session_metrics.SESSION_COLUMNS_QUERY, params)
+            ),
+            'role_breakdown': self.db._execute_query(message_query, params)
+        }
+    
+    def _analyze_usage_patterns(self, flow_stat: FlowStats, activity: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze usage patterns for a flow"""
+        hourly_usage = activity['hourly_usage']
+        sessions = activity['sessions']
         
         return {
             'peak_hours': [int(h['hour']) for h in hourly_usage[:3]],
-            'session_length_distribution': {
-                'short_sessions': len([s for s in session_lengths if s <= 2]),
-                'medium_sessions': len([s for s in session_lengths if 3 <= s <= 10]),
-                'long_sessions': len([s for s in session_lengths if s > 10])
-            },
-            'session_lengths': session_lengths,
-            'total_active_days': len(set([
-                datetime.fromisoformat(s['start_time'].replace('Z', '+00:00')).date()
-                for s in session_data
-            ]))
+            'session_length_distribution': session_metrics.turn_length_distribution(sessions),
+            'session_lengths': [int(turns) for turns in sessions.turns],
+            'turn_stats': session_metrics.summarize(sessions.turns, session_metrics.TURN_BIN_EDGES),
+            'total_active_days': session_metrics.count_active_days(sessions)
         }
     
-    def _analyze_quality_indicators(self, flow_stat: FlowStats) -> Dict[str, Any]:
+    def _analyze_quality_indicators(self, flow_stat: FlowStats, activity: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze quality indicators for a flow"""
-        
-        # User vs API message ratio analysis
-        message_query = """
-        SELECT role, COUNT(*) as count, AVG(length(content)) as avg_length
-        FROM chat_message 
-        WHERE chatflowid = ?
-        GROUP BY role
-        """
-        message_breakdown = self.db._execute_query(message_query, (flow_stat.chatflow_id,))
+        message_breakdown = activity['role_breakdown']
         
         user_messages = next((m['count'] for m in message_breakdown if m['role'] == 'userMessage'), 0)
         api_messages = next((m['count'] for m in message_breakdown if m['role'] == 'apiMessage'), 0)
         user_avg_length = next((m['avg_length'] for m in message_breakdown if m['role'] == 'userMessage'), 0)
         
         # Session completion analysis (sessions with follow-up)
-        completion_query = """
-        SELECT sessionId, COUNT(*) as turns
-        FROM chat_message 
-        WHERE chatflowid = ? AND sessionId IS NOT NULL
-        GROUP BY sessionId
-        HAVING turns > 2
-        """
-        completed_sessions = self.db._execute_query(completion_query, (flow_stat.chatflow_id,))
-        completion_rate = len(completed_sessions) / max(flow_stat.session_count, 1)
+        completed_count = session_metrics.count_completed(activity['sessions'])
+        completion_rate = completed_count / max(flow_stat.session_count, 1)
         
         # Look for satisfaction indicators
         satisfaction_indicators = []
@@ -277,10 +334,9 @@ class FlowAnalyzer:
         
         problematic_patterns = []
         for msg in problematic_messages:
-            content_lower = msg['content'].lower()
-            if any(word in content_lower for word in ['unclear', 'confused', 'wrong', 'error']):
+            if "confusion_indicators" in self.db.pattern_matcher.tag(msg['content']):
                 problematic_patterns.append("confusion_indicators")
-            if len(content_lower) < 10:
+            if len(msg['content'].lower()) < 10:
                 problematic_patterns.append("very_short_queries")
         
         return {
@@ -290,56 +346,31 @@ class FlowAnalyzer:
             'content_gaps': content_gaps
         }
     
-    def _analyze_timing_patterns(self, flow_stat: FlowStats) -> Dict[str, Any]:
+    def _analyze_timing_patterns(self, flow_stat: FlowStats, activity: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze timing and response patterns"""
         
-        # Session duration analysis
-        duration_query = """
-        SELECT 
-            sessionId,
-            MIN(createdDate) as start_time,
-            MAX(createdDate) as end_time,
-            COUNT(*) as message_count
-        FROM chat_message 
-        WHERE chatflowid = ? AND sessionId IS NOT NULL
-        GROUP BY sessionId
-        HAVING message_count > 1
-        """
-        session_durations = self.db._execute_query(duration_query, (flow_stat.chatflow_id,))
-        
-        durations_minutes = []
-        for session in session_durations:
-            start = datetime.fromisoformat(session['start_time'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(session['end_time'].replace('Z', '+00:00'))
-            duration = (end - start).total_seconds() / 60
-            durations_minutes.append(duration)
+        # Session duration analysis (durations already in minutes from SQL)
+        durations_minutes = session_metrics.multi_turn_durations(activity['sessions'])
+        duration_summary = session_metrics.summarize(durations_minutes, session_metrics.DURATION_BIN_EDGES)
         
         # Peak usage hours
-        hourly_query = """
-        SELECT strftime('%H', createdDate) as hour, COUNT(*) as count
-        FROM chat_message 
-        WHERE chatflowid = ?
-        GROUP BY hour
-        ORDER BY count DESC
-        LIMIT 3
-        """
-        peak_hours = [
-            int(row['hour']) 
-            for row in self.db._execute_query(hourly_query, (flow_stat.chatflow_id,))
-        ]
+        peak_hours = [int(row['hour']) for row in activity['hourly_usage'][:3]]
         
         duration_stats = {}
-        if durations_minutes:
+        if duration_summary:
             duration_stats = {
-                'avg_minutes': statistics.mean(durations_minutes),
-                'median_minutes': statistics.median(durations_minutes),
-                'max_minutes': max(durations_minutes),
-                'sessions_analyzed': len(durations_minutes)
+                'avg_minutes': duration_summary['mean'],
+                'median_minutes': duration_summary['median'],
+                'p90_minutes': duration_summary['p90'],
+                'p99_minutes': duration_summary['p99'],
+                'max_minutes': duration_summary['max'],
+                'sessions_analyzed': duration_summary['count']
             }
         
         return {
             'peak_hours': peak_hours,
-            'duration_stats': duration_stats
+            'duration_stats': duration_stats,
+            'duration_histogram': duration_summary.get('histogram', {})
         }
     
     def _calculate_performance_score(self, 
@@ -531,13 +562,31 @@ def main():
     parser.add_argument("--global-report", action="store_true", help="Generate global intelligence report")
     parser.add_argument("--export", help="Export analysis to JSON file")
     parser.add_argument("--top", type=int, default=5, help="Show top N performing flows")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Read aggregates from the incremental analytics sidecar")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Analyze flows concurrently with this many threads")
+    parser.add_argument("--stream-export", metavar="PATH",
+                       help="Stream flow reports as NDJSON (.ndjson or .ndjson.gz), one flow at a time")
     
     args = parser.parse_args()
     
+    analyzer = None
     try:
-        analyzer = FlowAnalyzer(args.database)
+        analyzer = FlowAnalyzer(args.database, workers=args.workers)
+        if args.incremental:
+            analyzer.db.enable_incremental()
         
-        if args.global_report:
+        if args.stream_export:
+            try:
+                from .exporter import StreamingExporter
+            except ImportError:
+                from exporter import StreamingExporter
+            exporter = StreamingExporter(analyzer.db, analyzer=analyzer)
+            count = exporter.write_ndjson(exporter.iter_flow_reports(), args.stream_export)
+            print(f"✅ Streamed {count} flow reports to {args.stream_export}")
+        
+        elif args.global_report:
             logger.info("🌍 Generating global intelligence report...")
             report = analyzer.generate_global_intelligence_report()
             
@@ -584,6 +633,9 @@ def main():
         print(f"❌ Analysis failed: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if analyzer:
+            analyzer.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Incremental Analytics - Admin Layer
+Running per-flow and per-session aggregates kept in a sidecar SQLite file and advanced from a rowid watermark
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from .stats_engine import FlowStatisticsEngine, FLOW_ROLLUP_QUERY
+except ImportError:
+    from stats_engine import FlowStatisticsEngine, FLOW_ROLLUP_QUERY
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "2"
+DEFAULT_BATCH_SIZE = 20000
+DELETION_CHECK_INTERVAL = 60.0    # seconds between counts of the rows behind the watermark
+
+SIDECAR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS session_aggregates (
+    chatflowid TEXT NOT NULL,
+    sessionId TEXT NOT NULL,
+    turn_count INTEGER NOT NULL,
+    first_message TEXT,
+    last_message TEXT,
+    content_length INTEGER NOT NULL,
+    content_count INTEGER NOT NULL,
+    user_messages INTEGER NOT NULL,
+    api_messages INTEGER NOT NULL,
+    PRIMARY KEY (chatflowid, sessionId)
+);
+CREATE TABLE IF NOT EXISTS role_aggregates (
+    chatflowid TEXT NOT NULL,
+    role TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    content_length INTEGER NOT NULL,
+    PRIMARY KEY (chatflowid, role)
+);
+CREATE TABLE IF NOT EXISTS hourly_buckets (
+    chatflowid TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    PRIMARY KEY (chatflowid, bucket)
+);
+CREATE TABLE IF NOT EXISTS session_days (
+    day TEXT NOT NULL,
+    sessionId TEXT NOT NULL,
+    PRIMARY KEY (day, sessionId)
+);
+"""
+
+# New source rows only; the rowid range makes this O(new rows)
+DELTA_QUERY = """
+SELECT
+    rowid,
+    id,
+    chatflowid,
+    sessionId,
+    role,
+    length(content),
+    createdDate,
+    DATE(createdDate),
+    strftime('%Y-%m-%d %H', createdDate)
+FROM chat_message
+WHERE rowid > ?
+ORDER BY rowid
+"""
+
+SESSION_UPSERT = """
+INSERT INTO session_aggregates
+    (chatflowid, sessionId, turn_count, first_message, last_message,
+     content_length, content_count, user_messages, api_messages)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (chatflowid, sessionId) DO UPDATE SET
+    turn_count = turn_count + excluded.turn_count,
+    first_message = MIN(first_message, excluded.first_message),
+    last_message = MAX(last_message, excluded.last_message),
+    content_length = content_length + excluded.content_length,
+    content_count = content_count + excluded.content_count,
+    user_messages = user_messages + excluded.user_messages,
+    api_messages = api_messages + excluded.api_messages
+"""
+
+ROLE_UPSERT = """
+INSERT INTO role_aggregates (chatflowid, role, message_count, content_length)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (chatflowid, role) DO UPDATE SET
+    message_count = message_count + excluded.message_count,
+    content_length = content_length + excluded.content_length
+"""
+
+HOURLY_UPSERT = """
+INSERT INTO hourly_buckets (chatflowid, bucket, message_count)
+VALUES (?, ?, ?)
+ON CONFLICT (chatflowid, bucket) DO UPDATE SET
+    message_count = message_count + excluded.message_count
+"""
+
+# The same rollup the full recompute uses, fed from the sidecar's session rows
+INCREMENTAL_ROLLUP_QUERY = FLOW_ROLLUP_QUERY.format(session_turns="""session_turns AS (
+    SELECT
+        chatflowid, sessionId, turn_count, first_message, last_message,
+        content_length, content_count, user_messages, api_messages
+    FROM session_aggregates
+)""")
+
+
+class IncrementalAnalytics:
+    """Keeps running chat_message aggregates in a sidecar database next to the flowise database"""
+
+    def __init__(self, db, sidecar_path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 deletion_check_interval: float = DELETION_CHECK_INTERVAL):
+        self.db = db
+        self.sidecar_path = Path(sidecar_path) if sidecar_path else \
+            db.database_path.with_suffix('.analytics.sqlite')
+        self.batch_size = batch_size
+        self.deletion_check_interval = deletion_check_interval
+        self._last_deletion_check: Optional[float] = None
+        self.stats_engine = FlowStatisticsEngine(self._execute, INCREMENTAL_ROLLUP_QUERY)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.sidecar_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SIDECAR_SCHEMA)
+
+        source = str(db.database_path.resolve())
+        if self._get_meta('schema_version') != SCHEMA_VERSION or self._get_meta('source') != source:
+            self._reset(source)
+
+    def _execute(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Execute a query against the sidecar and return results as list of dictionaries"""
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            columns = [column[0] for column in cursor.description or ()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _reset(self, source: str) -> None:
+        """Empty every aggregate table and rewind the watermark"""
+        with self._lock, self._conn:
+            for table in ("session_aggregates", "role_aggregates", "hourly_buckets", "session_days"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._set_meta('schema_version', SCHEMA_VERSION)
+            self._set_meta('source', source)
+            self._set_meta('watermark', 0)
+            self._set_meta('watermark_id', '')
+            self._set_meta('row_count', 0)
+            self._set_meta('updated_at', '')
+
+    @property
+    def watermark(self) -> int:
+        """Highest chat_message rowid folded into the aggregates"""
+        return int(self._get_meta('watermark') or 0)
+
+    def rebuild(self) -> int:
+        """Discard the sidecar aggregates and fold in the full history again"""
+        logger.info(f"🔄 Rebuilding incremental analytics in {self.sidecar_path}")
+        self._reset(str(self.db.database_path.resolve()))
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """Fold chat_message rows past the watermark into the aggregates; returns rows applied"""
+        with self._lock:
+            # The watermark row was deleted (and its rowid possibly reused by a new message), or
+            # rowids were renumbered by VACUUM: running sums cannot be un-applied, so start over.
+            # A rowid lookup keeps this O(1) on every refresh.
+            watermark = self.watermark
+            if watermark and self._watermark_moved(watermark):
+                logger.warning("⚠️ The analytics watermark row no longer matches chat_message, rebuilding")
+                return self.rebuild()
+
+            # Deletions further back (e.g. a cleared chat) need a count of the rows folded in so far,
+            # so that check runs at most every deletion_check_interval seconds
+            now = time.monotonic()
+            if self._last_deletion_check is None or now - self._last_deletion_check >= self.deletion_check_interval:
+                self._last_deletion_check = now
+                deleted = self.deleted_rows() if watermark else 0
+                if deleted:
+                    logger.warning(f"⚠️ {deleted:,} chat_message rows were deleted since they were folded in, rebuilding")
+                    return self.rebuild()
+
+            applied = 0
+            batch = []
+            for row in self.db._stream_query(DELTA_QUERY, (watermark,)):
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    applied += self._apply_batch(batch)
+                    batch = []
+            if batch:
+                applied += self._apply_batch(batch)
+
+            if applied:
+                logger.info(f"✅ Applied {applied:,} new messages (watermark {self.watermark})")
+            return applied
+
+    def _watermark_moved(self, watermark: int) -> bool:
+        """Whether the row at the watermark is gone or is no longer the message folded in"""
+        rows = self.db._execute_query("SELECT id FROM chat_message WHERE rowid = ?", (watermark,))
+        return not rows or rows[0]['id'] != self._get_meta('watermark_id')
+
+    def deleted_rows(self) -> int:
+        """Rows folded into the aggregates that have since been deleted (counts the source rows behind the watermark)"""
+        with self._lock:
+            watermark = self.watermark
+            rows = self._query_source_value("SELECT COUNT(*) FROM chat_message WHERE rowid <= ?", (watermark,))
+            return max(0, int(self._get_meta('row_count') or 0) - rows)
+
+    def _query_source_value(self, query: str, params: Tuple = ()) -> int:
+        """Run a single-value query against the flowise database"""
+        rows = self.db._execute_query(query, params)
+        return (next(iter(rows[0].values())) if rows else None) or 0
+
+    def _apply_batch(self, rows: List[Tuple]) -> int:
+        """Fold one batch of delta rows into the sidecar in a single transaction"""
+        sessions: Dict[Tuple[str, str], List[Any]] = {}
+        roles: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+        hours: Dict[Tuple[str, str], int] = defaultdict(int)
+        session_days = set()
+
+        for _, _, flow_id, session_id, role, content_length, created, day, hour in rows:
+            role_totals = roles[(flow_id, role)]
+            role_totals[0] += 1
+            role_totals[1] += content_length or 0
+            hours[(flow_id, hour)] += 1
+
+            if session_id is None:
+                continue
+            session_days.add((day, session_id))
+            session = sessions.get((flow_id, session_id))
+            if session is None:
+                sessions[(flow_id, session_id)] = [
+                    1, created, created,
+                    content_length or 0, int(content_length is not None),
+                    int(role == 'userMessage'), int(role == 'apiMessage')
+                ]
+            else:
+                session[0] += 1
+                session[1] = min(session[1], created)
+                session[2] = max(session[2], created)
+                session[3] += content_length or 0
+                session[4] += int(content_length is not None)
+                session[5] += int(role == 'userMessage')
+                session[6] += int(role == 'apiMessage')
+
+        with self._conn:
+            self._conn.executemany(SESSION_UPSERT, [key + tuple(values) for key, values in sessions.items()])
+            self._conn.executemany(ROLE_UPSERT, [key + tuple(values) for key, values in roles.items()])
+            self._conn.executemany(HOURLY_UPSERT, [key + (count,) for key, count in hours.items()])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO session_days (day, sessionId) VALUES (?, ?)", session_days
+            )
+            self._set_meta('watermark', rows[-1][0])
+            self._set_meta('watermark_id', rows[-1][1])
+            self._set_meta('row_count', int(self._get_meta('row_count') or 0) + len(rows))
+            self._set_meta('updated_at', datetime.now().isoformat())
+
+        return len(rows)
+
+    def get_flow_aggregates(self, refresh: bool = True) -> List[Dict[str, Any]]:
+        """Per-flow aggregates in the same shape as FlowStatisticsEngine.compute_flow_aggregates"""
+        if refresh:
+            self.refresh()
+        return self.stats_engine.compute_flow_aggregates()
+
+    def get_sessions(self, flow_id: str) -> List[Dict[str, Any]]:
+        """Per-session message counts and time span for a flow"""
+        return self._execute("""
+        SELECT sessionId, turn_count AS message_count,
+               first_message AS start_time, last_message AS end_time
+        FROM session_aggregates
+        WHERE chatflowid = ?
+        """, (flow_id,))
+
+    def get_session_columns(self, flow_id: str) -> List[Tuple]:
+        """(turns, duration_minutes, start_day) per session for a flow, as plain tuples"""
+        with self._lock:
+            return self._conn.execute("""
+            SELECT turn_count,
+                   ROUND((julianday(last_message) - julianday(first_message)) * 86400000.0) / 60000.0,
+                   DATE(first_message)
+            FROM session_aggregates
+            WHERE chatflowid = ?
+            """, (flow_id,)).fetchall()
+
+    def get_turn_histogram(self, flow_id: str) -> Dict[int, int]:
+        """Number of sessions per turn count for a flow"""
+        rows = self._execute("""
+        SELECT turn_count, COUNT(*) AS sessions
+        FROM session_aggregates
+        WHERE chatflowid = ?
+        GROUP BY turn_count
+        ORDER BY turn_count
+        """, (flow_id,))
+        return {row['turn_count']: row['sessions'] for row in rows}
+
+    def get_role_breakdown(self, flow_id: str) -> List[Dict[str, Any]]:
+        """Message count and average length per role for a flow"""
+        return self._execute("""
+        SELECT role, message_count AS count,
+               CAST(content_length AS REAL) / NULLIF(message_count, 0) AS avg_length
+        FROM role_aggregates
+        WHERE chatflowid = ?
+        """, (flow_id,))
+
+    def get_hourly_usage(self, flow_id: str) -> List[Dict[str, Any]]:
+        """Messages per hour of day for a flow, busiest first"""
+        return self._execute("""
+        SELECT substr(bucket, 12, 2) AS hour, SUM(message_count) AS count
+        FROM hourly_buckets
+        WHERE chatflowid = ?
+        GROUP BY hour
+        ORDER BY count DESC
+        """, (flow_id,))
+
+    def get_daily_activity(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Messages and distinct sessions per day over the last `days` days"""
+        since = (f"-{int(days)} days",)
+        return self._execute("""
+        WITH daily_messages AS (
+            SELECT substr(bucket, 1, 10) AS date, SUM(message_count) AS messages
+            FROM hourly_buckets
+            WHERE bucket >= date('now', ?)
+            GROUP BY date
+        )
+        SELECT date, messages,
+               (SELECT COUNT(*) FROM session_days WHERE day = daily_messages.date) AS sessions
+        FROM daily_messages
+        ORDER BY date DESC
+        """, since)
+
+    def verify(self) -> List[str]:
+        """Compare the incremental aggregates against a full recompute; returns mismatches"""
+        self.refresh()
+        mismatches = []
+
+        deleted = self.deleted_rows()
+        if deleted:
+            mismatches.append(f"{deleted:,} folded-in chat_message rows were deleted (run --rebuild)")
+
+        incremental = {row['chatflowid']: row for row in self.get_flow_aggregates(refresh=False)}
+        full = {row['chatflowid']: row for row in self.db.stats_engine.compute_flow_aggregates()}
+        for flow_id in sorted(set(incremental) | set(full)):
+            inc_row, full_row = incremental.get(flow_id), full.get(flow_id)
+            if inc_row is None or full_row is None:
+                mismatches.append(f"{flow_id}: present in only one side")
+                continue
+            for key, value in full_row.items():
+                other = inc_row.get(key)
+                if isinstance(value, float) or isinstance(other, float):
+                    same = value is not None and other is not None and abs(value - other) < 1e-9
+                    same = same or (value is None and other is None)
+                else:
+                    same = value == other
+                if not same:
+                    mismatches.append(f"{flow_id}: {key} incremental={other!r} full={value!r}")
+
+        roles = self.db._execute_query("""
+        SELECT chatflowid, role, COUNT(*) AS count, SUM(length(content)) AS content_length
+        FROM chat_message GROUP BY chatflowid, role
+        """)
+        expected_roles = {(r['chatflowid'], r['role']): (r['count'], r['content_length'] or 0) for r in roles}
+        actual_roles = {
+            (r['chatflowid'], r['role']): (r['message_count'], r['content_length'])
+            for r in self._execute("SELECT * FROM role_aggregates")
+        }
+        if expected_roles != actual_roles:
+            mismatches.append("role breakdown differs from chat_message")
+
+        hours = self.db._execute_query("""
+        SELECT chatflowid, strftime('%Y-%m-%d %H', createdDate) AS bucket, COUNT(*) AS count
+        FROM chat_message GROUP BY chatflowid, bucket
+        """)
+        expected_hours = {(r['chatflowid'], r['bucket']): r['count'] for r in hours}
+        actual_hours = {
+            (r['chatflowid'], r['bucket']): r['message_count']
+            for r in self._execute("SELECT * FROM hourly_buckets")
+        }
+        if expected_hours != actual_hours:
+            mismatches.append("hourly buckets differ from chat_message")
+
+        return mismatches
+
+    def get_status(self) -> Dict[str, Any]:
+        """Watermark and size of the sidecar aggregates"""
+        with self._lock:
+            return {
+                'sidecar_path': str(self.sidecar_path),
+                'watermark': self.watermark,
+                'rows_applied': int(self._get_meta('row_count') or 0),
+                'sessions': self._conn.execute("SELECT COUNT(*) FROM session_aggregates").fetchone()[0],
+                'updated_at': self._get_meta('updated_at')
+            }
+
+    def close(self) -> None:
+        """Close the sidecar connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """CLI interface for incremental analytics maintenance"""
+    import argparse
+
+    try:
+        from .db_interface import FlowiseDBInterface
+    except ImportError:
+        from db_interface import FlowiseDBInterface
+
+    parser = argparse.ArgumentParser(description="Flowise Incremental Analytics")
+    parser.add_argument("--database", default="/home/jgi/.flowise/database.sqlite",
+                       help="Path to flowise database")
+    parser.add_argument("--sidecar", help="Path to the analytics sidecar (default: next to the database)")
+    parser.add_argument("--rebuild", action="store_true", help="Discard aggregates and rebuild from full history")
+    parser.add_argument("--verify", action="store_true", help="Check aggregates against a full recompute")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        db = FlowiseDBInterface(args.database)
+        analytics = IncrementalAnalytics(db, args.sidecar)
+
+        started = datetime.now()
+        applied = analytics.rebuild() if args.rebuild else analytics.refresh()
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"📈 Applied {applied:,} messages in {elapsed:.2f}s")
+        print(json.dumps(analytics.get_status(), indent=2))
+
+        if args.verify:
+            mismatches = analytics.verify()
+            if mismatches:
+                print(f"❌ {len(mismatches)} mismatches against full recompute")
+                for mismatch in mismatches[:20]:
+                    print(f"   • {mismatch}")
+                raise SystemExit(1)
+            print("✅ Incremental aggregates match the full recompute")
+
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
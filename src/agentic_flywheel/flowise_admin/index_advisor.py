@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Index Advisor - Admin Tool
+Captures the admin query workload, inspects its query plans and creates covering indexes on chat_message
+"""
+
+import re
+import json
+import sqlite3
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from .connection import ConnectionManager
+    from .db_interface import FlowiseDBInterface
+    from .flow_analyzer import FlowAnalyzer
+except ImportError:
+    from connection import ConnectionManager
+    from db_interface import FlowiseDBInterface
+    from flow_analyzer import FlowAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Chosen for the admin workload: per-flow session grouping and min/max timestamps,
+# recent user messages per flow, and date-bounded scans (recent activity, generation probe)
+RECOMMENDED_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "IDX_admin_chat_message_flow_session_created": ("chatflowid", "sessionId", "createdDate"),
+    "IDX_admin_chat_message_flow_role_created": ("chatflowid", "role", "createdDate"),
+    "IDX_admin_chat_message_created": ("createdDate",),
+}
+
+SAMPLE_SEARCH_TERM = "vision"
+
+
+@dataclass
+class QueryPlan:
+    """EXPLAIN QUERY PLAN result for one captured admin query"""
+    sql: str
+    plan: List[str]
+    full_scans: List[str] = field(default_factory=list)
+    temp_btrees: List[str] = field(default_factory=list)
+    seconds: Optional[float] = None
+
+
+def _normalize(sql: str) -> str:
+    """Collapse literals and whitespace so repeated per-flow queries share one key"""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return " ".join(sql.split())
+
+
+class IndexAdvisor:
+    """Finds full scans in the admin queries and adds the indexes that remove them"""
+
+    def __init__(self, database_path: str = "/home/jgi/.flowise/database.sqlite"):
+        self.database_path = Path(database_path)
+        if not self.database_path.exists():
+            raise FileNotFoundError(f"Database not found: {database_path}")
+
+    def capture_workload(self) -> List[str]:
+        """Run the dashboard, flow analysis and search once, recording each distinct chat_message query"""
+        captured: Dict[str, str] = {}
+
+        def record(statement: str) -> None:
+            head = statement.lstrip().upper()
+            if head.startswith(("SELECT", "WITH")) and "chat_message" in statement:
+                captured.setdefault(_normalize(statement), statement)
+
+        # A private connection manager keeps the trace away from other interfaces on this file
+        connections = ConnectionManager(str(self.database_path))
+        connections.set_trace_callback(record)
+        try:
+            db = FlowiseDBInterface(str(self.database_path), connection_manager=connections)
+            db.get_admin_dashboard_data()
+            FlowAnalyzer(db=db).analyze_all_flows()
+            db.search_conversations(SAMPLE_SEARCH_TERM)
+        finally:
+            connections.set_trace_callback(None)
+            connections.close()
+
+        logger.info(f"✅ Captured {len(captured)} distinct admin queries")
+        return list(captured.values())
+
+    def explain(self, statements: List[str], timed: bool = True) -> List[QueryPlan]:
+        """Inspect (and optionally time) each statement against the current schema"""
+        connections = ConnectionManager(str(self.database_path))
+        conn = connections.connection()
+        plans = []
+        try:
+            for sql in statements:
+                details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                plan = QueryPlan(
+                    sql=sql,
+                    plan=details,
+                    full_scans=[d for d in details if d.startswith("SCAN chat_message") and "INDEX" not in d],
+                    temp_btrees=[d for d in details if "TEMP B-TREE" in d]
+                )
+                if timed:
+                    started = time.perf_counter()
+                    conn.execute(sql).fetchall()
+                    plan.seconds = time.perf_counter() - started
+                plans.append(plan)
+        finally:
+            connections.close()
+        return plans
+
+    def existing_indexes(self) -> Dict[str, Tuple[str, ...]]:
+        """Indexes currently defined on chat_message, with their column lists"""
+        with sqlite3.connect(f"{self.database_path.resolve().as_uri()}?mode=ro", uri=True) as conn:
+            names = [row[1] for row in conn.execute("PRAGMA index_list('chat_message')")]
+            return {
+                name: tuple(row[2] for row in conn.execute(f"PRAGMA index_info('{name}')"))
+                for name in names
+            }
+
+    def missing_indexes(self) -> Dict[str, Tuple[str, ...]]:
+        """Recommended indexes not already covered by an existing index with the same leading columns"""
+        existing = list(self.existing_indexes().values())
+        return {
+            name: columns for name, columns in RECOMMENDED_INDEXES.items()
+            if not any(cols[:len(columns)] == columns for cols in existing)
+        }
+
+    def create_indexes(self, analyze: bool = True) -> List[str]:
+        """Create the missing recommended indexes (needs write access to the database file)"""
+        missing = self.missing_indexes()
+        conn = sqlite3.connect(self.database_path, timeout=30)
+        try:
+            for name, columns in missing.items():
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                started = time.perf_counter()
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "chat_message" ({column_list})')
+                logger.info(f"✅ Created {name} ({column_list}) in {time.perf_counter() - started:.2f}s")
+            if analyze and missing:
+                # Planner statistics so SQLite prefers the new indexes where they help
+                conn.execute("ANALYZE chat_message")
+            conn.commit()
+        finally:
+            conn.close()
+        return list(missing)
+
+    def copy_to(self, target_path: str) -> "IndexAdvisor":
+        """Copy the database with the online backup API and return an advisor for the copy"""
+        target = Path(target_path)
+        source = sqlite3.connect(f"{self.database_path.resolve().as_uri()}?mode=ro", uri=True)
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+            source.close()
+        logger.info(f"✅ Copied {self.database_path} to {target}")
+        return IndexAdvisor(str(target))
+
+
+def _print_plans(plans: List[QueryPlan]) -> None:
+    for plan in plans:
+        status = "❌ FULL SCAN" if plan.full_scans else "✅ indexed"
+        timing = f" ({plan.seconds * 1000:.1f} ms)" if plan.seconds is not None else ""
+        print(f"\n{status}{timing}: {' '.join(plan.sql.split())[:120]}")
+        for detail in plan.plan:
+            print(f"   • {detail}")
+
+
+def main():
+    """CLI interface for index inspection and creation"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Flowise Admin Index Advisor")
+    parser.add_argument("--database", default="/home/jgi/.flowise/database.sqlite",
+                       help="Path to flowise database")
+    parser.add_argument("--create", action="store_true",
+                       help="Create missing recommended indexes in the database file")
+    parser.add_argument("--copy-to",
+                       help="Create the indexes in a copy of the database instead of the original")
+    parser.add_argument("--no-timing", action="store_true", help="Only show query plans")
+    parser.add_argument("--export", help="Export the report to JSON file")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    try:
+        advisor = IndexAdvisor(args.database)
+        statements = advisor.capture_workload()
+        before = advisor.explain(statements, timed=not args.no_timing)
+
+        print(f"🔍 Index Advisor: {len(statements)} admin queries on {args.database}")
+        print(f"   📇 Existing indexes: {', '.join(advisor.existing_indexes()) or 'none'}")
+        _print_plans(before)
+
+        full_scans = [plan for plan in before if plan.full_scans]
+        missing = advisor.missing_indexes()
+        print(f"\n📊 {len(full_scans)} of {len(before)} queries scan chat_message without an index")
+        for name, columns in missing.items():
+            print(f"   💡 CREATE INDEX \"{name}\" ON chat_message ({', '.join(columns)})")
+
+        report: Dict[str, Any] = {
+            'database': args.database,
+            'missing_indexes': {name: list(columns) for name, columns in missing.items()},
+            'before': [asdict(plan) for plan in before]
+        }
+
+        if args.create or args.copy_to:
+            target = advisor.copy_to(args.copy_to) if args.copy_to else advisor
+            if not args.copy_to:
+                print("\n⚠️ Writing to the live Flowise database; stop Flowise first or use --copy-to")
+            created = target.create_indexes()
+            after = target.explain(statements, timed=not args.no_timing)
+            report['created_indexes'] = created
+            report['after'] = [asdict(plan) for plan in after]
+
+            print(f"\n🚀 Created {len(created)} indexes in {target.database_path}")
+            for old, new in zip(before, after):
+                if old.seconds is not None and new.seconds is not None:
+                    print(f"   {old.seconds * 1000:8.1f} ms → {new.seconds * 1000:8.1f} ms  "
+                          f"{' '.join(old.sql.split())[:70]}")
+            if not args.no_timing:
+                total_before = sum(plan.seconds for plan in before)
+                total_after = sum(plan.seconds for plan in after)
+                print(f"   ⚡ Total: {total_before * 1000:.1f} ms → {total_after * 1000:.1f} ms")
+            print(f"   📊 Full scans remaining: {sum(1 for plan in after if plan.full_scans)}")
+
+        if args.export:
+            with open(args.export, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"✅ Report exported to {args.export}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Pattern Matcher - Admin Layer
+Data-driven conversation pattern definitions and a compiled multi-keyword matcher that tags messages in one pass
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, FrozenSet, Iterable, Mapping, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PatternDefinition:
+    """A conversation pattern: the keywords that tag a message and what to report when it fires"""
+    pattern_type: str
+    keywords: Tuple[str, ...]
+    context_keywords: Tuple[str, ...] = ()
+    success_indicators: Tuple[str, ...] = ()
+    confidence_divisor: float = 20.0
+    # Flow names this pattern is reported for; empty means tag-only (used in analysis, never reported)
+    flows: Tuple[str, ...] = ()
+
+
+# Order matters: patterns are reported in this order for a flow
+PATTERN_DEFINITIONS: Tuple[PatternDefinition, ...] = (
+    PatternDefinition(
+        pattern_type="vision_creation",
+        keywords=("vision", "want to create", "goal", "dream", "aspire"),
+        context_keywords=("vision", "create", "goal", "dream", "aspire"),
+        success_indicators=("clear vision articulation", "outcome focus"),
+        flows=("creative-orientation",)
+    ),
+    PatternDefinition(
+        pattern_type="outcome_focus",
+        keywords=("outcome", "achieve", "result", "accomplish"),
+        context_keywords=("outcome", "achieve", "result", "accomplish"),
+        success_indicators=("outcome clarity", "action orientation"),
+        flows=("creative-orientation",)
+    ),
+    PatternDefinition(
+        pattern_type="structural_tension",
+        keywords=("tension", "current reality", "desired", "advancement"),
+        context_keywords=("tension", "current reality", "desired", "advancement")
+    ),
+    PatternDefinition(
+        pattern_type="narrative_transformation",
+        keywords=("story", "experience", "journey", "path"),
+        context_keywords=("story", "experience", "journey", "path"),
+        success_indicators=("story structure", "personal connection"),
+        flows=("faith2story",)
+    ),
+    PatternDefinition(
+        pattern_type="spiritual_experience",
+        keywords=("faith", "spiritual", "grace", "meaning", "purpose"),
+        context_keywords=("faith", "spiritual", "grace", "meaning", "purpose")
+    ),
+    PatternDefinition(
+        pattern_type="code_implementation",
+        keywords=("implement", "code", "build", "create", "develop"),
+        context_keywords=("implement", "code", "build", "create", "develop"),
+        success_indicators=("clear requirements", "implementation focus"),
+        confidence_divisor=15.0,
+        flows=("miadi46code",)
+    ),
+    PatternDefinition(
+        pattern_type="problem_solving",
+        keywords=("debug", "fix", "error", "issue", "problem"),
+        context_keywords=("debug", "fix", "error", "issue", "problem")
+    ),
+    PatternDefinition(
+        pattern_type="confusion_indicators",
+        keywords=("unclear", "confused", "wrong", "error")
+    ),
+)
+
+
+class KeywordMatcher:
+    """Finds every category whose keywords occur (as substrings) in a text, in a single regex pass"""
+
+    def __init__(self, keywords_by_category: Mapping[str, Iterable[str]]):
+        categories_by_keyword: Dict[str, set] = {}
+        for category, keywords in keywords_by_category.items():
+            for keyword in keywords:
+                categories_by_keyword.setdefault(keyword.lower(), set()).add(category)
+
+        # Longest-first alternation inside a lookahead reports, at every position, the longest
+        # keyword starting there without consuming it, so overlapping keywords are still seen.
+        # Any shorter keyword starting at the same position is a prefix of that one, so each
+        # keyword maps to the categories of all its keyword prefixes.
+        keywords = sorted(categories_by_keyword, key=len, reverse=True)
+        self._categories: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset().union(*(
+                categories_by_keyword[other] for other in keywords if keyword.startswith(other)
+            ))
+            for keyword in keywords
+        }
+        alternation = "|".join(re.escape(keyword) for keyword in keywords)
+        self._pattern = re.compile(f"(?=({alternation}))") if keywords else None
+        self.category_count = len(keywords_by_category)
+
+    def tag(self, text: str) -> FrozenSet[str]:
+        """Categories with at least one keyword in text (case-insensitive)"""
+        if self._pattern is None or not text:
+            return frozenset()
+        found: set = set()
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._categories[match.group(1)]
+            if len(found) == self.category_count:
+                break
+        return frozenset(found)
+
+
+class ConversationPatternMatcher:
+    """Tags messages with every defined pattern and collects per-pattern examples for a flow"""
+
+    def __init__(self, definitions: Sequence[PatternDefinition] = PATTERN_DEFINITIONS):
+        self.definitions = tuple(definitions)
+        self.matcher = KeywordMatcher({d.pattern_type: d.keywords for d in self.definitions})
+
+    def definitions_for_flow(self, flow_name: str) -> List[PatternDefinition]:
+        """Patterns reported for a flow, in definition order"""
+        return [d for d in self.definitions if flow_name in d.flows]
+
+    def tag(self, text: str) -> FrozenSet[str]:
+        """All pattern types present in one message"""
+        return self.matcher.tag(text)
+
+    def collect(self, contents: Iterable[str], flow_name: str,
+                example_length: int = 100) -> List[Tuple[PatternDefinition, List[str]]]:
+        """Matching message excerpts per reported pattern, skipping patterns with no matches"""
+        definitions = self.definitions_for_flow(flow_name)
+        if not definitions:
+            return []
+
+        examples: Dict[str, List[str]] = {d.pattern_type: [] for d in definitions}
+        for content in contents:
+            for pattern_type in self.tag(content):
+                if pattern_type in examples:
+                    examples[pattern_type].append(content[:example_length])
+
+        return [(d, examples[d.pattern_type]) for d in definitions if examples[d.pattern_type]]
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Conversation Search Index - Admin Layer
+FTS5 full-text index over chat_message content, kept in a sidecar file and advanced from a rowid watermark
+"""
+
+import re
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "1"
+DEFAULT_BATCH_SIZE = 20000
+RESYNC_WINDOW = 500    # indexed rows compared with the source when looking for a resume point
+
+# rowid mirrors chat_message.rowid so hits map straight back to source rows
+SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+    content,
+    chatflowid UNINDEXED,
+    message_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+DELTA_QUERY = """
+SELECT rowid, content, chatflowid, id
+FROM chat_message
+WHERE rowid > ?
+ORDER BY rowid
+"""
+
+MESSAGE_COLUMNS = """
+    rowid, id, role, chatflowid, content, createdDate, sessionId,
+    sourceDocuments, usedTools, chatId, memoryType,
+    agentReasoning, artifacts
+"""
+
+_TOKEN = re.compile(r'"[^"]*"|\S+')
+
+
+def build_match_expression(search_term: str) -> str:
+    """Turn user input into a safe FTS5 query: "quoted phrases", prefix* terms, all ANDed"""
+    parts = []
+    for token in _TOKEN.findall(search_term):
+        prefix = token.endswith('*')
+        text = token.strip('"').rstrip('*').strip('"').replace('"', '""')
+        if not text.strip():
+            continue
+        parts.append(f'"{text}"*' if prefix else f'"{text}"')
+    return " ".join(parts)
+
+
+class ConversationSearchIndex:
+    """BM25-ranked full-text search over chat messages, maintained incrementally"""
+
+    def __init__(self, db, index_path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.index_path = Path(index_path) if index_path else \
+            db.database_path.with_suffix('.search.sqlite')
+        self.batch_size = batch_size
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SEARCH_SCHEMA)
+
+        source = str(db.database_path.resolve())
+        if self._get_meta('schema_version') != SCHEMA_VERSION:
+            # Column layout changed: recreate the virtual table rather than just emptying it
+            self._conn.execute("DROP TABLE message_fts")
+            self._conn.executescript(SEARCH_SCHEMA)
+            self._reset(source)
+        elif self._get_meta('source') != source:
+            self._reset(source)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _reset(self, source: str) -> None:
+        """Empty the index and rewind the watermark"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM message_fts")
+            self._set_meta('schema_version', SCHEMA_VERSION)
+            self._set_meta('source', source)
+            self._set_meta('watermark', 0)
+            self._set_meta('watermark_id', '')
+
+    @property
+    def watermark(self) -> int:
+        """Highest chat_message rowid indexed so far"""
+        return int(self._get_meta('watermark') or 0)
+
+    def rebuild(self) -> int:
+        """Drop the index and re-index the full history"""
+        logger.info(f"🔄 Rebuilding search index in {self.index_path}")
+        self._reset(str(self.db.database_path.resolve()))
+        indexed = self.refresh()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO message_fts (message_fts) VALUES ('optimize')")
+        return indexed
+
+    def refresh(self) -> int:
+        """Index chat_message rows past the watermark; returns rows indexed"""
+        with self._lock:
+            # The watermark row was deleted (its rowid possibly reused by a newer message) or
+            # renumbered by VACUUM: re-index from the last row that still matches.
+            watermark = self.watermark
+            if watermark and not self._watermark_matches(watermark):
+                resume = self._resume_point(watermark)
+                if resume is None:
+                    logger.warning("⚠️ chat_message no longer matches the search index, rebuilding")
+                    return self.rebuild()
+                if resume < watermark:
+                    logger.warning(f"⚠️ chat_message changed after rowid {resume}, re-indexing from there")
+                self._rewind(resume)
+                watermark = resume
+
+            indexed = 0
+            batch = []
+            for row in self.db._stream_query(DELTA_QUERY, (watermark,)):
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    indexed += self._apply_batch(batch)
+                    batch = []
+            if batch:
+                indexed += self._apply_batch(batch)
+
+            if indexed:
+                logger.info(f"✅ Indexed {indexed:,} new messages (watermark {self.watermark})")
+            return indexed
+
+    def _watermark_matches(self, watermark: int) -> bool:
+        """Whether the row at the watermark is still the message indexed there"""
+        rows = self.db._execute_query("SELECT id FROM chat_message WHERE rowid = ?", (watermark,))
+        return bool(rows) and rows[0]['id'] == self._get_meta('watermark_id')
+
+    def _resume_point(self, watermark: int) -> Optional[int]:
+        """Highest indexed rowid whose source row holds the same message, within RESYNC_WINDOW rows of the watermark"""
+        indexed = self._conn.execute(
+            "SELECT rowid, message_id FROM message_fts WHERE rowid <= ? ORDER BY rowid DESC LIMIT ?",
+            (watermark, RESYNC_WINDOW)
+        ).fetchall()
+        if not indexed:
+            return None
+        placeholders = ", ".join("?" for _ in indexed)
+        rows = self.db._execute_query(
+            f"SELECT rowid, id FROM chat_message WHERE rowid IN ({placeholders})",
+            tuple(rowid for rowid, _ in indexed)
+        )
+        source = {row['rowid']: row['id'] for row in rows}
+        return next((rowid for rowid, message_id in indexed if source.get(rowid) == message_id), None)
+
+    def _rewind(self, resume: int) -> None:
+        """Drop index rows past resume and move the watermark back to it"""
+        with self._conn:
+            self._conn.execute("DELETE FROM message_fts WHERE rowid > ?", (resume,))
+            (message_id,) = self._conn.execute(
+                "SELECT message_id FROM message_fts WHERE rowid = ?", (resume,)
+            ).fetchone()
+            self._set_meta('watermark', resume)
+            self._set_meta('watermark_id', message_id)
+
+    def _apply_batch(self, rows: List[Tuple]) -> int:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO message_fts (rowid, content, chatflowid, message_id) VALUES (?, ?, ?, ?)", rows
+            )
+            self._set_meta('watermark', rows[-1][0])
+            self._set_meta('watermark_id', rows[-1][3])
+        return len(rows)
+
+    def search(self, search_term: str, flow_id: Optional[str] = None, limit: int = 20) -> List[Any]:
+        """Return ChatMessage objects matching the term, best BM25 rank first"""
+        expression = build_match_expression(search_term)
+        if not expression:
+            return []
+
+        self.refresh()
+
+        query = "SELECT rowid, message_id FROM message_fts WHERE message_fts MATCH ?"
+        params: List[Any] = [expression]
+        if flow_id:
+            query += " AND chatflowid = ?"
+            params.append(flow_id)
+        query += " ORDER BY bm25(message_fts) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            hits = self._conn.execute(query, params).fetchall()
+        if not hits:
+            return []
+        rowids = [rowid for rowid, _ in hits]
+
+        placeholders = ", ".join("?" for _ in rowids)
+        rows = self.db._execute_query(
+            f"SELECT {MESSAGE_COLUMNS} FROM chat_message WHERE rowid IN ({placeholders})",
+            tuple(rowids)
+        )
+        rows_by_rowid = {row['rowid']: row for row in rows}
+
+        # Hits whose source row is gone (deleted chat, reused rowid) are dropped from the index on sight
+        stale = [
+            rowid for rowid, message_id in hits
+            if rowid not in rows_by_rowid or rows_by_rowid[rowid]['id'] != message_id
+        ]
+        for rowid in stale:
+            rows_by_rowid.pop(rowid, None)
+        if stale:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM message_fts WHERE rowid = ?", [(r,) for r in stale])
+
+        return [self.db._row_to_chat_message(rows_by_rowid[rowid]) for rowid in rowids if rowid in rows_by_rowid]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Watermark and size of the search index"""
+        with self._lock:
+            return {
+                'index_path': str(self.index_path),
+                'watermark': self.watermark,
+                'indexed_messages': self._conn.execute("SELECT COUNT(*) FROM message_fts").fetchone()[0],
+                'checked_at': datetime.now().isoformat()
+            }
+
+    def close(self) -> None:
+        """Close the index connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Session Metrics - Admin Layer
+Columnar session turn and duration statistics, vectorised with NumPy when it is installed
+"""
+
+import logging
+import math
+import statistics
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = np is not None
+
+# Durations come out of SQL already in minutes. julianday() is a fractional day, so the
+# difference is rounded to whole milliseconds to drop floating-point noise.
+SESSION_COLUMNS_QUERY = """
+SELECT
+    COUNT(*) AS turns,
+    ROUND((julianday(MAX(createdDate)) - julianday(MIN(createdDate))) * 86400000.0) / 60000.0 AS duration_minutes,
+    DATE(MIN(createdDate)) AS start_day
+FROM chat_message
+WHERE chatflowid = ? AND sessionId IS NOT NULL
+GROUP BY sessionId
+"""
+
+TURN_BIN_EDGES = (1, 2, 3, 5, 11, 21, 51, math.inf)
+DURATION_BIN_EDGES = (0, 1, 5, 15, 30, 60, 120, 240, math.inf)  # minutes
+
+
+@dataclass
+class SessionColumns:
+    """Per-session turn counts, durations (minutes) and start days as parallel columns"""
+    turns: Any
+    durations: Any
+    start_days: Any
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+
+def load_session_columns(rows: Iterable[Tuple]) -> SessionColumns:
+    """Build columns from (turns, duration_minutes, start_day) rows"""
+    rows = list(rows)
+    if np is None:
+        turns = [row[0] for row in rows]
+        durations = [row[1] or 0.0 for row in rows]
+        start_days = [row[2] for row in rows]
+        return SessionColumns(turns, durations, start_days)
+
+    if not rows:
+        return SessionColumns(np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=object))
+    turns, durations, start_days = zip(*rows)
+    return SessionColumns(
+        np.fromiter(turns, dtype=np.int64, count=len(rows)),
+        np.fromiter((d or 0.0 for d in durations), dtype=np.float64, count=len(rows)),
+        np.array(start_days, dtype=object)
+    )
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile, matching numpy's default method"""
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _histogram(values: Any, edges: Sequence[float]) -> Dict[str, int]:
+    """Counts per [edge, next_edge) bin, keyed by a readable label"""
+    labels = [
+        f"{edges[i]:g}+" if math.isinf(edges[i + 1]) else f"{edges[i]:g}-{edges[i + 1]:g}"
+        for i in range(len(edges) - 1)
+    ]
+    if np is not None:
+        counts = np.histogram(values, bins=np.array(edges, dtype=np.float64))[0].tolist()
+    else:
+        counts = [sum(1 for v in values if edges[i] <= v < edges[i + 1]) for i in range(len(edges) - 1)]
+    return dict(zip(labels, counts))
+
+
+def summarize(values: Any, edges: Sequence[float]) -> Dict[str, Any]:
+    """Mean, median, p90, p99, max and a histogram of one column"""
+    if len(values) == 0:
+        return {}
+    if np is not None:
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        return {
+            'count': int(values.size),
+            'mean': float(values.mean()),
+            'median': float(p50),
+            'p90': float(p90),
+            'p99': float(p99),
+            'max': float(values.max()),
+            'histogram': _histogram(values, edges)
+        }
+
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'mean': statistics.mean(ordered),
+        'median': statistics.median(ordered),
+        'p90': _percentile(ordered, 90),
+        'p99': _percentile(ordered, 99),
+        'max': float(ordered[-1]),
+        'histogram': _histogram(ordered, edges)
+    }
+
+
+def turn_length_distribution(columns: SessionColumns) -> Dict[str, int]:
+    """Short (<=2), medium (3-10) and long (>10) session counts"""
+    turns = columns.turns
+    if np is not None:
+        return {
+            'short_sessions': int(np.count_nonzero(turns <= 2)),
+            'medium_sessions': int(np.count_nonzero((turns >= 3) & (turns <= 10))),
+            'long_sessions': int(np.count_nonzero(turns > 10))
+        }
+    return {
+        'short_sessions': sum(1 for t in turns if t <= 2),
+        'medium_sessions': sum(1 for t in turns if 3 <= t <= 10),
+        'long_sessions': sum(1 for t in turns if t > 10)
+    }
+
+
+def multi_turn_durations(columns: SessionColumns) -> Any:
+    """Durations of sessions with more than one message (single messages have no span)"""
+    if np is not None:
+        return columns.durations[columns.turns > 1]
+    return [d for t, d in zip(columns.turns, columns.durations) if t > 1]
+
+
+def count_completed(columns: SessionColumns) -> int:
+    """Sessions with follow-up (more than two turns)"""
+    if np is not None:
+        return int(np.count_nonzero(columns.turns > 2))
+    return sum(1 for t in columns.turns if t > 2)
+
+
+def count_active_days(columns: SessionColumns) -> int:
+    """Distinct days on which sessions started"""
+    return len(set(columns.start_days.tolist() if np is not None else columns.start_days))
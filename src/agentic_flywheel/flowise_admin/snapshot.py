@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Analysis Snapshot - Admin Layer
+Immutable flow statistics and conversation patterns, computed once per database generation
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cheap fingerprint of chat_message: any insert or delete moves the row count or the newest timestamp
+GENERATION_QUERY = """
+SELECT COUNT(*) AS row_count, MAX(createdDate) AS max_created_date
+FROM chat_message
+"""
+
+
+@dataclass(frozen=True)
+class DatabaseGeneration:
+    """Identifies one state of the chat_message table"""
+    row_count: int
+    max_created_date: Optional[str]
+
+
+@dataclass(frozen=True)
+class AnalysisSnapshot:
+    """Flow statistics and conversation patterns for one database generation"""
+    generation: DatabaseGeneration
+    flow_stats: Tuple[Any, ...]
+    conversation_patterns: Tuple[Any, ...]
+    computed_at: datetime = field(default_factory=datetime.now)
+
+    def stats_for(self, flow_id: str) -> Optional[Any]:
+        """Return the FlowStats for a chatflow, if it has any messages"""
+        for stat in self.flow_stats:
+            if stat.chatflow_id == flow_id:
+                return stat
+        return None
+
+    def patterns_for(self, flow_id: Optional[str] = None) -> Tuple[Any, ...]:
+        """Return the conversation patterns for one chatflow (or all of them)"""
+        if flow_id is None:
+            return self.conversation_patterns
+        return tuple(p for p in self.conversation_patterns if p.flow_id == flow_id)
+
+
+class SnapshotCache:
+    """Memoizes the analysis snapshot until the database generation changes"""
+
+    def __init__(self,
+                 build: Callable[[DatabaseGeneration], AnalysisSnapshot],
+                 probe: Callable[[], DatabaseGeneration]):
+        self._build = build
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._snapshot: Optional[AnalysisSnapshot] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self) -> AnalysisSnapshot:
+        """Return the current snapshot, rebuilding it only if chat_message has changed"""
+        generation = self._probe()
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.generation == generation:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
+            logger.info(f"🔄 Building analysis snapshot ({generation.row_count:,} messages)")
+            self._snapshot = self._build(generation)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next read rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the generation currently cached"""
+        snapshot = self._snapshot
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'generation': {
+                'row_count': snapshot.generation.row_count,
+                'max_created_date': snapshot.generation.max_created_date
+            } if snapshot else None,
+            'computed_at': snapshot.computed_at.isoformat() if snapshot else None
+        }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Flow Statistics Engine - Admin Layer
+Computes per-flow aggregates in a single pass over chat_message using CTEs and window functions
+"""
+
+import logging
+from typing import Dict, List, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# One scan of chat_message grouped by (chatflowid, sessionId). The message_rows subquery
+# narrows each row to fixed-size columns before the GROUP BY sorter sees it (LIMIT -1 keeps
+# SQLite from flattening it back into the outer query), so message bodies are read once
+# and never copied into the temp b-tree.
+SESSION_TURNS_CTE = """
+message_rows AS (
+    SELECT
+        chatflowid,
+        sessionId,
+        createdDate,
+        role = 'userMessage' AS is_user,
+        role = 'apiMessage' AS is_api,
+        length(content) AS content_length
+    FROM chat_message
+    WHERE sessionId IS NOT NULL
+    LIMIT -1
+),
+session_turns AS (
+    SELECT
+        chatflowid,
+        sessionId,
+        COUNT(*) AS turn_count,
+        MIN(createdDate) AS first_message,
+        MAX(createdDate) AS last_message,
+        SUM(content_length) AS content_length,
+        COUNT(content_length) AS content_count,
+        SUM(is_user) AS user_messages,
+        SUM(is_api) AS api_messages
+    FROM message_rows
+    GROUP BY chatflowid, sessionId
+)
+"""
+
+# Every per-flow metric is rolled up from per-session rows (a session_turns CTE with the
+# columns above), and ROW_NUMBER() picks the most active session.
+FLOW_ROLLUP_QUERY = """
+WITH {session_turns},
+ranked_sessions AS (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY chatflowid
+            ORDER BY turn_count DESC, sessionId
+        ) AS turn_rank
+    FROM session_turns
+)
+SELECT
+    chatflowid,
+    SUM(turn_count) AS message_count,
+    COUNT(*) AS session_count,
+    MIN(first_message) AS first_message,
+    MAX(last_message) AS last_message,
+    CAST(SUM(content_length) AS REAL) / NULLIF(SUM(content_count), 0) AS avg_content_length,
+    SUM(user_messages) AS user_messages,
+    SUM(api_messages) AS api_messages,
+    AVG(turn_count) AS avg_turns,
+    MAX(turn_count) AS max_turns,
+    MAX(CASE WHEN turn_rank = 1 THEN sessionId END) AS most_active_session,
+    SUM(turn_count <= 2) AS short_sessions,
+    SUM(turn_count BETWEEN 3 AND 10) AS medium_sessions,
+    SUM(turn_count > 10) AS long_sessions,
+    SUM(turn_count > 2) AS completed_sessions
+FROM ranked_sessions
+GROUP BY chatflowid
+ORDER BY message_count DESC
+"""
+
+FLOW_AGGREGATE_QUERY = FLOW_ROLLUP_QUERY.format(session_turns=SESSION_TURNS_CTE.strip())
+
+
+class FlowStatisticsEngine:
+    """Single-pass aggregate engine behind FlowiseDBInterface.get_flow_statistics"""
+
+    def __init__(self,
+                 execute_query: Callable[[str, Tuple], List[Dict[str, Any]]],
+                 query: str = FLOW_AGGREGATE_QUERY):
+        self._execute_query = execute_query
+        self._query = query
+
+    def compute_flow_aggregates(self) -> List[Dict[str, Any]]:
+        """Return one aggregate row per chatflow, ordered by message count"""
+        rows = self._execute_query(self._query, ())
+        for row in rows:
+            row['turn_distribution'] = {
+                'short_sessions': row['short_sessions'] or 0,
+                'medium_sessions': row['medium_sessions'] or 0,
+                'long_sessions': row['long_sessions'] or 0
+            }
+            row['engagement_score'] = self.engagement_score(row['avg_turns'])
+        return rows
+
+    @staticmethod
+    def engagement_score(avg_turns: float) -> float:
+        """Score based on average conversation length (2+ turns is good), normalized to 0-1"""
+        if not avg_turns:
+            return 0.0
+        return min((avg_turns - 1) / 5.0, 1.0)
@@ -6,16 +6,24 @@ Provides easy integration with the user's Flowise server at beagle-emerging-gnu.
 
 import asyncio
 import json
-import requests
 from typing import Dict, Any, Optional
 
+try:
+    from .agentic_flywheel.flowise_client import get_flowise_client
+except ImportError:
+    from agentic_flywheel.flowise_client import get_flowise_client
+
 # Optional import of MCP server - only if httpx is available
 try:
-    from .flowise_mcp.mcp_server import FlowiseMCPServer
+    from .agentic_flywheel.mcp_server import FlowiseMCPServer
     MCP_AVAILABLE = True
 except ImportError:
-    FlowiseMCPServer = None
-    MCP_AVAILABLE = False
+    try:
+        from agentic_flywheel.mcp_server import FlowiseMCPServer
+        MCP_AVAILABLE = True
+    except ImportError:
+        FlowiseMCPServer = None
+        MCP_AVAILABLE = False
 
 
 class FlowiseIntegrationHelper:
@@ -23,13 +31,14 @@ class FlowiseIntegrationHelper:
     
     def __init__(self, base_url: str = "https://beagle-emerging-gnu.ngrok-free.app"):
         self.base_url = base_url
+        self.client = get_flowise_client(base_url)
         self.mcp_server = FlowiseMCPServer(flowise_base_url=base_url) if MCP_AVAILABLE else None
         
     async def test_connection(self) -> Dict[str, Any]:
         """Test connection to the Flowise server."""
         try:
             # Test with example flow from comment
-            response = requests.get(f"{self.base_url}/api/v1/chatflows", timeout=10)
+            response = await self.client.request("GET", "/api/v1/chatflows", timeout=10)
             if response.status_code == 200:
                 flows = response.json() if response.text else []
                 return {
@@ -63,11 +72,8 @@ class FlowiseIntegrationHelper:
                 }
             }
             
-            response = requests.post(
-                f"{self.base_url}/api/v1/prediction/{example_flow_id}",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
+            response = await self.client.request(
+                "POST", f"/api/v1/prediction/{example_flow_id}", json=payload, timeout=30
             )
             
             if response.status_code == 200:
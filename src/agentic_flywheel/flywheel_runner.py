@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Multi-Cycle Flywheel Runner
+Chains flywheel cycles per session, runs sessions concurrently under one budget and streams full results to disk
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Any, Iterable, List, Optional, Union
+
+try:
+    from .persona_system import FlywheelPersonaOrchestrator, FlywheelCycleResult
+except ImportError:
+    from persona_system import FlywheelPersonaOrchestrator, FlywheelCycleResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_CYCLES = 4    # cycles in flight across all sessions (each queries up to 4 personas at once)
+DEFAULT_RETAIN_CYCLES = 10           # summaries kept per session
+DEFAULT_RETAIN_SESSIONS = 1000       # sessions whose summaries are kept (least recently active dropped first)
+
+
+@dataclass
+class CycleSummary:
+    """Compact record of one completed cycle; the full result lives on disk"""
+    session_id: str
+    cycle_number: int
+    next_cycle_input: str
+    key_themes: List[str]
+    persona_count: int
+    insight_count: int
+    duration_s: float
+    completed_at: str
+    output_path: Optional[str] = None
+
+    @classmethod
+    def from_result(cls, result: FlywheelCycleResult, duration: float,
+                    output_path: Optional[str] = None) -> "CycleSummary":
+        return cls(
+            session_id=result.session_id,
+            cycle_number=result.cycle_number,
+            next_cycle_input=result.next_cycle_input,
+            key_themes=list(result.synthesis.get("key_themes", [])),
+            persona_count=len(result.persona_outputs),
+            insight_count=len(result.emergent_insights),
+            duration_s=round(duration, 3),
+            completed_at=datetime.now().isoformat(),
+            output_path=output_path
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SessionPlan:
+    """One chain of cycles to run: the opening query and how many cycles follow from it"""
+    input_query: str
+    cycles: int = 1
+    session_id: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None
+
+
+class FlywheelRunner:
+    """Runs chained flywheel cycles for many sessions with bounded concurrency and bounded memory
+
+    Each cycle's next_cycle_input feeds the session's next cycle. Sessions are independent, so
+    their cycles interleave, at most max_concurrent_cycles at a time. As each cycle completes its
+    to_dict() is appended to <output_dir>/<session_id>.jsonl and only a CycleSummary stays in
+    memory: the last retain_cycles per session, for the retain_sessions most recently active sessions.
+    """
+
+    def __init__(self, orchestrator: Optional[FlywheelPersonaOrchestrator] = None,
+                 output_dir: Optional[Union[str, Path]] = None,
+                 max_concurrent_cycles: int = DEFAULT_MAX_CONCURRENT_CYCLES,
+                 retain_cycles: int = DEFAULT_RETAIN_CYCLES,
+                 retain_sessions: int = DEFAULT_RETAIN_SESSIONS):
+        self.orchestrator = orchestrator or FlywheelPersonaOrchestrator()
+        self.output_dir = Path(output_dir).expanduser() if output_dir else None
+        self.max_concurrent_cycles = max(1, max_concurrent_cycles)
+        self.retain_cycles = max(1, retain_cycles)
+        self.retain_sessions = max(1, retain_sessions)
+        self.summaries: "OrderedDict[str, Deque[CycleSummary]]" = OrderedDict()
+        self.errors: "OrderedDict[str, str]" = OrderedDict()
+        self._budget: Optional[asyncio.Semaphore] = None
+        self.metrics = {"cycles": 0, "failed_sessions": 0, "bytes_written": 0, "in_flight": 0, "max_in_flight": 0}
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _slot(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore belongs to the loop that runs the cycles
+        if self._budget is None:
+            self._budget = asyncio.Semaphore(self.max_concurrent_cycles)
+        return self._budget
+
+    def _write(self, result: FlywheelCycleResult) -> Optional[str]:
+        """Append the full cycle result as one JSON line to the session's file"""
+        if not self.output_dir:
+            return None
+        path = self.output_dir / f"{result.session_id}.jsonl"
+        line = json.dumps(result.to_dict(), default=str) + "\n"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        self.metrics["bytes_written"] += len(line.encode("utf-8"))
+        return str(path)
+
+    def _remember(self, summary: CycleSummary) -> None:
+        history = self.summaries.get(summary.session_id)
+        if history is None:
+            history = self.summaries[summary.session_id] = deque(maxlen=self.retain_cycles)
+            while len(self.summaries) > self.retain_sessions:
+                self.summaries.popitem(last=False)
+        else:
+            self.summaries.move_to_end(summary.session_id)
+        history.append(summary)
+
+    def _record_error(self, session_id: str, error: Exception) -> None:
+        # Bounded like the summaries: errors of the retain_sessions most recent failures
+        self.errors.pop(session_id, None)
+        self.errors[session_id] = str(error)
+        while len(self.errors) > self.retain_sessions:
+            self.errors.popitem(last=False)
+
+    async def run_session(self, input_query: str, cycles: int = 1, session_id: Optional[str] = None,
+                          context: Optional[Dict[str, Any]] = None, first_cycle: int = 1) -> List[CycleSummary]:
+        """Run cycles chained through next_cycle_input; returns the session's retained summaries (see get_history)"""
+        session_id = session_id or self.orchestrator.generate_session_id()
+        query = input_query
+        for cycle_number in range(first_cycle, first_cycle + cycles):
+            async with self._slot():
+                self.metrics["in_flight"] += 1
+                self.metrics["max_in_flight"] = max(self.metrics["max_in_flight"], self.metrics["in_flight"])
+                started = time.perf_counter()
+                try:
+                    result = await self.orchestrator.execute_flywheel_cycle(
+                        input_query=query, session_id=session_id, context=context, cycle_number=cycle_number
+                    )
+                finally:
+                    self.metrics["in_flight"] -= 1
+            duration = time.perf_counter() - started
+
+            summary = CycleSummary.from_result(result, duration, self._write(result))
+            # Only the summary stays in memory; drop the orchestrator's copy of the full result
+            self.orchestrator.active_sessions.delete(session_id)
+            self._remember(summary)
+            self.metrics["cycles"] += 1
+            query = result.next_cycle_input
+        return self.get_history(session_id)
+
+    async def run(self, plans: Iterable[Union[SessionPlan, str]], cycles: int = 1) -> Dict[str, List[CycleSummary]]:
+        """Run several sessions concurrently (plain strings become plans of `cycles` cycles)
+
+        Returns the retained summaries of the sessions that are still retained. A failing session
+        stops on its own; the others carry on and the error is kept in self.errors.
+        """
+        plans = [plan if isinstance(plan, SessionPlan) else SessionPlan(plan, cycles) for plan in plans]
+        for plan in plans:
+            plan.session_id = plan.session_id or self.orchestrator.generate_session_id()
+
+        async def run_plan(plan: SessionPlan) -> None:
+            try:
+                await self.run_session(plan.input_query, plan.cycles, plan.session_id, plan.context)
+            except Exception as e:
+                logger.error(f"❌ Flywheel session {plan.session_id} failed: {e}")
+                self._record_error(plan.session_id, e)
+                self.metrics["failed_sessions"] += 1
+
+        await asyncio.gather(*(run_plan(plan) for plan in plans))
+        return {plan.session_id: self.get_history(plan.session_id)
+                for plan in plans if plan.session_id in self.summaries}
+
+    def get_history(self, session_id: str) -> List[CycleSummary]:
+        """Retained summaries of a session, oldest first"""
+        return list(self.summaries.get(session_id, []))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "sessions_retained": len(self.summaries),
+            "summaries_retained": sum(len(history) for history in self.summaries.values()),
+            "errors": len(self.errors),
+            "max_concurrent_cycles": self.max_concurrent_cycles,
+            "output_dir": str(self.output_dir) if self.output_dir else None,
+        }
+
+
+def iter_cycle_results(path: Union[str, Path]) -> Iterable[Dict[str, Any]]:
+    """Read back the cycle dicts a runner streamed to a session file, one at a time"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -8,10 +8,18 @@ flywheel-persona-generation-prompt.md documentation.
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 from enum import Enum
+import asyncio
 import json
 import uuid
 from datetime import datetime
 
+try:
+    from .agentic_flywheel.session_store import MemorySessionStore
+except ImportError:
+    from agentic_flywheel.session_store import MemorySessionStore
+
+DEFAULT_PERSONA_TIMEOUT = 120.0  # seconds one persona query may take before its fallback answer is used
+
 
 class PersonaType(Enum):
     STRUCTURAL_DIAGNOSTICIAN = "structural_diagnostician"
@@ -209,10 +217,13 @@ Generate blueprints for creative possibility that honor all the wisdom gathered.
 class FlywheelPersonaOrchestrator:
     """Orchestrates the four-persona flywheel collaboration."""
     
-    def __init__(self, backend_manager=None):
+    def __init__(self, backend_manager=None, persona_timeout: Optional[float] = DEFAULT_PERSONA_TIMEOUT):
         self.backend_manager = backend_manager
+        # Per-query limit; a persona that overruns is cancelled and answers with the fallback
+        self.persona_timeout = persona_timeout
         self.prompt_generator = PersonaPromptGenerator()
-        self.active_sessions = {}
+        # Recent cycle results by session, bounded and expiring
+        self.active_sessions = MemorySessionStore()
     
     def generate_session_id(self, prefix: str = "flywheel") -> str:
         """Generate a unique session ID for flywheel cycles."""
@@ -258,7 +269,7 @@ class FlywheelPersonaOrchestrator:
         )
         
         # Store session for potential next cycles
-        self.active_sessions[session_id] = result
+        self.active_sessions.set(session_id, result)
         
         return result
     
@@ -267,31 +278,24 @@ class FlywheelPersonaOrchestrator:
         input_query: str, 
         context: Optional[Dict[str, Any]] = None
     ) -> Dict[PersonaType, PersonaOutput]:
-        """Phase 1: Each persona analyzes the input independently."""
-        
-        persona_outputs = {}
-        
-        # Structural Diagnostician
-        struct_prompt = self.prompt_generator.get_structural_diagnostician_prompt(input_query, context)
-        struct_result = await self._query_persona(struct_prompt, PersonaType.STRUCTURAL_DIAGNOSTICIAN)
-        persona_outputs[PersonaType.STRUCTURAL_DIAGNOSTICIAN] = struct_result
-        
-        # Narrative Alchemist  
-        narrative_prompt = self.prompt_generator.get_narrative_alchemist_prompt(input_query, context=context)
-        narrative_result = await self._query_persona(narrative_prompt, PersonaType.NARRATIVE_ALCHEMIST)
-        persona_outputs[PersonaType.NARRATIVE_ALCHEMIST] = narrative_result
-        
-        # Ceremonial Researcher
-        ceremonial_prompt = self.prompt_generator.get_ceremonial_researcher_prompt(input_query, context=context)
-        ceremonial_result = await self._query_persona(ceremonial_prompt, PersonaType.CEREMONIAL_RESEARCHER)
-        persona_outputs[PersonaType.CEREMONIAL_RESEARCHER] = ceremonial_result
-        
-        # Creative Architect
-        architect_prompt = self.prompt_generator.get_creative_architect_prompt(input_query, context=context)
-        architect_result = await self._query_persona(architect_prompt, PersonaType.CREATIVE_ARCHITECT)
-        persona_outputs[PersonaType.CREATIVE_ARCHITECT] = architect_result
+        """Phase 1: Each persona analyzes the input independently (all four queried concurrently)."""
+        
+        prompts = {
+            # Structural Diagnostician
+            PersonaType.STRUCTURAL_DIAGNOSTICIAN:
+                self.prompt_generator.get_structural_diagnostician_prompt(input_query, context),
+            # Narrative Alchemist
+            PersonaType.NARRATIVE_ALCHEMIST:
+                self.prompt_generator.get_narrative_alchemist_prompt(input_query, context=context),
+            # Ceremonial Researcher
+            PersonaType.CEREMONIAL_RESEARCHER:
+                self.prompt_generator.get_ceremonial_researcher_prompt(input_query, context=context),
+            # Creative Architect
+            PersonaType.CREATIVE_ARCHITECT:
+                self.prompt_generator.get_creative_architect_prompt(input_query, context=context),
+        }
         
-        return persona_outputs
+        return await self._query_personas(prompts)
     
     async def _cross_pollination_phase(
         self, 
@@ -299,7 +303,10 @@ class FlywheelPersonaOrchestrator:
         initial_outputs: Dict[PersonaType, PersonaOutput],
         context: Optional[Dict[str, Any]] = None
     ) -> Dict[PersonaType, PersonaOutput]:
-        """Phase 2: Personas enrich their analysis with others' perspectives."""
+        """Phase 2: Personas enrich their analysis with others' perspectives.
+        
+        Every enriched prompt depends only on the phase 1 analyses, so the re-runs are queried concurrently.
+        """
         
         # Collect all initial analyses
         all_analyses = {
@@ -307,39 +314,53 @@ class FlywheelPersonaOrchestrator:
             for persona_type, output in initial_outputs.items()
         }
         
-        enriched_outputs = {}
+        prompts = {}
         
         # Re-run each persona with access to others' outputs
-        for persona_type, initial_output in initial_outputs.items():
-            if persona_type == PersonaType.STRUCTURAL_DIAGNOSTICIAN:
-                # Structural diagnostician builds on their foundation
-                enriched_outputs[persona_type] = initial_output
-            elif persona_type == PersonaType.NARRATIVE_ALCHEMIST:
+        for persona_type in initial_outputs:
+            if persona_type == PersonaType.NARRATIVE_ALCHEMIST:
                 # Narrative alchemist weaves structural analysis into story
-                prompt = self.prompt_generator.get_narrative_alchemist_prompt(
+                prompts[persona_type] = self.prompt_generator.get_narrative_alchemist_prompt(
                     input_query, 
                     all_analyses.get(PersonaType.STRUCTURAL_DIAGNOSTICIAN.value, ""),
                     context
                 )
-                enriched_outputs[persona_type] = await self._query_persona(prompt, persona_type)
             elif persona_type == PersonaType.CEREMONIAL_RESEARCHER:
                 # Ceremonial researcher sees all prior perspectives
                 prior_analyses = {
                     k: v for k, v in all_analyses.items() 
                     if k != PersonaType.CEREMONIAL_RESEARCHER.value
                 }
-                prompt = self.prompt_generator.get_ceremonial_researcher_prompt(
+                prompts[persona_type] = self.prompt_generator.get_ceremonial_researcher_prompt(
                     input_query, prior_analyses, context
                 )
-                enriched_outputs[persona_type] = await self._query_persona(prompt, persona_type)
             elif persona_type == PersonaType.CREATIVE_ARCHITECT:
                 # Creative architect synthesizes all perspectives
-                prompt = self.prompt_generator.get_creative_architect_prompt(
+                prompts[persona_type] = self.prompt_generator.get_creative_architect_prompt(
                     input_query, all_analyses, context
                 )
-                enriched_outputs[persona_type] = await self._query_persona(prompt, persona_type)
         
-        return enriched_outputs
+        enriched = await self._query_personas(prompts)
+        
+        # Structural diagnostician builds on their foundation; keep the phase 1 order
+        return {
+            persona_type: enriched.get(persona_type, initial_output)
+            for persona_type, initial_output in initial_outputs.items()
+        }
+    
+    async def _query_personas(self, prompts: Dict[PersonaType, str]) -> Dict[PersonaType, PersonaOutput]:
+        """Query independent personas concurrently; if one fails or the caller is cancelled, the rest are cancelled."""
+        tasks = [
+            asyncio.ensure_future(self._query_persona(prompt, persona_type))
+            for persona_type, prompt in prompts.items()
+        ]
+        try:
+            outputs = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return dict(zip(prompts, outputs))
     
     async def _synthesis_phase(
         self, 
@@ -442,7 +463,9 @@ class FlywheelPersonaOrchestrator:
         if self.backend_manager:
             try:
                 # Try to use the backend manager if available
-                result = await self.backend_manager.query_flow(prompt, persona_type.value)
+                result = await asyncio.wait_for(
+                    self.backend_manager.query_flow(prompt, persona_type.value), self.persona_timeout
+                )
                 response = result.get("text", "No response received")
             except Exception as e:
                 response = f"Mock response for {persona_type.value}: Analysis of the input based on {persona_type.value} methodology."
@@ -0,0 +1,44 @@
+"""
+Shared fixtures: the project root on sys.path (as the benchmarks do) and small synthetic Flowise databases
+"""
+
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_db import generate_database
+
+
+@pytest.fixture
+def flowise_db(tmp_path):
+    """A synthetic Flowise database with a few thousand chat messages"""
+    return generate_database(str(tmp_path / "database.sqlite"), messages=2000, flows=6)
+
+
+@pytest.fixture
+def add_message(flowise_db):
+    """Insert a chat message (copied from an existing one, new id and content); returns its id"""
+    def add(content: str = "freshly added message") -> str:
+        message_id = str(uuid.uuid4())
+        with sqlite3.connect(str(flowise_db)) as conn:
+            conn.execute(
+                "INSERT INTO chat_message (id, role, chatflowid, content, chatType, chatId, sessionId, createdDate) "
+                "SELECT ?, role, chatflowid, ?, chatType, chatId, sessionId, createdDate FROM chat_message LIMIT 1",
+                (message_id, content)
+            )
+        return message_id
+    return add
+
+
+@pytest.fixture
+def delete_messages(flowise_db):
+    """Delete chat messages matching a WHERE clause"""
+    def delete(where: str, params: tuple = ()) -> None:
+        with sqlite3.connect(str(flowise_db)) as conn:
+            conn.execute(f"DELETE FROM chat_message WHERE {where}", params)
+    return delete
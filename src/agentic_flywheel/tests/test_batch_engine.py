@@ -0,0 +1,70 @@
+"""
+Batch engine: input-ordered results, per-item timeouts and failure isolation, bounded concurrency
+"""
+
+import asyncio
+
+import pytest
+
+from agentic_flywheel.batch_engine import (
+    BatchEngine, BatchItemResult, BatchTooLargeError, summarize_results
+)
+
+
+async def sleep_then_answer(item):
+    await asyncio.sleep(item["delay"])
+    if item.get("fail"):
+        raise RuntimeError("flow failed")
+    return BatchItemResult(index=-1, success=True, response=item["name"])
+
+
+@pytest.mark.asyncio
+async def test_run_keeps_input_order():
+    engine = BatchEngine(sleep_then_answer)
+    items = [{"name": "slow", "delay": 0.05}, {"name": "fast", "delay": 0.0}, {"name": "mid", "delay": 0.02}]
+    results = await engine.run(items)
+    assert [r.response for r in results] == ["slow", "fast", "mid"]
+    assert [r.index for r in results] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_failures_are_isolated():
+    engine = BatchEngine(sleep_then_answer, item_timeout=0.05)
+    results = await engine.run([
+        {"name": "ok", "delay": 0.0},
+        {"name": "stuck", "delay": 5.0},
+        {"name": "broken", "delay": 0.0, "fail": True},
+    ])
+    assert results[0].success
+    assert results[1].timed_out and not results[1].success
+    assert results[2].error == "flow failed"
+    assert summarize_results(results) == {"processed_count": 3, "failed_count": 2, "timed_out_count": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_in_completion_order():
+    engine = BatchEngine(sleep_then_answer)
+    items = [{"name": "slow", "delay": 0.05}, {"name": "fast", "delay": 0.0}]
+    streamed = [result.response async for result in engine.stream(items)]
+    assert streamed == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    in_flight = peak = 0
+
+    async def execute(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return BatchItemResult(index=-1, success=True)
+
+    await BatchEngine(execute, concurrency=3).run(list(range(10)))
+    assert peak == 3
+
+
+def test_oversized_batch_is_rejected():
+    with pytest.raises(BatchTooLargeError):
+        BatchEngine(sleep_then_answer, max_batch_size=2).check_size([1, 2, 3])
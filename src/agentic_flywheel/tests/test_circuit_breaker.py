@@ -0,0 +1,71 @@
+"""
+Circuit breaker: closed -> open -> half-open -> closed/open transitions on an injected clock
+"""
+
+from agentic_flywheel.resilience import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(threshold=3, reset=10.0):
+    clock = FakeClock()
+    return CircuitBreaker(threshold=threshold, reset=reset, clock=clock), clock
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker, _ = make_breaker()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker, _ = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_closes_on_success():
+    breaker, clock = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 5.0
+    assert not breaker.allow() and breaker.retry_after() == 5.0
+    clock.now = 10.0
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # only one probe
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker, clock = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 15.0
+    assert not breaker.allow()
+    clock.now = 20.0
+    assert breaker.allow()
+
+
+def test_zero_threshold_disables_the_breaker():
+    breaker, _ = make_breaker(threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.allow() and breaker.state == CircuitBreaker.CLOSED
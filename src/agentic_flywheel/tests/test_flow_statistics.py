@@ -0,0 +1,28 @@
+"""
+Flow statistics: the single-pass aggregate engine matches the per-flow reference queries
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+from flowise_admin.db_interface import FlowiseDBInterface
+
+
+def by_flow(stats):
+    return {stat.chatflow_id: asdict(stat) for stat in stats}
+
+
+def test_single_pass_engine_matches_per_flow_reference(flowise_db):
+    db = FlowiseDBInterface(str(flowise_db))
+    reference = by_flow(db._get_flow_statistics_per_flow())
+    engine = by_flow(db.get_flow_statistics())
+
+    assert reference and set(engine) == set(reference)
+    for flow_id, expected in reference.items():
+        actual = engine[flow_id]
+        for field, value in expected.items():
+            if isinstance(value, float):
+                assert actual[field] == pytest.approx(value, abs=1e-9), (flow_id, field)
+            else:
+                assert actual[field] == value, (flow_id, field)
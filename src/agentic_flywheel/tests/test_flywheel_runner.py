@@ -0,0 +1,58 @@
+"""
+Flywheel runner: chained cycles, bounded retention of summaries and errors, streamed results
+"""
+
+import pytest
+
+from flywheel_runner import FlywheelRunner, SessionPlan, iter_cycle_results
+from persona_system import FlywheelPersonaOrchestrator
+
+
+class InstantBackend:
+    """Answers every persona query immediately"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def query_flow(self, prompt, persona):
+        self.calls += 1
+        return {"text": f"{persona} answer {self.calls}"}
+
+
+class FailingOrchestrator(FlywheelPersonaOrchestrator):
+    async def execute_flywheel_cycle(self, **kwargs):
+        raise RuntimeError("persona backend down")
+
+
+@pytest.mark.asyncio
+async def test_cycles_chain_and_stream_to_disk(tmp_path):
+    runner = FlywheelRunner(FlywheelPersonaOrchestrator(InstantBackend()), output_dir=tmp_path)
+    history = await runner.run_session("How do we grow a practice?", cycles=3, session_id="s1")
+    assert [s.cycle_number for s in history] == [1, 2, 3]
+    results = list(iter_cycle_results(history[-1].output_path))
+    assert [r["cycle_number"] for r in results] == [1, 2, 3]
+    assert {r["session_id"] for r in results} == {"s1"}
+    assert len(runner.orchestrator.active_sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_retains_only_recent_cycles_and_sessions():
+    runner = FlywheelRunner(FlywheelPersonaOrchestrator(InstantBackend()), max_concurrent_cycles=2,
+                            retain_cycles=2, retain_sessions=3)
+    returned = await runner.run([SessionPlan(f"query {i}", cycles=4, session_id=f"s{i}") for i in range(5)])
+    assert runner.metrics["cycles"] == 20
+    assert len(runner.summaries) == 3
+    assert set(returned) == set(runner.summaries)
+    # A session dropped mid-run comes back with its later cycles only
+    assert all(len(history) <= 2 and history[-1].cycle_number == 4 for history in returned.values())
+    assert runner.get_stats()["summaries_retained"] <= 6
+    assert runner.metrics["max_in_flight"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_bounded():
+    runner = FlywheelRunner(FailingOrchestrator(), retain_sessions=3)
+    assert await runner.run([f"query {i}" for i in range(10)]) == {}
+    assert runner.metrics["failed_sessions"] == 10
+    assert len(runner.errors) == 3
+    assert set(runner.errors.values()) == {"persona backend down"}
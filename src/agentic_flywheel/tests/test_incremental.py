@@ -0,0 +1,66 @@
+"""
+Incremental analytics: delta refresh, watermark checks and verify() against a full recompute
+"""
+
+import pytest
+
+from flowise_admin.db_interface import FlowiseDBInterface
+from flowise_admin.incremental import IncrementalAnalytics
+
+
+@pytest.fixture
+def analytics(flowise_db, tmp_path):
+    analytics = IncrementalAnalytics(FlowiseDBInterface(str(flowise_db)), str(tmp_path / "analytics.sqlite"))
+    yield analytics
+    analytics.close()
+
+
+def test_refresh_folds_in_full_history_and_verifies(analytics):
+    applied = analytics.refresh()
+    assert applied > 0
+    assert analytics.get_status()['rows_applied'] == applied
+    assert analytics.verify() == []
+
+
+def test_refresh_applies_only_new_rows(analytics, add_message):
+    analytics.refresh()
+    add_message()
+    add_message()
+    assert analytics.refresh() == 2
+    assert analytics.refresh() == 0
+    assert analytics.verify() == []
+
+
+def test_reused_watermark_rowid_triggers_rebuild(analytics, add_message, delete_messages):
+    analytics.refresh()
+    delete_messages("rowid = ?", (analytics.watermark,))
+    add_message()  # takes the deleted newest row's rowid
+    rows = analytics.refresh()
+    assert rows == analytics.get_status()['rows_applied']  # rebuilt from scratch
+    assert analytics.verify() == []
+
+
+def test_older_deletion_triggers_rebuild(flowise_db, tmp_path, add_message, delete_messages):
+    analytics = IncrementalAnalytics(FlowiseDBInterface(str(flowise_db)), str(tmp_path / "analytics.sqlite"),
+                                     deletion_check_interval=0)
+    total = analytics.refresh()
+    delete_messages("rowid = 10")  # e.g. a cleared chat, balanced by a new message
+    add_message()
+    assert analytics.refresh() == total  # rebuilt: one row gone, one added
+    assert analytics.deleted_rows() == 0
+    assert analytics.verify() == []
+    analytics.close()
+
+
+def test_deletion_check_is_throttled(analytics, add_message, delete_messages):
+    analytics.refresh()
+    delete_messages("rowid = 10")
+    add_message()
+    assert analytics.refresh() == 1  # within the check interval: only the delta is applied
+    assert analytics.deleted_rows() == 1
+    assert any("deleted" in mismatch for mismatch in analytics.verify())
+
+    analytics._last_deletion_check -= analytics.deletion_check_interval
+    analytics.refresh()
+    assert analytics.deleted_rows() == 0
+    assert analytics.verify() == []
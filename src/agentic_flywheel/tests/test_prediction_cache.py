@@ -0,0 +1,75 @@
+"""
+Prediction cache: key normalisation, session bypass, LRU bound, expiry and the SQLite tier
+"""
+
+import time
+
+from agentic_flywheel.prediction_cache import PredictionCache, caller_session, make_cache_key
+
+LOW_TEMPERATURE = {"temperature": 0}
+
+
+def test_key_ignores_case_whitespace_and_session_id():
+    key = make_cache_key("flow", "What is  Structural Tension?", {"temperature": 0, "sessionId": "a"})
+    assert key == make_cache_key("flow", "what is structural tension?", {"temperature": 0, "sessionId": "b"})
+    assert key != make_cache_key("other-flow", "what is structural tension?", LOW_TEMPERATURE)
+    assert key != make_cache_key("flow", "what is structural tension?", {"temperature": 0, "topK": 3})
+
+
+def test_high_or_missing_temperature_is_not_cached():
+    cache = PredictionCache()
+    assert cache.key_for("flow", "q", {"temperature": 0.9}) is None
+    assert cache.key_for("flow", "q", None) is None
+    assert cache.key_for("flow", "q", LOW_TEMPERATURE) is not None
+
+
+def test_caller_session_bypasses_without_history_hasher():
+    cache = PredictionCache()
+    assert cache.key_for("flow", "q", LOW_TEMPERATURE, session_id="session-a") is None
+    assert cache.key_for("flow", "q", LOW_TEMPERATURE, caller_session(None, {"sessionId": "b"})) is None
+    assert cache.metrics["bypasses"] == 2
+
+
+def test_history_hasher_separates_sessions():
+    histories = {"session-a": "h1", "session-b": "h2"}
+    cache = PredictionCache(history_hasher=histories.get)
+    key_a = cache.key_for("flow", "q", LOW_TEMPERATURE, session_id="session-a")
+    key_b = cache.key_for("flow", "q", LOW_TEMPERATURE, session_id="session-b")
+    assert None not in (key_a, key_b) and key_a != key_b
+    cache.put(key_a, {"text": "answer for a"})
+    assert cache.get(key_b) is None
+
+
+def test_caller_session_prefers_explicit_session():
+    assert caller_session("explicit", {"sessionId": "override"}) == "explicit"
+    assert caller_session(None, {"sessionId": "override"}) == "override"
+    assert caller_session(None, {"temperature": 0}) is None
+
+
+def test_hits_are_copies_and_lru_evicts_oldest():
+    cache = PredictionCache(max_entries=2)
+    cache.put("a", {"text": "A"})
+    cache.put("b", {"text": "B"})
+    cache.get("a")["text"] = "mutated"
+    assert cache.get("a") == {"text": "A"}
+    cache.put("c", {"text": "C"})  # "b" is now least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.metrics["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl=0.05)
+    cache.put("a", {"text": "A"})
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.metrics["expirations"] == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    db_path = str(tmp_path / "predictions.sqlite")
+    PredictionCache(db_path=db_path).put("a", {"text": "A"})
+    cache = PredictionCache(db_path=db_path)
+    assert cache.get("a") == {"text": "A"}
+    assert cache.metrics["disk_hits"] == 1
+    assert cache.get("a") == {"text": "A"}
+    assert cache.metrics["memory_hits"] == 1
@@ -0,0 +1,47 @@
+"""
+Conversation search index: incremental FTS refresh and recovery when the watermark row changes
+"""
+
+import pytest
+
+from flowise_admin.db_interface import FlowiseDBInterface
+from flowise_admin.search_index import ConversationSearchIndex, build_match_expression
+
+
+@pytest.fixture
+def index(flowise_db, tmp_path):
+    index = ConversationSearchIndex(FlowiseDBInterface(str(flowise_db)), str(tmp_path / "search.sqlite"))
+    yield index
+    index.close()
+
+
+def indexed(index) -> int:
+    return index.get_status()['indexed_messages']
+
+
+def test_refresh_indexes_only_new_rows(index, add_message):
+    total = index.refresh()
+    assert total == indexed(index)
+    message_id = add_message("quokkas enjoy structural tension")
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+    assert [m.id for m in index.search("quokka*")] == [message_id]
+
+
+def test_reused_rowid_is_reindexed_from_last_matching_row(index, add_message, delete_messages):
+    index.refresh()
+    before = indexed(index)
+    first = add_message("pangolin notes")
+    index.refresh()
+
+    delete_messages("id = ?", (first,))
+    second = add_message("axolotl notes")  # reuses the deleted row's rowid
+    assert index.refresh() == 1
+    assert indexed(index) == before + 1
+    assert [m.id for m in index.search("axolotl")] == [second]
+    assert index.search("pangolin") == []
+
+
+def test_match_expression_quotes_user_input():
+    assert build_match_expression('vision "desired outcome" struct*') == '"vision" "desired outcome" "struct"*'
+    assert build_match_expression('"" *') == ""
@@ -0,0 +1,102 @@
+"""
+Session stores: TTL expiry, LRU bound, touch counting and paging for the memory and SQLite backends
+"""
+
+import time
+
+import pytest
+
+from agentic_flywheel.session_store import MemorySessionStore, SQLiteSessionStore, SessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            store = MemorySessionStore(**kwargs)
+        else:
+            store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        if hasattr(store, "close"):
+            store.close()
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+
+def test_touch_creates_and_counts(make_store):
+    store = make_store()
+    store.touch("a", defaults={"flow_type": "csv"})
+    record = store.touch("a")
+    assert record.data == {"flow_type": "csv", "request_count": 2}
+    assert store.get("a").data["request_count"] == 2
+    assert "a" in store and "b" not in store
+
+
+def test_sessions_expire_after_ttl(make_store):
+    store = make_store(default_ttl=0.05)
+    store.set("short", {"x": 1})
+    store.set("long", {"x": 2}, ttl=60)
+    time.sleep(0.1)
+    assert store.get("short") is None
+    assert store.get("long") is not None
+    assert not store.delete("short")
+    assert store.purge_expired() in (0, 1)
+    assert len(store) == 1
+
+
+def test_touch_extends_expiry(make_store):
+    store = make_store(default_ttl=0.15)
+    store.set("a", {})
+    time.sleep(0.1)
+    store.touch("a")
+    time.sleep(0.1)
+    assert store.get("a") is not None
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_sessions=3)
+    for session_id in ("a", "b", "c"):
+        store.touch(session_id)
+    store.touch("a")  # "b" becomes least recently used
+    store.touch("d")
+    assert store.get("b") is None
+    assert [r.session_id for r in store.page()[0]] == ["d", "a", "c"]
+    assert store.get_stats()["evictions"] == 1
+
+
+def test_sqlite_store_trims_to_max_sessions(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite"), max_sessions=10)
+    for i in range(64):
+        store.touch(f"s{i}")
+    assert len(store) == 10
+    assert store.get("s63") is not None and store.get("s0") is None
+    store.close()
+
+
+def test_page_is_most_recent_first(make_store):
+    store = make_store()
+    for i in range(5):
+        store.touch(f"s{i}")
+        time.sleep(0.002)
+    records, total = store.page(offset=1, limit=2)
+    assert total == 5
+    assert [r.session_id for r in records] == ["s3", "s2"]
+
+
+def test_sqlite_sessions_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    first.touch("shared")
+    second.touch("shared")
+    assert first.get("shared").data["request_count"] == 2
+    first.close()
+    second.close()
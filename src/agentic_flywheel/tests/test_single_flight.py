@@ -0,0 +1,73 @@
+"""
+Single flight: concurrent identical calls share one execution
+"""
+
+import asyncio
+
+import pytest
+
+from agentic_flywheel.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    executions = 0
+
+    async def call():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.05)
+        return {"text": "answer"}
+
+    results = await asyncio.gather(*(group.do("key", call) for _ in range(5)))
+    assert executions == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result == {"text": "answer"} for result, _ in results)
+    # Followers get copies, so per-caller changes do not leak
+    results[1][0]["text"] = "changed"
+    assert results[0][0]["text"] == "answer"
+    assert group.get_stats()["coalesced"] == 4 and group.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_execute_again():
+    group = SingleFlight()
+    calls = []
+
+    async def call(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    await asyncio.gather(group.do("a", lambda: call("a")), group.do("b", lambda: call("b")))
+    await group.do("a", lambda: call("a"))
+    assert sorted(calls) == ["a", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    group = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    group = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.ensure_future(group.do("key", call))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(group.do("key", call))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == ("done", True)
@@ -0,0 +1,44 @@
+"""
+Flowise SSE parsing: line framing, comments, multi-line data and Flowise event decoding
+"""
+
+import pytest
+
+from backends.flowise.sse import SSEEvent, SSEParser, decode_flowise_event, iter_flowise_events
+
+
+def feed_all(lines):
+    parser = SSEParser()
+    events = [event for event in map(parser.feed, lines) if event is not None]
+    final = parser.flush()
+    return events + ([final] if final else [])
+
+
+def test_blank_line_dispatches_event():
+    events = feed_all(["event: token", "data: hello", "id: 7", "", "data: world", ""])
+    assert events == [SSEEvent("token", "hello", "7"), SSEEvent("message", "world", None)]
+
+
+def test_comments_unknown_fields_and_multiline_data():
+    events = feed_all([": keep-alive", "message:", "data: first", "data:second", "retry: 10", ""])
+    assert events == [SSEEvent("message", "first\nsecond")]
+
+
+def test_unterminated_event_is_flushed_at_end():
+    assert feed_all(["data: tail"]) == [SSEEvent("message", "tail")]
+
+
+def test_decode_flowise_payloads():
+    assert decode_flowise_event(SSEEvent(data='{"event": "token", "data": "Hi"}')) == {"type": "token", "data": "Hi"}
+    assert decode_flowise_event(SSEEvent(data="plain text")) == {"type": "token", "data": "plain text"}
+    assert decode_flowise_event(SSEEvent("metadata", '{"chatId": "c"}')) == {"type": "metadata", "data": {"chatId": "c"}}
+
+
+@pytest.mark.asyncio
+async def test_iter_flowise_events():
+    async def lines():
+        for line in ['message:', 'data: {"event":"start","data":""}', '',
+                     'data: {"event":"token","data":"a"}', '', 'data: {"event":"end","data":"[DONE]"}']:
+            yield line
+
+    assert [event["type"] async for event in iter_flowise_events(lines())] == ["start", "token", "end"]